@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark for command matching
+Runs a corpus of utterances through the old if/elif + startswith scan and through
+the compiled trie dispatcher in each context, and lists utterances where the two
+disagree (where the old scan depended on declaration order).
+"""
+
+import re
+import sys
+import time
+sys.path.insert(0, 'src')
+
+from PyQt6.QtCore import QCoreApplication
+
+from app.utils.command_handler import CommandHandler
+
+CORPUS = [
+    "close tab", "close all tabs", "close safari", "new tab", "go back", "go forward",
+    "refresh", "reload the page", "bookmark this page", "zoom in", "zoom out",
+    "scroll down", "scroll to bottom", "go to example.com", "search for cheap flights",
+    "find pricing on page", "find on page", "open visual studio code", "switch to slack",
+    "minimize window", "maximize window", "help",
+    "make bold", "italic", "underline this", "increase font size", "heading 2",
+    "align center", "center", "add bullets", "remove numbering", "clear formatting",
+    "backspace 3", "delete 12 characters", "delete the last word", "delete line",
+    "highlight this", "change text color to red", "1.5 spacing", "double space",
+    "the quick brown fox jumped over the lazy dog", "what time is it",
+]
+
+
+def legacy_match(handler, context, command_text):
+    """The matcher before the dispatcher: priority cascade with linear startswith scans"""
+    if context == 'google_docs':
+        if command_text in handler.registry.phrases('google_docs'):
+            return 'docs:' + command_text
+        if 'text color' in command_text or 'change color' in command_text:
+            return 'docs:text color'
+        elif 'highlight' in command_text:
+            return 'docs:highlight'
+        elif 'backspace' in command_text or 'delete' in command_text:
+            numbers = re.findall(r'\d+', command_text)
+            return 'docs:delete ' + (numbers[0] if numbers else command_text)
+    if context in ('browser', 'google_docs'):
+        for prefix in ('go to ', 'search for ', 'find '):
+            if command_text.startswith(prefix):
+                return 'browser:' + prefix.strip()
+        for cmd in handler.registry.phrases('browser'):
+            if command_text.startswith(cmd):
+                return 'browser:' + cmd
+    for cmd in handler.registry.phrases('general'):
+        if command_text.startswith(cmd):
+            return 'general:' + cmd
+    return None
+
+
+def time_per_utterance(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in CORPUS:
+            func(text)
+    return 1e6 * (time.perf_counter() - start) / (repeat * len(CORPUS))
+
+
+def main():
+    app = QCoreApplication(sys.argv)
+    handler = CommandHandler()
+    dispatcher = handler.dispatcher
+    repeat = 2000
+
+    print("=" * 60)
+    print(f"Command Dispatch Benchmark ({len(CORPUS)} utterances)")
+    print("=" * 60)
+    print(f"{'Context':<14}{'Patterns':>10}{'Scan (µs)':>12}{'Trie (µs)':>12}{'Speedup':>10}")
+
+    for context in ('general', 'browser', 'google_docs'):
+        dispatcher.set_context(context)
+        legacy = time_per_utterance(lambda text: legacy_match(handler, context, text), repeat)
+        trie = time_per_utterance(dispatcher.match, repeat)
+        size = dispatcher._trie.size
+        print(f"{context:<14}{size:>10}{legacy:>12.2f}{trie:>12.2f}{legacy / trie:>9.1f}x")
+
+    print("\nUtterances where the old order-dependent scan picked a shorter command (browser context):")
+    dispatcher.set_context('browser')
+    for text in CORPUS:
+        legacy = legacy_match(handler, 'browser', text)
+        found = dispatcher._trie.match(text.split())
+        phrase = found[0].phrase if found else None
+        if legacy and phrase and legacy.split(':', 1)[1] != phrase and legacy.startswith('browser'):
+            print(f"  {text!r}: scan -> {legacy.split(':', 1)[1]!r}, trie -> {phrase!r}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark for text expansion with many entries
+Compares a per-entry regex loop (the old punctuation pass style) with the
+single-pass Aho-Corasick SnippetExpander as the dictionary grows.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import tempfile
+sys.path.insert(0, 'src')
+
+from app.utils.snippet_expander import SnippetExpander
+
+SENTENCE = ("please file an acme ticket 42 for the pie torch upgrade and ask the "
+            "data bricks team to review it before the launch next week ")
+
+
+def make_dictionary(size):
+    """size synthetic entries plus a few that occur in SENTENCE"""
+    entries = {f"product {i} name": f"Product{i}" for i in range(size)}
+    entries.update({
+        "pie torch": "PyTorch",
+        "data bricks": "Databricks",
+        "acme ticket": {"text": "ACME-", "join_next": True},
+    })
+    return entries
+
+
+def legacy_expand(entries, text):
+    """One regex scan per entry"""
+    for phrase, value in entries.items():
+        replacement = value["text"] if isinstance(value, dict) else value
+        text = re.sub(r'\b' + re.escape(phrase) + r'\b', lambda _: replacement, text, flags=re.IGNORECASE)
+    return text
+
+
+def time_it(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    text = SENTENCE * 5
+
+    print("=" * 60)
+    print(f"Text Expansion Benchmark ({len(text.split())}-word utterance)")
+    print("=" * 60)
+    print(f"{'Entries':>8}{'Regex loop (µs)':>19}{'Automaton (µs)':>17}{'Speedup':>10}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'expansions.json')
+        for size in (10, 100, 1000, 5000):
+            entries = make_dictionary(size)
+            with open(path, 'w') as f:
+                json.dump({"expansions": entries}, f)
+            expander = SnippetExpander(path)
+            repeat = max(5, 20000 // size)
+            legacy = time_it(lambda: legacy_expand(entries, text), repeat)
+            automaton = time_it(lambda: expander.expand(text), repeat)
+            print(f"{len(entries):>8}{legacy * 1e6:>19.1f}{automaton * 1e6:>17.1f}{legacy / automaton:>9.1f}x")
+
+        print()
+        print(f"Expanded: {expander.expand(SENTENCE)!r}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark for fuzzy command matching
+Runs misrecognized commands and ordinary sentences through the FuzzyMatcher and
+reports how many are corrected, offered as "did you mean", or rejected at the
+default thresholds, plus the lookup latency.
+"""
+
+import sys
+import time
+sys.path.insert(0, 'src')
+
+from app.utils.command_registry import CommandRegistry
+from app.utils.fuzzy_matcher import FuzzyMatcher
+
+EXECUTE_THRESHOLD = 0.8
+SUGGEST_THRESHOLD = 0.65
+
+# (context, heard, intended)
+MISHEARD = [
+    ('browser', "scroll dawn", "scroll down"), ('browser', "knew tab", "new tab"),
+    ('browser', "clothes tab", "close tab"), ('browser', "glows tab", "close tab"),
+    ('browser', "go fork", "go forward"), ('browser', "book mark this", "bookmark this"),
+    ('browser', "goat to example.com", "go to example.com"), ('browser', "search four cats", "search for cats"),
+    ('browser', "refreshed", "refresh"), ('browser', "scroll too top", "scroll to top"),
+    ('google_docs', "make bowled", "make bold"), ('google_docs', "heading to", "heading two"),
+    ('google_docs', "in crease font size", "increase font size"), ('google_docs', "align sent her", "align center"),
+    ('google_docs', "add bullet", "add bullets"), ('google_docs', "double spaced", "double space"),
+    ('google_docs', "under line", "underline"), ('google_docs', "italics", "italic"),
+    ('google_docs', "back space 3", "backspace 3"), ('google_docs', "normal test", "normal text"),
+    ('google_docs', "at numbering", "add numbering"), ('general', "mini mize", "minimize"),
+    ('general', "maximise window", "maximize window"), ('general', "switch two slack", "switch to slack"),
+]
+
+NOT_COMMANDS = [
+    ('google_docs', "the quick brown fox"), ('google_docs', "make sure you add the slides"),
+    ('google_docs', "we should meet tomorrow"), ('google_docs', "send the report"),
+    ('google_docs', "bolder ideas"), ('google_docs', "centre of town"),
+    ('google_docs', "underlying issue"), ('browser', "hello there"),
+    ('browser', "good morning everyone"), ('browser', "new taxes"), ('general', "tell me a joke"),
+]
+
+
+def classify(matcher, context, text):
+    matcher.set_context(context)
+    found = matcher.match(text)
+    if not found:
+        return None, 0.0
+    return found[0], found[2]
+
+
+def main():
+    registry = CommandRegistry()
+    start = time.perf_counter()
+    matcher = FuzzyMatcher(registry.patterns)
+    build_ms = 1000 * (time.perf_counter() - start)
+
+    print("=" * 60)
+    print(f"Fuzzy Command Matching Benchmark ({len(registry.patterns)} phrases, index built in {build_ms:.2f} ms)")
+    print("=" * 60)
+
+    executed = suggested = wrong = 0
+    for context, heard, intended in MISHEARD:
+        corrected, confidence = classify(matcher, context, heard)
+        if corrected != intended:
+            outcome = f"wrong ({corrected})"
+            wrong += 1
+        elif confidence >= EXECUTE_THRESHOLD:
+            outcome = "execute"
+            executed += 1
+        elif confidence >= SUGGEST_THRESHOLD:
+            outcome = "did you mean"
+            suggested += 1
+        else:
+            outcome = "rejected"
+        print(f"  {heard!r:26} -> {outcome:<14} {confidence:.2f}")
+
+    false_runs = false_offers = 0
+    for context, text in NOT_COMMANDS:
+        corrected, confidence = classify(matcher, context, text)
+        if confidence >= EXECUTE_THRESHOLD:
+            false_runs += 1
+        elif confidence >= SUGGEST_THRESHOLD:
+            false_offers += 1
+
+    print(f"\nMisheard commands: {executed} executed, {suggested} offered, {wrong} wrong, "
+          f"{len(MISHEARD) - executed - suggested - wrong} rejected")
+    print(f"Ordinary sentences: {false_runs} executed, {false_offers} offered, "
+          f"{len(NOT_COMMANDS) - false_runs - false_offers} rejected")
+
+    samples = [(context, heard) for context, heard, _ in MISHEARD] + NOT_COMMANDS
+    repeat = 500
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for context, text in samples:
+            matcher.set_context(context)
+            matcher.match(text)
+    per_lookup = 1e6 * (time.perf_counter() - start) / (repeat * len(samples))
+    print(f"Lookup latency: {per_lookup:.1f} µs")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
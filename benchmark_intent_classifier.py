@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark for command/dictation routing
+Compares the old verb-list heuristic with the hashed n-gram IntentClassifier on a
+labelled set of commands and dictated sentences (none of which are in the training
+data) and reports accuracy and per-utterance latency. Routing follows VoiceWidget in
+Google Docs: in the uncertain band, only utterances that execute count as commands.
+"""
+
+import sys
+import time
+sys.path.insert(0, 'src')
+
+from PyQt6.QtCore import QCoreApplication
+
+from app.utils.command_handler import CommandHandler
+from app.utils.intent_classifier import IntentClassifier
+
+COMMAND_THRESHOLD = 0.8
+DICTATION_THRESHOLD = 0.3
+
+COMMANDS = [
+    "make bold", "make italic", "bold", "heading two", "add bullets", "add numbering",
+    "open spotify", "close tab", "scroll down", "go to github.com", "delete the last word",
+    "backspace 4", "increase font size", "new tab", "change text color to blue",
+    "highlight this", "align center", "find invoices on page", "search for train times",
+    "zoom out", "switch to terminal", "remove bullets", "clear formatting", "justify",
+    "double space", "refresh", "bookmark this page", "normal text", "strikethrough",
+]
+
+DICTATION = [
+    "make sure you add the chart to section two", "add more detail to the introduction",
+    "open the document and read the first page", "go over the numbers again",
+    "increase the budget by ten percent", "new ideas came up in the meeting",
+    "highlight the main point in your talk", "the meeting is at three",
+    "close enough is not good enough here", "find out who owns the account",
+    "change the tone to something friendlier", "scroll back through our old emails",
+    "make a list of everyone who replied", "bold claims need strong evidence",
+    "remove the second paragraph if it repeats the first", "we can switch vendors next year",
+    "search the archive for older versions", "align expectations with the client early",
+    "zoom calls are scheduled for mondays", "delete anything that mentions the old name",
+    "i will send the updated draft tonight", "the numbers look good so far",
+]
+
+
+def legacy_is_command(text):
+    """The router before the classifier: verb list and word counts"""
+    text_lower = text.lower().strip()
+    command_verbs = [
+        'open', 'close', 'switch', 'go', 'search', 'find', 'new', 'refresh',
+        'scroll', 'zoom', 'bookmark', 'make', 'add', 'remove', 'change',
+        'increase', 'decrease', 'set', 'align', 'clear', 'apply', 'insert'
+    ]
+    for verb in command_verbs:
+        if text_lower.startswith(verb + ' ') or text_lower == verb:
+            return True
+    if len(text_lower.split()) <= 3 and any(verb in text_lower for verb in command_verbs):
+        return True
+    return False
+
+
+def accuracy(route):
+    right_commands = sum(1 for text in COMMANDS if route(text))
+    right_dictation = sum(1 for text in DICTATION if not route(text))
+    return right_commands, right_dictation
+
+
+def main():
+    app = QCoreApplication(sys.argv)
+    handler = CommandHandler()
+    handler.set_google_docs_active("Google Chrome")
+    registry = handler.registry
+    classifier = IntentClassifier()
+    start = time.perf_counter()
+    classifier.train(registry)
+    train_ms = 1000 * (time.perf_counter() - start)
+
+    print("=" * 60)
+    print(f"Intent Routing Benchmark ({len(COMMANDS)} commands, {len(DICTATION)} sentences)")
+    print("=" * 60)
+    print(f"Classifier trained in {train_ms:.1f} ms\n")
+
+    uncertain = [text for text in COMMANDS + DICTATION
+                 if DICTATION_THRESHOLD < classifier.probability(text) < COMMAND_THRESHOLD]
+
+    def classifier_is_command(text):
+        probability = classifier.probability(text)
+        if probability >= COMMAND_THRESHOLD:
+            return True
+        if probability <= DICTATION_THRESHOLD:
+            return False
+        return handler.can_execute(text)
+
+    print(f"{'Router':<14}{'Commands':>12}{'Dictation':>12}{'µs/utt':>10}")
+    for name, route in (("verb list", legacy_is_command), ("classifier", classifier_is_command)):
+        commands, dictation = accuracy(route)
+        repeat = 500
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for text in COMMANDS + DICTATION:
+                route(text)
+        latency = 1e6 * (time.perf_counter() - start) / (repeat * (len(COMMANDS) + len(DICTATION)))
+        print(f"{name:<14}{commands:>7}/{len(COMMANDS):<4}{dictation:>7}/{len(DICTATION):<4}{latency:>10.1f}")
+
+    print(f"\nIn the uncertain band ({DICTATION_THRESHOLD}-{COMMAND_THRESHOLD}): {len(uncertain)}")
+    for text in uncertain:
+        print(f"  {classifier.probability(text):.2f}  {text}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark for repeated key injection
+Times "delete 40 characters" with the old one-key-at-a-time backspace (50 ms sleep
+per key) against the batched KeyboardTyper.press_repeated burst. Key events go to a
+recording controller, so only the injection overhead and pacing are measured.
+"""
+
+import sys
+import time
+sys.path.insert(0, 'src')
+
+from app.utils.keyboard_typing import KeyboardTyper
+
+COUNTS = (1, 10, 40, 100)
+
+
+class RecordingController:
+    """Stands in for pynput's Controller and counts key events"""
+
+    def __init__(self):
+        self.events = 0
+
+    def press(self, key):
+        self.events += 1
+
+    def release(self, key):
+        self.events += 1
+
+
+def legacy_backspace(typer, count):
+    """Previous KeyboardTyper.backspace"""
+    from pynput.keyboard import Key
+    for _ in range(count):
+        typer.press_key(Key.backspace)
+        time.sleep(0.05)
+
+
+def time_it(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    typer = KeyboardTyper()
+    typer.keyboard = RecordingController()
+
+    print("=" * 60)
+    print(f"Key Repeat Benchmark (interval {typer.repeat_interval * 1000:.0f} ms)")
+    print("=" * 60)
+    print(f"{'Keys':>6}{'Per-key (ms)':>16}{'Burst (ms)':>14}{'Speedup':>10}")
+
+    for count in COUNTS:
+        legacy = time_it(lambda: legacy_backspace(typer, count))
+        burst = time_it(lambda: typer.backspace(count))
+        print(f"{count:>6}{legacy * 1000:>16.1f}{burst * 1000:>14.1f}{legacy / burst:>9.1f}x")
+
+    print(f"\nKey events sent: {typer.keyboard.events}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
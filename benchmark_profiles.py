@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark for latency/power performance profiles
+Reports the latency each profile adds and the CPU its capture and polling loops use.
+Runs without a microphone: audio buffers are simulated at the profile's rate.
+"""
+
+import sys
+import time
+import argparse
+sys.path.insert(0, 'src')
+
+import numpy as np
+
+from app.utils.settings_manager import SettingsManager
+
+SAMPLE_SENTENCE = "The quarterly report is ready for review and needs two approvals before Friday"
+
+
+def simulate_capture(sample_rate, chunk_size, seconds):
+    """Run the per-buffer work (level metering + energy check) in real time, return CPU %"""
+    chunk = (np.random.default_rng(0).normal(0, 2000, chunk_size)).astype(np.int16).tobytes()
+    chunk_seconds = chunk_size / sample_rate
+    buffers = int(seconds / chunk_seconds)
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    next_deadline = wall_start
+    for _ in range(buffers):
+        samples = np.frombuffer(chunk, dtype=np.int16)
+        float(np.max(np.abs(samples))) / 32768.0  # Level meter
+        float(np.sqrt(np.mean(samples.astype(np.float32) ** 2)))  # Energy threshold check
+        next_deadline += chunk_seconds
+        delay = next_deadline - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+    return 100.0 * cpu / wall, buffers / wall
+
+
+def modeled_latency(profile):
+    """Latency added by each knob in a profile, in milliseconds"""
+    recognition = profile['voice_recognition']
+    typing = profile['typing']
+    chunk_ms = 1000.0 * recognition['chunk_size'] / recognition['sample_rate']
+    words = SAMPLE_SENTENCE.split(' ')
+    typing_ms = 1000.0 * (len(SAMPLE_SENTENCE.replace(' ', '')) * typing['typing_delay']
+                          + (len(words) - 1) * typing['word_delay'])
+    return {
+        # Silence must last pause_threshold, measured in whole buffers
+        'end_of_speech_ms': 1000.0 * recognition['pause_threshold'] + chunk_ms,
+        'buffer_ms': chunk_ms,
+        # On average a focus change is noticed half a poll interval later
+        'context_switch_ms': profile['window_detection']['poll_interval'] / 2.0,
+        'typing_ms': typing_ms,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--seconds', type=float, default=2.0, help="Simulated capture time per profile")
+    args = parser.parse_args()
+
+    print("=" * 78)
+    print("Performance Profile Benchmark")
+    print("=" * 78)
+    print(f"{'Profile':<14}{'EOS (ms)':>10}{'Buffer':>9}{'Ctx (ms)':>10}{'Type (ms)':>11}"
+          f"{'Capture CPU':>13}{'Wakeups/s':>11}")
+
+    for name, profile in SettingsManager.PERFORMANCE_PROFILES.items():
+        latency = modeled_latency(profile)
+        recognition = profile['voice_recognition']
+        cpu, wakeups = simulate_capture(recognition['sample_rate'], recognition['chunk_size'], args.seconds)
+        # Each active-window poll spawns an osascript process; report its rate alongside
+        polls = 1000.0 / profile['window_detection']['poll_interval']
+        print(f"{name:<14}{latency['end_of_speech_ms']:>10.0f}{latency['buffer_ms']:>9.1f}"
+              f"{latency['context_switch_ms']:>10.0f}{latency['typing_ms']:>11.0f}"
+              f"{cpu:>12.2f}%{wakeups + polls:>11.1f}")
+
+    print()
+    print("EOS = end-of-speech wait, Ctx = average delay noticing an app switch,")
+    print(f"Type = time to type a {len(SAMPLE_SENTENCE)}-character sentence.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for spoken punctuation substitution
+Compares the old per-command re.sub loop with the single-pass PhraseReplacer
+on long dictation strings.
+"""
+
+import re
+import sys
+import time
+sys.path.insert(0, 'src')
+
+from app.utils.voice_typing import VoiceTypingMode
+from app.utils.phrase_replacer import PhraseReplacer
+
+SENTENCE = ("so the plan comma as discussed comma is to ship on friday period new line "
+            "dash bullet check the em dash rendering open parenthesis again close parenthesis "
+            "question mark new paragraph bullet point thanks exclamation point ")
+
+
+def legacy_replace(table, text):
+    """The previous implementation: one regex build and scan per table entry"""
+    for command, punctuation in table.items():
+        pattern = r'\b' + re.escape(command) + r'\b'
+        text = re.sub(pattern, punctuation, text, flags=re.IGNORECASE)
+    return text
+
+
+def time_it(func, text, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(text)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    table = VoiceTypingMode(None).punctuation_commands
+    replacer = PhraseReplacer(table)
+
+    print("=" * 60)
+    print(f"Punctuation Substitution Benchmark ({len(table)} commands)")
+    print("=" * 60)
+    print(f"{'Words':>8}{'Legacy (µs)':>15}{'Single pass (µs)':>19}{'Speedup':>10}")
+
+    for copies in (1, 10, 100):
+        text = SENTENCE * copies
+        repeat = max(10, 2000 // copies)
+        legacy = time_it(lambda t: legacy_replace(table, t), text, repeat)
+        single = time_it(replacer.replace, text, repeat)
+        print(f"{len(text.split()):>8}{legacy * 1e6:>15.1f}{single * 1e6:>19.1f}{legacy / single:>9.1f}x")
+
+    # Overlapping commands now resolve to the longest phrase regardless of dict order
+    sample = "em dash and dash bullet and bullet point"
+    print()
+    print(f"Legacy:      {legacy_replace(table, sample)!r}")
+    print(f"Single pass: {replacer.replace(sample)!r}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the auto-punctuation model variants
+Starts the punctuation worker with each model variant and reports its resident
+memory, load time, first-inference latency and steady-state latency. When the
+idle policy unloads the model, the worker's memory is released entirely.
+Requires deepmultilingualpunctuation (and torch for the quantized variant).
+"""
+
+import sys
+import time
+import argparse
+import multiprocessing
+sys.path.insert(0, 'src')
+
+from app.utils.punctuation_service import MODEL_VARIANTS, _punctuation_worker
+
+SAMPLE = "so the plan as discussed is to ship on friday can you check the rendering again thanks"
+
+
+def measure(variant, cache_dir, repeat):
+    """Run one worker with the given variant, return its ready stats plus steady latency"""
+    context = multiprocessing.get_context('spawn')
+    requests, responses = context.Queue(), context.Queue()
+    process = context.Process(target=_punctuation_worker, args=(requests, responses, variant, cache_dir))
+    process.start()
+    try:
+        kind, _, stats = responses.get(timeout=600)
+        if kind != 'ready':
+            return None, stats
+
+        latencies = []
+        for request_id in range(1, repeat + 1):
+            start = time.perf_counter()
+            requests.put((request_id, SAMPLE, []))
+            responses.get(timeout=60)
+            latencies.append(time.perf_counter() - start)
+            time.sleep(0.1)  # Past the batch window, so every request is a separate inference
+        latencies.sort()
+        stats['steady_ms'] = round(1000 * latencies[len(latencies) // 2])
+        return stats, None
+    finally:
+        requests.put(None)
+        process.join(timeout=5)
+        if process.is_alive():
+            process.terminate()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--cache-dir', default=None, help="Where the quantized model is stored")
+    parser.add_argument('--repeat', type=int, default=10, help="Inferences timed per variant")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("Punctuation Model Benchmark")
+    print("=" * 70)
+    print(f"{'Variant':<12}{'Resident (MB)':>15}{'Load (s)':>10}{'First (ms)':>12}{'Steady (ms)':>13}")
+
+    for variant in MODEL_VARIANTS:
+        stats, error = measure(variant, args.cache_dir, args.repeat)
+        if stats is None:
+            print(f"{variant:<12}  failed to load: {error}")
+            continue
+        print(f"{variant:<12}{stats['resident_mb']:>15}{stats['load_seconds']:>10.2f}"
+              f"{stats['first_inference_ms']:>12}{stats['steady_ms']:>13}")
+    print(f"{'unloaded':<12}{0:>15}")
+
+    print()
+    print("Resident = worker process memory after warm-up. The quantized variant's first")
+    print("load includes quantizing and saving the model; run again for the cached load.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
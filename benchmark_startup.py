@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark and import-time audit
+Launches fresh interpreters that build the main window, reports the median
+time-to-window and the slowest imports (from python -X importtime), and exits
+non-zero if startup exceeds the budget or pulls in a module that should be
+loaded on demand.
+"""
+
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+
+# Time from interpreter start to a constructed main window must stay under this
+STARTUP_BUDGET_SECONDS = 3.0
+# Loaded on demand only - importing any of these at startup is a regression
+DEFERRED_MODULES = ['deepmultilingualpunctuation', 'torch', 'transformers', 'pyaudio', 'pyttsx3', 'numpy']
+
+# Runs in the child interpreter; prints seconds to window and the deferred modules it loaded
+CHILD = f"""
+import sys, time
+start = time.perf_counter()
+sys.path.insert(0, 'src')
+from PyQt6.QtWidgets import QApplication
+from app.main_window import MainWindow
+app = QApplication(sys.argv)
+window = MainWindow()
+window.show()
+app.processEvents()
+elapsed = time.perf_counter() - start
+print('STARTUP', elapsed, ','.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))
+"""
+
+
+def cold_start(env):
+    """One fresh interpreter; returns (seconds to window, deferred modules loaded, import times)"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', CHILD],
+        capture_output=True, text=True, env=env, timeout=120
+    )
+    startup = [line for line in result.stdout.splitlines() if line.startswith('STARTUP')]
+    if result.returncode != 0 or not startup:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "startup failed")
+    _, seconds, loaded = (startup[-1].split(' ') + [''])[:3]
+
+    # "import time: self [us] | cumulative | imported package"
+    imports = {}
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            _, cumulative, name = line[len('import time:'):].split('|')
+            if cumulative.strip().isdigit():
+                imports[name.strip()] = int(cumulative) / 1000.0
+    return float(seconds), [m for m in loaded.split(',') if m], imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=5, help="Cold starts to measure")
+    parser.add_argument('--budget', type=float, default=STARTUP_BUDGET_SECONDS, help="Time-to-window budget (s)")
+    parser.add_argument('--top', type=int, default=15, help="Slowest top-level imports to list")
+    parser.add_argument('--offscreen', action='store_true', help="Use Qt's offscreen platform (headless machines)")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    if args.offscreen:
+        env['QT_QPA_PLATFORM'] = 'offscreen'
+
+    print("=" * 60)
+    print("Startup Benchmark")
+    print("=" * 60)
+
+    times = []
+    loaded = set()
+    imports = {}
+    for run in range(args.runs):
+        seconds, deferred, run_imports = cold_start(env)
+        times.append(seconds)
+        loaded.update(deferred)
+        imports = run_imports if not imports else {k: min(v, run_imports.get(k, v)) for k, v in imports.items()}
+        print(f"Run {run + 1}: {seconds:.3f}s to window")
+
+    # Per top-level package, its most expensive import (nested imports are already included in it)
+    top_level = {}
+    for name, ms in imports.items():
+        package = name.split('.')[0]
+        if not package.startswith('_'):
+            top_level[package] = max(ms, top_level.get(package, 0.0))
+    print()
+    print(f"{'Import':<36}{'Cumulative (ms)':>18}")
+    for name, ms in sorted(top_level.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"{name:<36}{ms:>18.1f}")
+
+    median = statistics.median(times)
+    print()
+    print(f"Median time to window: {median:.3f}s (budget {args.budget}s)")
+
+    failed = False
+    if loaded:
+        print(f"❌ Heavy modules imported at startup: {', '.join(sorted(loaded))}")
+        failed = True
+    if median > args.budget:
+        print(f"❌ Startup exceeds the {args.budget}s budget")
+        failed = True
+    if not failed:
+        print("✅ Startup within budget")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark for command suggestions
+Streams the partial transcripts of a few commands ("s", "sc", "scr", ...) through the
+old substring scan + QListWidget refill and through the SuggestionIndex trie +
+incremental SuggestionListModel, and reports the time per partial for each stage.
+"""
+
+import sys
+import time
+sys.path.insert(0, 'src')
+
+from PyQt6.QtWidgets import QApplication, QListWidget
+
+from app.utils.command_registry import CommandRegistry
+from app.utils.suggestion_index import SuggestionIndex
+from app.widgets.command_suggestions import CommandSuggestions
+
+SPOKEN = ["scroll to bottom", "increase font size", "close all tabs", "heading three", "search for [query]"]
+
+
+def partials():
+    for command in SPOKEN:
+        for end in range(1, len(command) + 1):
+            yield command[:end]
+
+
+def legacy_suggest(lists, partial):
+    """The scan before the index: substring test over every list on every call"""
+    docs, basic = lists
+    suggestions = [cmd for cmd in docs if partial in cmd.lower() or not partial]
+    suggestions += [cmd for cmd in basic if partial in cmd.lower()]
+    return suggestions
+
+
+def time_per_partial(func, repeat):
+    stream = list(partials())
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for partial in stream:
+            func(partial)
+    return 1e6 * (time.perf_counter() - start) / (repeat * len(stream))
+
+
+def main():
+    app = QApplication(sys.argv)
+    registry = CommandRegistry()
+    general = registry.suggestions('general')
+    docs = registry.suggestions('google_docs') + registry.suggestions('browser')
+    index = SuggestionIndex()
+    index.build({'google_docs': docs + general})
+    repeat = 200
+
+    print("=" * 60)
+    print(f"Suggestion Benchmark ({len(list(partials()))} partials, {len(docs) + len(general)} suggestions)")
+    print("=" * 60)
+
+    scan = time_per_partial(lambda partial: legacy_suggest((docs, general), partial), repeat)
+    trie = time_per_partial(lambda partial: index.suggest('google_docs', partial), repeat)
+    print(f"{'Lookup':<28}{'scan':>8}{scan:>10.1f} µs   trie{trie:>10.1f} µs")
+
+    old_widget = QListWidget()
+
+    def refill(partial):
+        old_widget.clear()
+        old_widget.addItems(legacy_suggest((docs, general), partial))
+
+    widget = CommandSuggestions()
+    refill_us = time_per_partial(refill, repeat // 4)
+    model_us = time_per_partial(lambda partial: widget.update_suggestions(index.suggest('google_docs', partial)),
+                                repeat // 4)
+    print(f"{'Lookup + list update':<28}{'refill':>8}{refill_us:>10.1f} µs  model{model_us:>10.1f} µs")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
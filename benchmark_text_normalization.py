@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for inverse text normalization
+Times TextNormalizer on dictation with and without spoken numbers, and on short
+commands, and prints a few conversions as a sanity check.
+"""
+
+import sys
+import time
+sys.path.insert(0, 'src')
+
+from app.utils.text_normalizer import TextNormalizer
+
+PLAIN = "please send the notes to the whole team before the review and copy me on the thread"
+NUMBERS = ("the invoice for twenty five dollars and fifty cents is due march third twenty twenty four "
+           "at three thirty pm and covers twelve percent of the two thousand four hundred units")
+COMMANDS = ["backspace three", "delete twenty characters", "heading two", "close tab"]
+
+
+def throughput(normalizer, texts, keep_small_numbers, repeat):
+    """Utterances per second and microseconds per utterance"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            normalizer.normalize(text, keep_small_numbers)
+    elapsed = time.perf_counter() - start
+    count = repeat * len(texts)
+    return count / elapsed, 1e6 * elapsed / count
+
+
+def main():
+    normalizer = TextNormalizer()
+
+    print("=" * 60)
+    print("Inverse Text Normalization Benchmark")
+    print("=" * 60)
+    print(f"{'Input':<24}{'Utterances/s':>16}{'µs/utterance':>16}")
+
+    for label, texts, keep_small in (
+        ("Dictation, no numbers", [PLAIN], True),
+        ("Dictation, numbers", [NUMBERS], True),
+        ("Commands", COMMANDS, False),
+    ):
+        rate, micros = throughput(normalizer, texts, keep_small, 5000)
+        print(f"{label:<24}{rate:>16,.0f}{micros:>16.1f}")
+
+    print()
+    print(f"{NUMBERS!r}")
+    print(f"-> {normalizer.normalize(NUMBERS, keep_small_numbers=True)!r}")
+    for command in COMMANDS:
+        print(f"{command!r} -> {normalizer.normalize(command)!r}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for Linux key injection
+Types the same text through pynput's Controller and through the batched
+XTestInjector and reports characters per second. Runs headless: without a display
+it starts its own Xvfb server (install the xvfb package), so it works in CI.
+
+Usage:
+    python benchmark_xtest_injection.py [--chars N]
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import time
+sys.path.insert(0, 'src')
+
+SAMPLE = "The quick brown fox jumps over the lazy dog, 1234567890! Ça coûte 5€. "
+XVFB_DISPLAY = ':99'
+
+
+def start_xvfb():
+    """Start a private Xvfb server and point DISPLAY at it"""
+    if not shutil.which('Xvfb'):
+        return None
+    server = subprocess.Popen(['Xvfb', XVFB_DISPLAY, '-screen', '0', '1280x720x24', '-nolisten', 'tcp'],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.environ['DISPLAY'] = XVFB_DISPLAY
+    # Wait for the socket to appear
+    socket = f"/tmp/.X11-unix/X{XVFB_DISPLAY[1:]}"
+    for _ in range(50):
+        if os.path.exists(socket):
+            break
+        time.sleep(0.1)
+    return server
+
+
+def time_pynput(text):
+    from pynput.keyboard import Controller
+    keyboard = Controller()
+    start = time.perf_counter()
+    keyboard.type(text)
+    return time.perf_counter() - start
+
+
+def time_xtest(injector, text):
+    start = time.perf_counter()
+    for word in text.split(' '):
+        injector.type_text(word + ' ')
+    injector.wait()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--chars', type=int, default=2000, help='characters to type per backend')
+    args = parser.parse_args()
+
+    server = None
+    if not os.environ.get('DISPLAY'):
+        server = start_xvfb()
+        if server is None:
+            print("No DISPLAY and Xvfb is not installed - cannot run")
+            return 1
+
+    try:
+        from app.utils import xtest_injector
+        if not xtest_injector.is_available():
+            print("python-xlib is not installed - cannot run")
+            return 1
+        injector = xtest_injector.XTestInjector()
+        text = (SAMPLE * (args.chars // len(SAMPLE) + 1))[:args.chars]
+
+        print("=" * 60)
+        print(f"Key Injection Benchmark ({len(text)} characters, display {os.environ['DISPLAY']})")
+        print("=" * 60)
+        print(f"{'Backend':<12}{'Seconds':>10}{'Chars/s':>12}")
+
+        results = {}
+        for name, run in (("pynput", lambda: time_pynput(text)), ("xtest", lambda: time_xtest(injector, text))):
+            elapsed = run()
+            results[name] = elapsed
+            print(f"{name:<12}{elapsed:>10.3f}{len(text) / elapsed:>12,.0f}")
+
+        print(f"\nXTest speedup: {results['pynput'] / results['xtest']:.1f}x")
+        injector.close()
+        return 0
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
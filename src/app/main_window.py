@@ -135,8 +135,10 @@ class MainWindow(QMainWindow):
     
     def show_settings(self):
         """Show the settings dialog"""
-        settings = SettingsDialog(self)
+        settings = SettingsDialog(self, settings_manager=self.settings_manager)
         settings.settings_updated.connect(self.apply_settings)
+        if self.voice_widget:
+            settings.profile_changed.connect(self.voice_widget.apply_performance_profile)
         settings.exec()
         
     def apply_settings(self, settings):
@@ -70,6 +70,12 @@ class ActiveWindowDetector(QObject):
             self.timer.stop()
             self.url_check_timer.stop()
     
+    def set_poll_interval(self, poll_interval):
+        """Change how often the active window is checked (takes effect immediately)"""
+        self.poll_interval = poll_interval
+        if self._is_running:
+            self.timer.setInterval(poll_interval)
+    
     def get_current_app(self):
         """Get the currently active application name"""
         return self.current_app
@@ -0,0 +1,215 @@
+"""
+Adaptive Endpointing
+Learns end-of-speech parameters from the user's own pauses.
+Inter-word pauses tell us how long a silence can be without the speaker being done;
+gaps between utterances tell us how quickly they move on. Command and dictation
+modes are learned separately and persisted in the settings file.
+"""
+
+from collections import deque
+
+
+class PauseStatistics:
+    """Bounded window of pause samples with percentile queries"""
+
+    def __init__(self, samples=None, max_samples=300):
+        self.samples = deque(samples or [], maxlen=max_samples)
+
+    def add(self, value):
+        self.samples.append(value)
+
+    def __len__(self):
+        return len(self.samples)
+
+    def percentile(self, q):
+        """q-th percentile (0-100) of the window, or None if empty (linear interpolation, like numpy)"""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        position = (len(ordered) - 1) * q / 100.0
+        lower = int(position)
+        upper = min(lower + 1, len(ordered) - 1)
+        return float(ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower))
+
+
+class AdaptiveEndpointer:
+    """Per-mode online estimation of pause_threshold, phrase_threshold and non_speaking_duration"""
+
+    FRAME_SECONDS = 0.02
+    MIN_WORD_PAUSE = 0.06  # Shorter gaps are just stop consonants, not pauses
+    MIN_SAMPLES = 20  # Keep the static defaults until this many pauses are seen
+    SAVE_EVERY = 10  # Persist learned values every N utterances
+    REPORT_EVERY = 25  # Print a latency report every N utterances
+
+    # How conservative each mode is: dictation tolerates longer mid-sentence pauses
+    MODE_TUNING = {
+        'command': {'percentile': 90, 'margin': 1.25, 'min_pause': 0.3, 'max_pause': 1.2},
+        'dictation': {'percentile': 97, 'margin': 1.35, 'min_pause': 0.45, 'max_pause': 1.5},
+    }
+
+    def __init__(self, settings_manager=None, defaults=None):
+        """
+        Args:
+            settings_manager: Used to load/persist learned values (optional)
+            defaults: Static parameters to fall back on, e.g. from default_settings
+        """
+        self.settings_manager = settings_manager
+        self.defaults = defaults or {
+            'pause_threshold': 0.8,
+            'phrase_threshold': 0.2,
+            'non_speaking_duration': 0.5,
+        }
+        self.word_pauses = {}
+        self.utterance_gaps = {}
+        self.speech_lengths = {}
+        self.saved_seconds = {}
+        self.utterance_counts = {}
+        self._last_speech_end = None
+        self._unsaved = 0
+
+        for mode in self.MODE_TUNING:
+            stored = self._load(mode)
+            self.word_pauses[mode] = PauseStatistics(stored.get('word_pauses'))
+            self.utterance_gaps[mode] = PauseStatistics(stored.get('utterance_gaps'))
+            self.speech_lengths[mode] = PauseStatistics(stored.get('speech_lengths'))
+            self.saved_seconds[mode] = stored.get('saved_seconds', 0.0)
+            self.utterance_counts[mode] = stored.get('utterances', 0)
+
+    def _load(self, mode):
+        if not self.settings_manager:
+            return {}
+        return self.settings_manager.get_setting('endpointing', mode) or {}
+
+    def observe_utterance(self, mode, audio, energy_threshold, received_at):
+        """
+        Learn from one captured phrase
+
+        Args:
+            mode: 'command' or 'dictation'
+            audio: speech_recognition AudioData (16-bit samples)
+            energy_threshold: RMS level separating speech from silence
+            received_at: time.monotonic() when the phrase was handed to us
+        """
+        if mode not in self.MODE_TUNING:
+            return
+        import numpy as np  # Deferred: not needed until the first utterance
+        samples = np.frombuffer(audio.get_raw_data(), dtype=np.int16).astype(np.float32)
+        frame_length = max(1, int(audio.sample_rate * self.FRAME_SECONDS))
+        frame_count = len(samples) // frame_length
+        if frame_count == 0:
+            return
+        frames = samples[:frame_count * frame_length].reshape(frame_count, frame_length)
+        speech = np.sqrt(np.mean(frames * frames, axis=1)) > energy_threshold
+        speech_frames = np.flatnonzero(speech)
+        if len(speech_frames) == 0:
+            return
+        pause_in_effect = self.parameters(mode)['pause_threshold']
+
+        # Silences between speech frames are inter-word pauses
+        gaps = np.diff(speech_frames) - 1
+        for gap in gaps[gaps > 0]:
+            pause = float(gap) * self.FRAME_SECONDS
+            if pause >= self.MIN_WORD_PAUSE:
+                self.word_pauses[mode].add(round(pause, 3))
+
+        first_speech = speech_frames[0] * self.FRAME_SECONDS
+        last_speech = (speech_frames[-1] + 1) * self.FRAME_SECONDS
+        duration = frame_count * self.FRAME_SECONDS
+        self.speech_lengths[mode].add(round(last_speech - first_speech, 3))
+
+        # Gap since the previous utterance ended, measured speech-to-speech
+        speech_start = received_at - duration + first_speech
+        if self._last_speech_end is not None:
+            gap = speech_start - self._last_speech_end
+            if 0 < gap < 10:
+                self.utterance_gaps[mode].add(round(gap, 3))
+        self._last_speech_end = received_at - duration + last_speech
+
+        # End-of-speech wait saved compared with the static default
+        self.utterance_counts[mode] += 1
+        self.saved_seconds[mode] += self.defaults['pause_threshold'] - pause_in_effect
+
+        self._unsaved += 1
+        if self._unsaved >= self.SAVE_EVERY:
+            self.save()
+        if self.utterance_counts[mode] % self.REPORT_EVERY == 0:
+            self.print_report(mode)
+
+    def parameters(self, mode):
+        """Current endpointing parameters for a mode"""
+        tuning = self.MODE_TUNING.get(mode)
+        pauses = self.word_pauses.get(mode)
+        if tuning is None or len(pauses) < self.MIN_SAMPLES:
+            return dict(self.defaults)
+
+        # Wait a little longer than the user's long inter-word pauses so they aren't cut off
+        pause_threshold = pauses.percentile(tuning['percentile']) * tuning['margin']
+
+        # ...but not so long that back-to-back utterances get merged
+        gaps = self.utterance_gaps[mode]
+        if len(gaps) >= self.MIN_SAMPLES:
+            pause_threshold = min(pause_threshold, 0.9 * gaps.percentile(25))
+
+        pause_threshold = min(max(pause_threshold, tuning['min_pause']), tuning['max_pause'])
+
+        # Shortest phrases the user really says decide how much sound counts as a phrase
+        phrase_threshold = self.defaults['phrase_threshold']
+        lengths = self.speech_lengths[mode]
+        if len(lengths) >= self.MIN_SAMPLES:
+            phrase_threshold = min(max(0.5 * lengths.percentile(5), 0.1), 0.3)
+
+        return {
+            'pause_threshold': round(pause_threshold, 3),
+            'phrase_threshold': round(phrase_threshold, 3),
+            # Recognizer requires non_speaking_duration <= pause_threshold
+            'non_speaking_duration': round(min(self.defaults['non_speaking_duration'], pause_threshold), 3),
+        }
+
+    def apply(self, recognizer, mode):
+        """Set a speech_recognition Recognizer's endpointing for the given mode"""
+        params = self.parameters(mode)
+        recognizer.pause_threshold = params['pause_threshold']
+        recognizer.phrase_threshold = params['phrase_threshold']
+        recognizer.non_speaking_duration = params['non_speaking_duration']
+        return params
+
+    def get_report(self):
+        """End-of-speech latency saved per mode compared with the static defaults"""
+        report = {}
+        for mode in self.MODE_TUNING:
+            count = self.utterance_counts[mode]
+            report[mode] = {
+                'utterances': count,
+                'pause_threshold': self.parameters(mode)['pause_threshold'],
+                'default_pause_threshold': self.defaults['pause_threshold'],
+                'saved_seconds_total': round(self.saved_seconds[mode], 2),
+                'saved_ms_per_utterance': round(1000 * self.saved_seconds[mode] / count) if count else 0,
+            }
+        return report
+
+    def print_report(self, mode):
+        stats = self.get_report()[mode]
+        print(f"⏱️ Adaptive endpointing ({mode}): pause {stats['pause_threshold']}s "
+              f"vs {stats['default_pause_threshold']}s default, "
+              f"saved {stats['saved_ms_per_utterance']} ms/utterance "
+              f"({stats['saved_seconds_total']}s over {stats['utterances']} utterances)")
+
+    def save(self):
+        """Persist learned pause distributions and parameters (safe from the recognition thread)"""
+        self._unsaved = 0
+        if not self.settings_manager:
+            return
+        learned = {}
+        for mode in self.MODE_TUNING:
+            data = dict(self.parameters(mode))
+            data.update({
+                'word_pauses': list(self.word_pauses[mode].samples),
+                'utterance_gaps': list(self.utterance_gaps[mode].samples),
+                'speech_lengths': list(self.speech_lengths[mode].samples),
+                'saved_seconds': round(self.saved_seconds[mode], 3),
+                'utterances': self.utterance_counts[mode],
+            })
+            learned[mode] = data
+        with self.settings_manager.lock:
+            self.settings_manager.settings.setdefault('endpointing', {}).update(learned)
+            self.settings_manager.save_settings(self.settings_manager.settings)
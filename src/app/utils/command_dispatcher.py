@@ -0,0 +1,223 @@
+"""
+Command Dispatcher
+Matches spoken commands against a declarative command table. The table is compiled
+once per context ('general', 'browser', 'google_docs') into a token trie, and a
+context switch just swaps which trie is active. Matching walks the utterance's
+words once and picks the longest match, so "close tab" always beats "close"
+whatever order the commands were declared in.
+
+Pattern syntax: words separated by spaces, plus argument slots
+    {number}  a number, as digits or spoken ("3", "three", "twenty five"), passed to
+              the handler as an int
+    {text}    one or more remaining words, passed as a string exactly as spoken
+              (last in a pattern only)
+"""
+
+from .text_normalizer import parse_number
+
+NUMBER = '{number}'
+TEXT = '{text}'
+
+CONTEXTS = ('general', 'browser', 'google_docs')
+# Command groups available in each context; later groups win ties
+CONTEXT_GROUPS = {
+    'general': ('general',),
+    'browser': ('general', 'browser'),
+    'google_docs': ('general', 'browser', 'google_docs'),
+}
+
+
+class CommandPattern:
+    """One phrase of the command table"""
+
+    __slots__ = ('phrase', 'tokens', 'handler', 'tail', 'group', 'literals')
+
+    def __init__(self, phrase, handler, group='general', tail='none'):
+        """
+        Args:
+            phrase: Words and slots, e.g. "backspace {number}"
+            handler: Called with the slot values (and the trailing words if tail='args')
+            group: 'general', 'browser' or 'google_docs'
+            tail: What may follow the phrase - 'none' (nothing), 'ignore' (anything, dropped)
+                  or 'args' (anything, passed to the handler as one string, possibly empty)
+        """
+        tokens = tuple(phrase.split())
+        if TEXT in tokens[:-1]:
+            raise ValueError(f"{TEXT} must be the last word of '{phrase}'")
+        if tail not in ('none', 'ignore', 'args'):
+            raise ValueError(f"Unknown tail '{tail}' for '{phrase}'")
+        self.phrase = phrase
+        self.tokens = tokens
+        self.handler = handler
+        self.tail = tail
+        self.group = group
+        self.literals = sum(1 for token in tokens if token not in (NUMBER, TEXT))
+
+    def __repr__(self):
+        return f"CommandPattern({self.phrase!r}, group={self.group!r})"
+
+
+class KeywordRule:
+    """Fallback that fires when an utterance contains any of the keywords and nothing matched"""
+
+    __slots__ = ('keywords', 'handler', 'group')
+
+    def __init__(self, keywords, handler, group='general'):
+        """
+        Args:
+            keywords: Substrings to look for
+            handler: Called with the whole utterance
+            group: Command group, as for CommandPattern
+        """
+        self.keywords = tuple(keywords)
+        self.handler = handler
+        self.group = group
+
+
+class _Node:
+    __slots__ = ('children', 'number', 'text', 'patterns')
+
+    def __init__(self):
+        self.children = {}
+        self.number = None  # Child for a {number} slot
+        self.text = None  # Child for a {text} slot
+        self.patterns = []  # Patterns ending here
+
+
+class CommandTrie:
+    """Token trie over the patterns of one context"""
+
+    def __init__(self, patterns, rank):
+        """
+        Args:
+            patterns: CommandPatterns to include
+            rank: group -> priority used to break ties between equally long matches
+        """
+        self._root = _Node()
+        self._rank = rank
+        self.size = 0
+        for pattern in patterns:
+            self._add(pattern)
+
+    def _add(self, pattern):
+        node = self._root
+        for token in pattern.tokens:
+            if token == NUMBER:
+                node.number = node.number or _Node()
+                node = node.number
+            elif token == TEXT:
+                node.text = node.text or _Node()
+                node = node.text
+            else:
+                node = node.children.setdefault(token, _Node())
+        node.patterns.append((pattern, pattern.literals, self._rank[pattern.group]))
+        self.size += 1
+
+    def match(self, tokens):
+        """
+        Best pattern for the tokens of an utterance
+
+        Returns:
+            (pattern, handler args) or None
+        """
+        best = None
+        best_key = None
+        count = len(tokens)
+        pending = []  # Slot branches still to explore
+        node, position, args = self._root, 0, ()
+        while True:
+            for pattern, literals, rank in node.patterns:
+                if position < count and pattern.tail == 'none':
+                    continue
+                # Most literal words, then fewest leftover words, then the most specific group
+                key = (literals, position, rank)
+                if best_key is None or key > best_key:
+                    best_key = key
+                    if pattern.tail == 'args':
+                        best = (pattern, args + (' '.join(tokens[position:]),))
+                    else:
+                        best = (pattern, args)
+            if position < count:
+                token = tokens[position]
+                if node.text is not None:
+                    pending.append((node.text, count, args + (' '.join(tokens[position:]),)))
+                if node.number is not None:
+                    number = parse_number(tokens[position:])
+                    if number is not None:
+                        value, used = number
+                        pending.append((node.number, position + used, args + (value,)))
+                child = node.children.get(token)
+                if child is not None:
+                    node = child
+                    position += 1
+                    continue
+            if not pending:
+                return best
+            node, position, args = pending.pop()
+
+
+class CommandDispatcher:
+    """Per-context compiled command tables with O(1) context switches"""
+
+    def __init__(self, patterns, keyword_rules=()):
+        """
+        Args:
+            patterns: The declarative command table (CommandPatterns)
+            keyword_rules: KeywordRules tried when no pattern matches
+        """
+        self.context = 'general'
+        self._tries = {}
+        self._keywords = {}
+        self.compile(patterns, keyword_rules)
+
+    def compile(self, patterns, keyword_rules=()):
+        """Build the trie for every context (also used to load a new table)"""
+        patterns = list(patterns)
+        keyword_rules = list(keyword_rules)
+        tries = {}
+        keywords = {}
+        for context in CONTEXTS:
+            groups = CONTEXT_GROUPS[context]
+            rank = {group: index for index, group in enumerate(groups)}
+            tries[context] = CommandTrie([p for p in patterns if p.group in groups], rank)
+            # Most specific group's rules first
+            keywords[context] = sorted((rule for rule in keyword_rules if rule.group in groups),
+                                       key=lambda rule: -rank[rule.group])
+        self._tries, self._keywords = tries, keywords
+        self._trie = self._tries[self.context]
+
+    def set_context(self, context):
+        """Make context's compiled table the active one"""
+        if context not in self._tries:
+            raise ValueError(f"Unknown command context: {context}")
+        self.context = context
+        self._trie = self._tries[context]
+
+    def match(self, command_text):
+        """
+        Resolve a normalized (lowercase) command in the active context
+
+        Returns:
+            A zero-argument callable that executes the command, or None
+        """
+        found = self._trie.match(command_text.split())
+        if found:
+            pattern, args = found
+            return lambda: pattern.handler(*args)
+        for rule in self._keywords[self.context]:
+            if any(keyword in command_text for keyword in rule.keywords):
+                return lambda: rule.handler(command_text)
+        return None
+
+    def phrases(self, context=None):
+        """Fixed (slot-free) phrases of a context, for suggestions and rescoring"""
+        trie = self._tries[context or self.context]
+        phrases = []
+        stack = [(trie._root, ())]
+        while stack:
+            node, words = stack.pop()
+            if node.patterns:
+                phrases.append(' '.join(words))
+            for word, child in node.children.items():
+                stack.append((child, words + (word,)))
+        return phrases
@@ -1,10 +1,16 @@
 from PyQt6.QtCore import QObject, pyqtSignal
+import os
 import subprocess
 import platform
 
 from .browser_commands import BrowserCommandRouter
 from .app_launcher import AppLauncher
 from .google_docs_commands import GoogleDocsCommands
+from .command_dispatcher import CommandDispatcher, CommandPattern, KeywordRule
+from .command_registry import CommandRegistry
+from .fuzzy_matcher import FuzzyMatcher
+from .suggestion_index import SuggestionIndex
+from .text_normalizer import parse_number
 
 class CommandHandler(QObject):
     command_executed = pyqtSignal(str)
@@ -20,6 +26,12 @@ class CommandHandler(QObject):
         self.current_context = 'general'
         self.is_browser_active = False
         self.is_google_docs_active = False
+        self.rescoring_stats = {'rescored': 0, 'changed': 0, 'repeats_avoided': 0}
+        self._context_phrases = (None, frozenset())  # ((registry version, context), phrases)
+        # Near-miss commands ("scroll dawn"): run above the first confidence, suggest above the second
+        self.fuzzy_matching = True
+        self.fuzzy_execute_threshold = 0.85
+        self.fuzzy_suggest_threshold = 0.65
         
         # Connect browser command signals
         self.browser_router.command_executed.connect(self.command_executed.emit)
@@ -34,37 +46,149 @@ class CommandHandler(QObject):
         self.app_launcher.app_not_found.connect(self._handle_app_not_found)
         
         self.setup_commands()
+        # Each context has its own compiled command table; switching contexts just swaps it
+        self.context_changed.connect(self.dispatcher.set_context)
+        self.context_changed.connect(self.fuzzy_matcher.set_context)
 
     def setup_commands(self):
-        """Set up available commands and their handlers"""
-        self.commands = {
+        """Load the command registry and compile it into per-context tables"""
+        # Handlers for registry actions that aren't browser.* or docs.*
+        self.actions = {
             'open': self._handle_open,
             'close': self._handle_close,
-            'switch to': self._handle_switch,
+            'switch': self._handle_switch,
             'minimize': self._handle_minimize,
             'maximize': self._handle_maximize,
-            'help': self._handle_help
+            'help': self._handle_help,
+            'find': self._handle_find,
+            'docs_delete': self._handle_docs_delete,
         }
-        
-        # Browser-specific commands
-        self.browser_commands = {
-            'close tab': lambda: self.browser_router.execute_command('close_tab'),
-            'new tab': lambda: self.browser_router.execute_command('new_tab'),
-            'close all tabs': lambda: self.browser_router.execute_command('close_all_tabs'),
-            'go back': lambda: self.browser_router.execute_command('go_back'),
-            'go forward': lambda: self.browser_router.execute_command('go_forward'),
-            'refresh': lambda: self.browser_router.execute_command('refresh'),
-            'reload': lambda: self.browser_router.execute_command('refresh'),
-            'bookmark': lambda: self.browser_router.execute_command('bookmark_page'),
-            'bookmark this': lambda: self.browser_router.execute_command('bookmark_page'),
-            'zoom in': lambda: self.browser_router.execute_command('zoom_in'),
-            'zoom out': lambda: self.browser_router.execute_command('zoom_out'),
-            'scroll up': lambda: self.browser_router.execute_command('scroll_up'),
-            'scroll down': lambda: self.browser_router.execute_command('scroll_down'),
-            'scroll to top': lambda: self.browser_router.execute_command('scroll_to_top'),
-            'scroll to bottom': lambda: self.browser_router.execute_command('scroll_to_bottom'),
-            'find on page': lambda: self.browser_router.execute_command('find_on_page'),
+        self.registry = CommandRegistry()
+        self.suggestion_index = SuggestionIndex(os.path.expanduser('~/.voice_assistant/suggestion_usage.json'))
+        self._index_suggestions()
+        self.dispatcher = CommandDispatcher(*self._command_table())
+        self.fuzzy_matcher = FuzzyMatcher(self.registry.patterns)
+        self._registry_version = self.registry.version
+    
+    def _refresh_registry(self):
+        """Recompile the command tables if commands.json changed on disk"""
+        self.registry.reload_if_changed()
+        if self.registry.version != self._registry_version:
+            self.dispatcher.compile(*self._command_table())
+            self.fuzzy_matcher.compile(self.registry.patterns)
+            self._index_suggestions()
+            self._registry_version = self.registry.version
+    
+    def _index_suggestions(self):
+        """Rebuild the suggestion tries; context-specific suggestions rank above basic ones"""
+        general = self.registry.suggestion_actions('general')
+        contexts = {
+            'google_docs': self.registry.suggestion_actions('google_docs') + general,
+            'browser': self.registry.suggestion_actions('browser') + general,
+            'general': general,
         }
+        self.suggestion_index.build({context: [text for text, action in entries]
+                                     for context, entries in contexts.items()})
+        self._suggestions_by_action = {}
+        for entries in contexts.values():
+            for text, action in entries:
+                texts = self._suggestions_by_action.setdefault(action, [])
+                if text not in texts:
+                    texts.append(text)
+    
+    def _suggestion_for(self, action, words):
+        """
+        The suggestion of an action that the spoken words correspond to
+        
+        An action with several suggestions ("delete word", "delete line") is matched on
+        shared words; None if no suggestion shares more words than the others.
+        """
+        texts = self._suggestions_by_action.get(action, ())
+        if len(texts) == 1:
+            return texts[0]
+        words = set(words)
+        overlaps = sorted(((len(words & set(text.split())), text) for text in texts), reverse=True)
+        if overlaps and overlaps[0][0] and (len(overlaps) == 1 or overlaps[1][0] < overlaps[0][0]):
+            return overlaps[0][1]
+        return None
+    
+    def _tracked(self, action, handler, phrase=None):
+        """
+        Wrap a handler so running it counts as a use of the suggestion that was said
+        
+        Args:
+            phrase: The registered phrase the handler runs for; None for a keyword rule,
+                    whose handler gets the utterance as its argument
+        """
+        def run(*args):
+            words = (phrase if phrase is not None else args[0]).split()
+            text = self._suggestion_for(action, words)
+            if text:
+                self.suggestion_index.record(text)
+            return handler(*args)
+        return run
+    
+    def _action_handler(self, action):
+        """
+        Callable for a registry action id
+        
+        'browser.<command>' and 'docs.<method>' are looked up when the command runs,
+        so they follow the active browser and any replaced handler methods.
+        """
+        kind, _, name = action.partition('.')
+        if kind == 'browser' and name:
+            return lambda *args: self.browser_router.execute_command(name, *args)
+        if kind == 'docs' and name:
+            return lambda *args: getattr(self.google_docs_handler, name)(*args)
+        if action in self.actions:
+            return self.actions[action]
+        raise ValueError(f"Unknown command action: {action}")
+    
+    def _command_table(self):
+        """
+        The compiled registry as dispatcher input: (patterns, keyword fallbacks)
+        
+        Unknown actions are skipped with a warning so one bad entry in a deployed
+        commands.json doesn't disable every command.
+        """
+        patterns = []
+        for phrase, action, group, tail in self.registry.patterns:
+            try:
+                handler = self._tracked(action, self._action_handler(action), phrase)
+                patterns.append(CommandPattern(phrase, handler, group, tail))
+            except ValueError as e:
+                print(f"Warning: Skipping command '{phrase}': {e}")
+        keyword_rules = []
+        for keywords, action, group, with_text in self.registry.keywords:
+            try:
+                handler = self._action_handler(action)
+            except ValueError as e:
+                print(f"Warning: Skipping keywords {list(keywords)}: {e}")
+                continue
+            if not with_text:
+                handler = (lambda handler: lambda text: handler())(handler)
+            keyword_rules.append(KeywordRule(keywords, self._tracked(action, handler), group))
+        return patterns, keyword_rules
+    
+    def _handle_find(self, text):
+        """'find [text] on page'"""
+        if text.endswith(' on page'):
+            text = text[:-8].strip()
+        self.browser_router.execute_command('find_on_page', text)
+    
+    def _handle_docs_delete(self, command_text):
+        """Backspace/delete phrasings without a leading count ("delete the last word", "delete the last 5")"""
+        words = command_text.split()
+        numbers = [parse_number(words[index:]) for index in range(len(words))]
+        numbers = [number for number in numbers if number]
+        if numbers:
+            self.google_docs_handler.backspace_chars(numbers[0][0])
+        elif 'word' in command_text:
+            self.google_docs_handler.delete_word()
+        elif 'line' in command_text:
+            self.google_docs_handler.delete_line()
+        else:
+            self.google_docs_handler.backspace_chars(1)
     
     def set_browser_active(self, browser_name):
         """Called when a browser becomes the active app"""
@@ -107,145 +231,29 @@ class CommandHandler(QObject):
             print("Context changed to: general")
 
     def process_command(self, command_text):
-        """Process a voice command with context awareness"""
+        """
+        Process a voice command with context awareness
+        
+        Returns:
+            True if the utterance resolved to a command and it ran
+        """
         try:
             command_text = command_text.lower().strip()
             
-            # Priority 1: Try Google Docs commands if in Google Docs
-            if self.is_google_docs_active:
-                # Text formatting commands
-                if command_text in ['make this bold', 'bold', 'make bold']:
-                    self.google_docs_handler.make_bold()
-                    return
-                elif command_text in ['make this italic', 'italic', 'make italic']:
-                    self.google_docs_handler.make_italic()
-                    return
-                elif command_text in ['underline this', 'underline', 'make underline']:
-                    self.google_docs_handler.make_underline()
-                    return
-                elif command_text in ['strikethrough', 'strike through']:
-                    self.google_docs_handler.strikethrough()
-                    return
-                
-                # Font size commands
-                elif command_text in ['increase font size', 'bigger font', 'make bigger']:
-                    self.google_docs_handler.increase_font_size()
-                    return
-                elif command_text in ['decrease font size', 'smaller font', 'make smaller']:
-                    self.google_docs_handler.decrease_font_size()
-                    return
-                
-                # Line spacing commands
-                elif command_text in ['single space', 'single spacing']:
-                    self.google_docs_handler.single_space()
-                    return
-                elif command_text in ['double space', 'double spacing']:
-                    self.google_docs_handler.double_space()
-                    return
-                elif command_text in ['line spacing one point five', 'one point five spacing', '1.5 spacing']:
-                    self.google_docs_handler.line_spacing_one_five()
-                    return
-                
-                # List commands
-                elif command_text in ['add bullets', 'bullet list', 'bullets']:
-                    self.google_docs_handler.add_bullets()
-                    return
-                elif command_text in ['add numbering', 'numbered list', 'numbering']:
-                    self.google_docs_handler.add_numbering()
-                    return
-                elif command_text in ['remove bullets', 'remove numbering']:
-                    self.google_docs_handler.remove_bullets()
-                    return
-                
-                # Alignment commands
-                elif command_text in ['align left', 'left align']:
-                    self.google_docs_handler.align_left()
-                    return
-                elif command_text in ['align center', 'center align', 'center']:
-                    self.google_docs_handler.align_center()
-                    return
-                elif command_text in ['align right', 'right align']:
-                    self.google_docs_handler.align_right()
-                    return
-                elif command_text in ['justify', 'justify text']:
-                    self.google_docs_handler.align_justify()
-                    return
-                
-                # Heading commands
-                elif command_text in ['heading one', 'heading 1', 'h1']:
-                    self.google_docs_handler.heading_one()
-                    return
-                elif command_text in ['heading two', 'heading 2', 'h2']:
-                    self.google_docs_handler.heading_two()
-                    return
-                elif command_text in ['heading three', 'heading 3', 'h3']:
-                    self.google_docs_handler.heading_three()
-                    return
-                elif command_text in ['normal text', 'normal style', 'paragraph']:
-                    self.google_docs_handler.normal_text()
-                    return
-                
-                # Color commands
-                elif 'text color' in command_text or 'change color' in command_text:
-                    self.google_docs_handler.change_text_color(command_text)
-                    return
-                elif 'highlight' in command_text:
-                    self.google_docs_handler.highlight_text()
-                    return
-                elif command_text in ['clear formatting', 'remove formatting']:
-                    self.google_docs_handler.clear_formatting()
-                    return
-                # Backspace commands
-                elif 'backspace' in command_text or 'delete' in command_text:
-                    import re
-                    # Try to extract number from command like "backspace 3" or "delete 5 characters"
-                    numbers = re.findall(r'\d+', command_text)
-                    if numbers:
-                        count = int(numbers[0])
-                        self.google_docs_handler.backspace_chars(count)
-                        return
-                    elif 'word' in command_text:
-                        self.google_docs_handler.delete_word()
-                        return
-                    elif 'line' in command_text:
-                        self.google_docs_handler.delete_line()
-                        return
-                    else:
-                        # Default to backspace 1
-                        self.google_docs_handler.backspace_chars(1)
-                        return
-            
-            # Priority 2: Try browser commands if in browser context
-            if self.is_browser_active:
-                # Check for "go to" or "search for" commands (special handling)
-                if command_text.startswith('go to '):
-                    url = command_text[6:].strip()
-                    self.browser_router.execute_command('go_to_url', url)
-                    return
-                elif command_text.startswith('search for '):
-                    query = command_text[11:].strip()
-                    self.browser_router.execute_command('search', query)
-                    return
-                elif command_text.startswith('find '):
-                    text = command_text[5:].strip()
-                    # Remove "on page" suffix if present
-                    if text.endswith(' on page'):
-                        text = text[:-8].strip()
-                    self.browser_router.execute_command('find_on_page', text)
-                    return
-                
-                # Check standard browser commands
-                for cmd, handler in self.browser_commands.items():
-                    if command_text.startswith(cmd):
-                        handler()
-                        return
+            action = self._resolve_command(command_text)
+            if action:
+                action()
+                return True
             
-            # Priority 3: Fall back to general commands
-            for cmd, handler in self.commands.items():
-                if command_text.startswith(cmd):
-                    args = command_text[len(cmd):].strip()
-                    handler(args)
-                    return
+            near_miss = self._fuzzy_match(command_text)
+            if near_miss and near_miss[2] >= self.fuzzy_execute_threshold:
+                corrected, action, confidence = near_miss
+                print(f"🔧 Heard '{command_text}', running '{corrected}' (confidence {confidence:.2f})")
+                action()
+                return True
+            if near_miss and near_miss[2] >= self.fuzzy_suggest_threshold:
+                self.command_failed.emit(f"Unknown command: {command_text}. Did you mean '{near_miss[0]}'?")
+                return False
             
             # No matching command found
             context_hint = ""
@@ -255,91 +263,120 @@ class CommandHandler(QObject):
                 context_hint = " (Try browser commands like 'close tab', 'go back', etc.)"
             
             self.command_failed.emit(f"Unknown command: {command_text}{context_hint}")
+            return False
             
         except Exception as e:
             self.command_failed.emit(f"Error executing command: {str(e)}")
+            return False
 
-    def get_suggestions(self, partial_command):
-        """Get command suggestions based on partial input and context"""
-        suggestions = []
-        partial_command = partial_command.lower()
+    def _resolve_command(self, command_text):
+        """
+        Match a command against the current registry
         
-        # Google Docs-specific commands if in Google Docs context
-        if self.is_google_docs_active:
-            google_docs_commands = [
-                "make bold",
-                "make italic",
-                "underline this",
-                "strikethrough",
-                "increase font size",
-                "decrease font size",
-                "single space",
-                "double space",
-                "1.5 spacing",
-                "add bullets",
-                "add numbering",
-                "remove bullets",
-                "align left",
-                "align center",
-                "align right",
-                "justify",
-                "heading one",
-                "heading two",
-                "heading three",
-                "normal text",
-                "change text color",
-                "highlight this",
-                "clear formatting",
-                "backspace",
-                "delete word",
-                "delete line"
-            ]
-            
-            # Filter Google Docs suggestions
-            for cmd in google_docs_commands:
-                if partial_command in cmd.lower() or not partial_command:
-                    suggestions.append(cmd)
+        Spoken numbers are only read as numbers where a phrase has a {number} slot
+        ("backspace three"); {text} slots and trailing arguments get the words as spoken.
+        """
+        self._refresh_registry()
+        return self._match_command(command_text)
+
+    def _match_command(self, command_text):
+        """
+        Find the handler for a normalized command in the current context
+        
+        Returns:
+            A zero-argument callable that executes the command, or None if nothing matches
+        """
+        return self.dispatcher.match(command_text)
+
+    def _fuzzy_match(self, command_text):
+        """
+        Closest executable command to a misrecognized one ("clothes tab" -> "close tab")
+        
+        Returns:
+            (corrected text, action, confidence), or None
+        """
+        if not self.fuzzy_matching or not command_text:
+            return None
+        found = self.fuzzy_matcher.match(command_text)
+        if not found:
+            return None
+        corrected, phrase, confidence = found
+        action = self._match_command(corrected)
+        if action is None:
+            return None  # The phrase matched but its slots didn't ("backspace" + non-number)
+        return corrected, action, confidence
+
+    def can_execute(self, command_text):
+        """Check whether a command would be understood in the current context"""
+        return self._resolve_command(command_text.lower().strip()) is not None
+
+    def rescore_hypotheses(self, hypotheses):
+        """
+        Pick the recognition alternative that is an executable command
         
-        # Browser-specific commands if in browser context
-        elif self.is_browser_active:
-            browser_commands = [
-                "close tab",
-                "new tab",
-                "close all tabs",
-                "go back",
-                "go forward",
-                "refresh",
-                "bookmark this",
-                "zoom in",
-                "zoom out",
-                "scroll up",
-                "scroll down",
-                "scroll to top",
-                "scroll to bottom",
-                "go to [url]",
-                "search for [query]",
-                "find [text] on page"
-            ]
+        The recognizer's top guess is kept unless it isn't a command here and a
+        lower-ranked alternative is (e.g. "clothes tab" vs "close tab"). Exact
+        phrase matches beat prefix/keyword matches; ties go to the higher rank.
+        
+        Args:
+            hypotheses: Transcripts from the recognizer, best first
             
-            # Filter browser suggestions
-            for cmd in browser_commands:
-                if partial_command in cmd.lower() or not partial_command:
-                    suggestions.append(cmd)
+        Returns:
+            The transcript to process
+        """
+        if not hypotheses:
+            return None
+        
+        self._refresh_registry()
+        best_text = hypotheses[0]
+        best_score = self._hypothesis_score(best_text)
+        top_score = best_score
+        for text in hypotheses[1:]:
+            score = self._hypothesis_score(text)
+            if score > best_score:
+                best_text, best_score = text, score
+        
+        self.rescoring_stats['rescored'] += 1
+        if best_text != hypotheses[0]:
+            self.rescoring_stats['changed'] += 1
+            if top_score == 0:
+                # The top guess would have failed as "Unknown command" and forced a repeat
+                self.rescoring_stats['repeats_avoided'] += 1
+            print(f"🔁 Rescored '{hypotheses[0]}' → '{best_text}' "
+                  f"(repeats avoided: {self.rescoring_stats['repeats_avoided']})")
+        return best_text
+
+    def _hypothesis_score(self, text):
+        """Score how well a transcript matches the commands accepted in this context"""
+        normalized = text.lower().strip()
+        if self._match_command(normalized) is None:
+            return 0
+        if normalized in self.get_context_phrases():
+            return 2  # Exact phrase
+        return 1  # Prefix or keyword match (e.g. "open safari")
+
+    def get_context_phrases(self):
+        """All fixed command phrases accepted in the current context (built once per registry version)"""
+        key = (self._registry_version, self.dispatcher.context)
+        if self._context_phrases[0] != key:
+            self._context_phrases = (key, frozenset(self.dispatcher.phrases()))
+        return self._context_phrases[1]
+
+    def get_suggestions(self, partial_command):
+        """Get command suggestions based on partial input and context"""
+        self._refresh_registry()
+        partial_command = partial_command.lower()
         
-        # Always include basic commands
-        basic_commands = [
-            "open [app name]",
-            "close [app name]",
-            "switch to [app name]",
-            "minimize window",
-            "maximize window",
-            "show help"
-        ]
+        # Word-prefix lookup in the current context's trie, most used (recently) first
+        suggestions = self.suggestion_index.suggest(self.current_context, partial_command)
         
-        # Filter basic suggestions based on partial command
-        for cmd in basic_commands:
-            if partial_command in cmd.lower():
-                suggestions.append(cmd)
+        # Offer the likely intended command for a misrecognized one (not the words as said,
+        # which a phrase that takes trailing words matches while they are still being spoken)
+        spoken = ' '.join(partial_command.split())
+        near_miss = self._fuzzy_match(spoken)
+        if (near_miss and near_miss[2] >= self.fuzzy_suggest_threshold and near_miss[0] != spoken
+                and near_miss[0] not in suggestions):
+            suggestions.insert(0, near_miss[0])
         
         self.suggestion_updated.emit(suggestions)
 
@@ -0,0 +1,260 @@
+"""
+Command Registry
+The single source of command phrases. The "registry" section of data/commands.json
+declares every phrase once, with the action it runs, its suggestion text and its
+quick reference entry; the matcher (CommandDispatcher), get_suggestions and the
+QuickReferenceCard are all built from it.
+
+The compiled form is cached with pickle under ~/.voice_assistant/cache, keyed by the
+SHA-256 of the JSON file, so startup skips parsing and validation when the file is
+unchanged. The file is re-checked at most once a second and reloaded when it
+changes, so new phrases take effect without a restart.
+
+Registry format:
+    {"registry": {"contexts": {"browser": {
+        "title": "🌐 Browser Commands",
+        "tail": "ignore",                     # default tail for this context's phrases
+        "sections": [{"name": "Navigation", "commands": [
+            {"phrases": ["go back"], "action": "browser.go_back",
+             "suggest": "go back", "help": "Navigate back"},
+            {"keywords": ["highlight"], "action": "docs.highlight_text", "with_text": false, ...},
+            {"reference": "undo that", "help": "..."}       # quick reference only
+        ]}]
+    }}}}
+
+Actions are resolved by the CommandHandler: 'browser.<command>' and 'docs.<method>'
+call the browser router and Google Docs handler, anything else names one of its
+own handlers.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import pickle
+import time
+
+from .command_dispatcher import CONTEXTS, TEXT
+
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'commands.json')
+CACHE_DIR = os.path.expanduser('~/.voice_assistant/cache')
+CACHE_FORMAT = 2  # Bump when the compiled layout changes
+TAILS = ('none', 'ignore', 'args')
+
+
+def _expect(value, kind, where):
+    """value, or ValueError if it isn't of the given JSON kind (dict/list/str) - the file is hand-edited"""
+    if not isinstance(value, kind):
+        expected = {dict: 'an object', list: 'a list', str: 'text'}[kind]
+        raise ValueError(f"{where} must be {expected}, not {type(value).__name__}")
+    return value
+
+
+def _strings(value, where):
+    """A string or a list of strings, as a list"""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise ValueError(f"{where} must be text or a list of text")
+    return value
+
+
+def compile_registry(data):
+    """
+    Validate the registry section and flatten it into plain lookup tables
+
+    Args:
+        data: The parsed commands.json
+
+    Returns:
+        dict with 'patterns' [(phrase, action, group, tail)], 'keywords'
+        [(keywords, action, group, with_text)], 'suggestions' {context: [(text, action)]},
+        'phrases' {group: [phrase]} and 'reference' {context: (title, [(section, [(label, help)])])}
+
+    Raises:
+        ValueError: If the registry is malformed
+    """
+    registry = _expect(_expect(data, dict, "commands.json").get('registry', {}), dict, "registry")
+    contexts = registry.get('contexts')
+    if not isinstance(contexts, dict):
+        raise ValueError("commands.json has no registry.contexts section")
+
+    compiled = {'patterns': [], 'keywords': [], 'suggestions': {}, 'phrases': {}, 'reference': {}}
+    for context, spec in contexts.items():
+        _expect(spec, dict, context)
+        matchable = context in CONTEXTS  # Other contexts (e.g. 'typing') are reference only
+        default_tail = spec.get('tail', 'none')
+        suggestions = []
+        phrases = []
+        sections = []
+        for section in _expect(spec.get('sections', []), list, f"{context}.sections"):
+            _expect(section, dict, f"{context} section")
+            name = _expect(section.get('name', ''), str, f"{context} section name")
+            entries = []
+            for command in _expect(section.get('commands', []), list, f"{context}: {name} commands"):
+                _expect(command, dict, f"{context}: {name} command")
+                action = command.get('action')
+                if action is not None:
+                    _expect(action, str, f"{context}: action")
+                command_phrases = _strings(command.get('phrases'), f"{context}: phrases")
+                if matchable and 'phrases' in command:
+                    if not action:
+                        raise ValueError(f"{context}: {command_phrases} has no action")
+                    tail = command.get('tail', default_tail)
+                    if tail not in TAILS:
+                        raise ValueError(f"{context}: unknown tail '{tail}' for {command_phrases}")
+                    for phrase in command_phrases:
+                        phrase = ' '.join(phrase.lower().split())
+                        tokens = phrase.split()
+                        if not tokens or TEXT in tokens[:-1]:
+                            raise ValueError(f"{context}: invalid phrase '{phrase}'")
+                        compiled['patterns'].append((phrase, action, context, tail))
+                        if '{' not in phrase:
+                            phrases.append(phrase)
+                elif matchable and 'keywords' in command:
+                    if not action:
+                        raise ValueError(f"{context}: {command['keywords']} has no action")
+                    keywords = _strings(command['keywords'], f"{context}: keywords")
+                    compiled['keywords'].append((tuple(keywords), action, context,
+                                                 bool(command.get('with_text', True))))
+                suggestions.extend((text, action) for text in _strings(command.get('suggest'), f"{context}: suggest"))
+
+                # Reference label: explicit (empty hides the entry), else the first phrase
+                labels = _strings(command.get('reference', command_phrases[:1]), f"{context}: reference")
+                labels = [label for label in labels if label]
+                if labels:
+                    entries.append((labels, _expect(command.get('help', ''), str, f"{context}: help")))
+            sections.append((name, entries))
+        compiled['suggestions'][context] = suggestions
+        compiled['phrases'][context] = phrases
+        compiled['reference'][context] = (_expect(spec.get('title', context), str, f"{context}.title"), sections)
+    return compiled
+
+
+class CommandRegistry:
+    """Command phrases loaded from JSON, compiled once and reloaded on change"""
+
+    RELOAD_CHECK_INTERVAL = 1.0  # Seconds between modification-time checks
+
+    def __init__(self, path=DEFAULT_PATH, cache_dir=CACHE_DIR):
+        """
+        Args:
+            path: JSON file with a "registry" section
+            cache_dir: Where compiled registries are cached (None disables the cache)
+        """
+        self.path = os.path.abspath(path)
+        self.cache_dir = cache_dir
+        self.version = 0  # Incremented on every successful (re)load
+        self.digest = None
+        self._compiled = {'patterns': [], 'keywords': [], 'suggestions': {}, 'phrases': {}, 'reference': {}}
+        self._mtime = None
+        self._last_check = 0.0
+        self.reload()
+
+    def _cache_path(self, digest):
+        return os.path.join(self.cache_dir, f"commands-{CACHE_FORMAT}-{digest[:16]}.pickle")
+
+    def _load_cached(self, digest):
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._cache_path(digest), 'rb') as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+
+    def _store_cached(self, digest, compiled):
+        if not self.cache_dir:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Drop caches of earlier versions of the file
+            for stale in glob.glob(os.path.join(self.cache_dir, 'commands-*.pickle')):
+                os.remove(stale)
+            temp_path = self._cache_path(digest) + '.tmp'
+            with open(temp_path, 'wb') as f:
+                pickle.dump(compiled, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self._cache_path(digest))
+        except OSError as e:
+            print(f"Warning: Could not cache command registry: {e}")
+
+    def reload(self):
+        """Load (or fetch from cache) the registry; keeps the old one if the file is invalid"""
+        try:
+            self._mtime = os.path.getmtime(self.path)
+            with open(self.path, 'rb') as f:
+                raw = f.read()
+        except OSError as e:
+            print(f"Warning: Could not read command registry {self.path}: {e}")
+            return False
+
+        digest = hashlib.sha256(raw).hexdigest()
+        if digest == self.digest:
+            return False  # Touched but unchanged
+
+        compiled = self._load_cached(digest)
+        if compiled is None:
+            try:
+                compiled = compile_registry(json.loads(raw))
+            except ValueError as e:
+                print(f"Warning: Invalid command registry {self.path}: {e}")
+                return False
+            self._store_cached(digest, compiled)
+
+        self._compiled = compiled
+        self.digest = digest
+        self.version += 1
+        print(f"Loaded {len(compiled['patterns'])} command phrases")
+        return True
+
+    def reload_if_changed(self):
+        """
+        Reload when the file's modification time changes (checked at most once a second)
+
+        Returns:
+            True if a new registry was loaded
+        """
+        now = time.monotonic()
+        if now - self._last_check < self.RELOAD_CHECK_INTERVAL:
+            return False
+        self._last_check = now
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return False
+        if mtime != self._mtime:
+            return self.reload()
+        return False
+
+    @property
+    def patterns(self):
+        """(phrase, action, group, tail) for every matchable phrase"""
+        return self._compiled['patterns']
+
+    @property
+    def keywords(self):
+        """(keywords, action, group, with_text) fallbacks"""
+        return self._compiled['keywords']
+
+    def phrases(self, group):
+        """Slot-free phrases declared in one group, in file order"""
+        return self._compiled['phrases'].get(group, [])
+
+    def suggestions(self, context):
+        """Suggestion texts declared in one context, in file order"""
+        return [text for text, action in self._compiled['suggestions'].get(context, [])]
+
+    def suggestion_actions(self, context):
+        """(suggestion text, action) pairs declared in one context, in file order"""
+        return self._compiled['suggestions'].get(context, [])
+
+    def reference(self, context):
+        """
+        Quick reference for one context
+
+        Returns:
+            (title, [(section name, [(labels, help)])]), or None for an unknown context
+        """
+        return self._compiled['reference'].get(context)
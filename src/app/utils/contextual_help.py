@@ -20,7 +20,9 @@ class ContextualHelp:
             ],
             "editing": [
                 "Say 'undo that' to undo the last change",
-                "Say 'delete that' to delete the last phrase"
+                "Say 'delete that' to delete the last phrase",
+                "Say 'scratch that' to remove the last thing you dictated",
+                "Say 'replace [word] with [word]' to fix a misheard word"
             ]
         }
 
@@ -0,0 +1,185 @@
+"""
+Dictation Journal
+Remembers every span of dictated text injected into the target app, in order, so
+"undo that" / "scratch that" can remove exactly the last span and "replace X with Y"
+can fix a misrecognized word with a minimal edit - all with backspaces and typing,
+without reading the document back. The journal describes the text just before the
+cursor, so it is cleared whenever that assumption breaks (another app, a command,
+cancelled typing).
+
+A span that leaves the journal uncorrected (cleared or pushed out by newer spans) is
+handed to on_retire with the transcript it came from; that is the point where the
+dictation is known to be kept. Spans removed by undo, replace or a cancelled job are not;
+a span taken back by undo is handed to on_undo instead.
+"""
+
+import re
+import time
+from collections import deque
+
+from .live_typing import minimal_edit
+
+
+UNDO_PHRASES = ("undo that", "scratch that", "delete that")
+_REPLACE = re.compile(r'^replace (.+?) with (.+)$')
+
+
+def parse_correction(text):
+    """
+    Recognize a correction command
+
+    Returns:
+        ('undo', None), ('replace', (old, new)) or None if text isn't a correction
+    """
+    text = text.lower().strip().rstrip('.!')
+    if text in UNDO_PHRASES:
+        return 'undo', None
+    match = _REPLACE.match(text)
+    if match:
+        return 'replace', (match.group(1).strip(), match.group(2).strip())
+    return None
+
+
+class JournalEntry:
+    """One injected span"""
+
+    __slots__ = ('text', 'app', 'timestamp', 'source')
+
+    def __init__(self, text, app, timestamp=None, source=None):
+        self.text = text
+        self.app = app
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self.source = source  # Transcript the span was typed from (None = don't retire it)
+
+    @property
+    def length(self):
+        return len(self.text)
+
+    def __repr__(self):
+        return f"JournalEntry({self.text!r}, app={self.app!r})"
+
+
+class DictationJournal:
+    """Ordered record of the spans typed at the cursor, newest last"""
+
+    def __init__(self, max_entries=100, on_retire=None, on_undo=None):
+        """
+        Args:
+            max_entries: Oldest spans are forgotten beyond this many
+            on_retire: Called with the source transcript of each span that leaves the
+                       journal uncorrected
+            on_undo: Called with the source transcript of each span removed by undo
+        """
+        self.entries = deque(maxlen=max_entries)
+        self.on_retire = on_retire
+        self.on_undo = on_undo
+
+    def __len__(self):
+        return len(self.entries)
+
+    def record(self, text, app, backspaces=0, new_span=True, source=None):
+        """
+        Note an injection: backspaces deleted before the cursor, then text typed
+
+        Args:
+            text: Text typed
+            app: Application it went into
+            backspaces: Characters deleted first (taken off the newest spans)
+            new_span: False to extend the newest span (a live dictation correction)
+                      instead of starting a new one
+            source: Transcript the text was typed from, for on_retire
+        """
+        if self.entries and self.entries[-1].app != app:
+            self.clear()
+        self._trim(backspaces)
+        if not new_span and self.entries:
+            self.entries[-1].text += text
+            if source is not None:
+                self.entries[-1].source = source
+        elif text:
+            if len(self.entries) == self.entries.maxlen:
+                self._retire(self.entries.popleft())
+            self.entries.append(JournalEntry(text, app, source=source))
+
+    def attach(self, source, app):
+        """Tie the newest span to its transcript (a live phrase that was finalized as typed)"""
+        if self.entries and self.entries[-1].app == app and self.entries[-1].source is None:
+            self.entries[-1].source = source
+
+    def _retire(self, entry):
+        if self.on_retire and entry.source:
+            self.on_retire(entry.source)
+
+    def _trim(self, count):
+        """Drop count characters from the end of the journal"""
+        while count > 0 and self.entries:
+            last = self.entries[-1]
+            if last.length > count:
+                last.text = last.text[:-count]
+                return
+            count -= last.length
+            self.entries.pop()
+
+    def undo(self, app):
+        """
+        Forget the newest span
+
+        Returns:
+            Number of characters to backspace, or 0 if there's nothing to undo in app
+        """
+        if not self.entries or self.entries[-1].app != app:
+            return 0
+        entry = self.entries.pop()
+        if self.on_undo and entry.source:
+            self.on_undo(entry.source)
+        return entry.length
+
+    def replace(self, old, new, app):
+        """
+        Replace the most recent whole-word occurrence of old (case-insensitive) with new
+
+        A capitalized occurrence keeps its capital ("Jon" -> "John" for "replace jon with john").
+
+        Returns:
+            (backspaces, text) edit to send, or None if old isn't in the journal
+        """
+        if not self.entries or self.entries[-1].app != app or not old:
+            return None
+        entries = list(self.entries)
+        tail = ''
+        for index in range(len(entries) - 1, -1, -1):
+            tail = entries[index].text + tail
+            matches = list(re.finditer(r'(?<!\w)' + re.escape(old) + r'(?!\w)', tail, re.IGNORECASE))
+            if matches:
+                break
+        else:
+            return None
+
+        match = matches[-1]
+        if match.group(0)[:1].isupper():
+            new = new[:1].upper() + new[1:]
+        revised = tail[:match.start()] + new + tail[match.end():]
+
+        # The spans from the match onwards become one span holding the corrected text
+        for _ in range(len(entries) - index):
+            self.entries.pop()
+        self.entries.append(JournalEntry(revised, app))
+
+        backspaces, insert = minimal_edit(tail, revised)
+        return backspaces, insert
+
+    def text(self):
+        """Everything the journal believes is before the cursor"""
+        return ''.join(entry.text for entry in self.entries)
+
+    def clear(self, retire=True):
+        """
+        Forget every span
+
+        Args:
+            retire: Hand the spans to on_retire (False when they didn't make it on screen intact)
+        """
+        if retire:
+            for entry in self.entries:
+                self._retire(entry)
+        self.entries.clear()
@@ -0,0 +1,178 @@
+"""
+Dictation Language Model
+A compact n-gram model learned from the user's accepted dictation.
+Counts live in fixed-size hashed tables inside a memory-mapped file, so memory use
+is bounded no matter how much is dictated and lookups are a hash plus an array read.
+"""
+
+import math
+import mmap
+import os
+import re
+import struct
+import zlib
+
+
+class DictationLanguageModel:
+    """Hashed unigram/bigram/trigram counts with stupid-backoff scoring"""
+
+    MAGIC = b'VALM'
+    VERSION = 1
+    HEADER = struct.Struct('<4sIIIQ')  # magic, version, buckets, reserved, total tokens
+    HEADER_SIZE = 32
+    ORDERS = 3
+    BACKOFF = 0.4
+    MAX_COUNT = 0xFFFFFFFF
+    FLUSH_EVERY = 20  # Sync to disk after this many learned utterances
+
+    SENTENCE_START = '<s>'
+    SENTENCE_END = '</s>'
+
+    def __init__(self, path, buckets=1 << 18):
+        """
+        Args:
+            path: File backing the model (created if missing)
+            buckets: Slots per n-gram order; file size is about 12 bytes per bucket
+        """
+        self.path = path
+        self.buckets = buckets
+        self._file = None
+        self._mmap = None
+        self._tables = None
+        self._views = None
+        self._pending_updates = 0
+        self._open()
+
+    def _open(self):
+        """Open (or create) the backing file and map it into memory"""
+        size = self.HEADER_SIZE + self.ORDERS * self.buckets * 4
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+
+        if os.path.exists(self.path) and not self._header_matches(size):
+            print("Dictation language model file is incompatible - starting a fresh one")
+            os.remove(self.path)
+
+        if not os.path.exists(self.path):
+            with open(self.path, 'wb') as f:
+                f.write(self.HEADER.pack(self.MAGIC, self.VERSION, self.buckets, 0, 0).ljust(self.HEADER_SIZE, b'\0'))
+                f.truncate(size)
+
+        self._file = open(self.path, 'r+b')
+        self._mmap = mmap.mmap(self._file.fileno(), size)
+        raw = memoryview(self._mmap)
+        counts = raw[self.HEADER_SIZE:].cast('I')
+        self._tables = [counts[i * self.buckets:(i + 1) * self.buckets] for i in range(self.ORDERS)]
+        self._views = [raw, counts]
+
+    def _header_matches(self, size):
+        """Check that an existing file was written with the same layout"""
+        try:
+            if os.path.getsize(self.path) != size:
+                return False
+            with open(self.path, 'rb') as f:
+                magic, version, buckets, _, _ = self.HEADER.unpack(f.read(self.HEADER.size))
+            return magic == self.MAGIC and version == self.VERSION and buckets == self.buckets
+        except (OSError, struct.error):
+            return False
+
+    @property
+    def total_tokens(self):
+        return self.HEADER.unpack_from(self._mmap, 0)[4]
+
+    def _set_total_tokens(self, total):
+        self.HEADER.pack_into(self._mmap, 0, self.MAGIC, self.VERSION, self.buckets, 0, total)
+
+    @staticmethod
+    def tokenize(text):
+        """Lowercased word tokens"""
+        return re.findall(r"[a-z0-9']+", text.lower())
+
+    def _slot(self, ngram):
+        return zlib.crc32('\x1f'.join(ngram).encode('utf-8')) % self.buckets
+
+    def _count(self, ngram):
+        return self._tables[len(ngram) - 1][self._slot(ngram)]
+
+    def learn(self, text):
+        """Add an accepted utterance to the model"""
+        words = self.tokenize(text)
+        if not words:
+            return
+        tokens = [self.SENTENCE_START] + words + [self.SENTENCE_END]
+        for order in range(1, self.ORDERS + 1):
+            table = self._tables[order - 1]
+            for i in range(len(tokens) - order + 1):
+                slot = self._slot(tokens[i:i + order])
+                if table[slot] < self.MAX_COUNT:
+                    table[slot] += 1
+        self._set_total_tokens(self.total_tokens + len(tokens))
+
+        self._pending_updates += 1
+        if self._pending_updates >= self.FLUSH_EVERY:
+            self.flush()
+
+    def _word_log_prob(self, history, word):
+        """Stupid-backoff log score of word given up to two previous tokens"""
+        penalty = 0.0
+        for n in range(len(history), 0, -1):
+            context = history[-n:]
+            numerator = self._count(context + [word])
+            if numerator:
+                denominator = self._count(context)
+                if denominator:
+                    return penalty + math.log(min(1.0, numerator / denominator))
+            penalty += math.log(self.BACKOFF)
+        # Unigram with add-one smoothing over the table size
+        return penalty + math.log((self._count([word]) + 1) / (self.total_tokens + self.buckets))
+
+    def score(self, text):
+        """Average per-token log score of an utterance (higher is more familiar)"""
+        words = self.tokenize(text)
+        if not words:
+            return float('-inf')
+        tokens = [self.SENTENCE_START] + words + [self.SENTENCE_END]
+        total = 0.0
+        for i in range(1, len(tokens)):
+            total += self._word_log_prob(tokens[max(0, i - self.ORDERS + 1):i], tokens[i])
+        return total / (len(tokens) - 1)
+
+    def best_hypothesis(self, hypotheses, rank_penalty=0.5):
+        """
+        Rescore recognition alternatives
+
+        Args:
+            hypotheses: Transcripts from the recognizer, best first
+            rank_penalty: Log-score cost per rank, so the recognizer's order still matters
+
+        Returns:
+            The transcript with the best combined score
+        """
+        if not hypotheses:
+            return None
+        if self.total_tokens == 0:
+            return hypotheses[0]
+        scored = [
+            (self.score(text) - rank * rank_penalty, -rank, text)
+            for rank, text in enumerate(hypotheses)
+        ]
+        return max(scored)[2]
+
+    def flush(self):
+        """Write pending counts to disk"""
+        if self._mmap is not None:
+            self._mmap.flush()
+        self._pending_updates = 0
+
+    def close(self):
+        """Flush and unmap the model file"""
+        if self._mmap is None:
+            return
+        self.flush()
+        for view in self._tables + self._views[::-1]:
+            view.release()
+        self._tables = None
+        self._views = None
+        self._mmap.close()
+        self._mmap = None
+        self._file.close()
+        self._file = None
@@ -0,0 +1,219 @@
+"""
+Fuzzy Command Matcher
+Recovers commands from single-word recognition errors ("clothes tab", "scroll dawn").
+Every registered phrase is indexed once, when the registry is compiled, by the
+character trigrams of its words and by a phonetic key (a small Metaphone-style code,
+so "dawn" and "down" both become "tn"). A lookup only scores the phrases that share
+trigrams with the utterance, which keeps it well under a millisecond.
+
+Confidence is a blend of phonetic and spelling similarity in [0, 1], lowered when
+the utterance has a different number of words than the phrase or says a plural the
+phrase doesn't ("paragraphs" is not "paragraph"). Numbers are never approximated:
+"heading 4" or "heading four" can't become "heading 1" or "heading three". The
+caller decides what to do with the confidence: execute above one threshold, ask
+"did you mean" above a lower one.
+"""
+
+from .command_dispatcher import CONTEXTS, CONTEXT_GROUPS
+from .text_normalizer import parse_number
+
+# Letter groups that sound alike, rewritten before coding
+_DIGRAPHS = (('tch', 'x'), ('sch', 'sk'), ('ph', 'f'), ('th', '0'), ('sh', 'x'), ('ch', 'x'),
+             ('ck', 'k'), ('gh', ''), ('wh', 'w'), ('kn', 'n'), ('wr', 'r'), ('qu', 'kw'))
+_CODES = {'b': 'p', 'c': 'k', 'd': 't', 'g': 'k', 'q': 'k', 'v': 'f', 'z': 's', 'x': 'ks'}
+_SILENT = set('aeiouyhw')
+PHONETIC_WEIGHT = 0.6  # Share of the confidence from sound; the rest from spelling
+WORD_COUNT_PENALTY = 0.1  # Confidence lost per word more or fewer than the phrase has
+PLURAL_PENALTY = 0.85  # Confidence kept when a word is the plural of a phrase word
+
+
+def phonetic_key(word):
+    """
+    Metaphone-style code for one word ("close" -> "kls", "clothes" -> "kl0s")
+
+    Digits are kept as they are, so "heading 2" stays distinct from "heading 3".
+    """
+    word = ''.join(char for char in word.lower() if char.isalnum())
+    if not word or word.isdigit():
+        return word
+    for group, code in _DIGRAPHS:
+        word = word.replace(group, code)
+    key = []
+    for index, char in enumerate(word):
+        if char in _SILENT:
+            if index == 0:
+                key.append('a')  # Keep a leading vowel: "add" vs "dd"
+            continue
+        if char == 'c' and word[index + 1:index + 2] in ('e', 'i', 'y'):
+            code = 's'
+        else:
+            code = _CODES.get(char, char)
+        if not key or key[-1] != code:
+            key.append(code)
+    return ''.join(key)
+
+
+def _numbers(words):
+    """Values of the numbers among words, digits or spoken ("heading four" -> (4,))"""
+    values = []
+    position = 0
+    while position < len(words):
+        number = parse_number(words[position:])
+        if number is None:
+            position += 1
+            continue
+        values.append(number[0])
+        position += number[1]
+    return tuple(values)
+
+
+def _penalty(words, entry):
+    """Share of the confidence kept for word-count and plural differences"""
+    factor = 1.0 - WORD_COUNT_PENALTY * abs(len(words) - len(entry.words))
+    if any(word not in entry.words and (word[:-1] in entry.words or word[:-2] in entry.words)
+           for word in words if word.endswith('s')):
+        factor *= PLURAL_PENALTY
+    return factor
+
+
+def _trigrams(text):
+    padded = f" {text} "
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+def _similarity(first, second):
+    """1 - normalized Levenshtein distance"""
+    if first == second:
+        return 1.0
+    if not first or not second:
+        return 0.0
+    previous = list(range(len(second) + 1))
+    for row, char in enumerate(first, 1):
+        current = [row]
+        for column, other in enumerate(second, 1):
+            current.append(min(previous[column] + 1, current[column - 1] + 1,
+                               previous[column - 1] + (char != other)))
+        previous = current
+    return 1.0 - previous[-1] / max(len(first), len(second))
+
+
+class _Entry:
+    __slots__ = ('words', 'phrase', 'key', 'trigrams', 'numbers', 'accepts_tail')
+
+    def __init__(self, words, phrase, accepts_tail):
+        self.words = words  # Literal words before any slot
+        self.phrase = phrase  # Registered phrase, for display
+        # Compared without spaces, so split or merged words still line up ("in crease")
+        self.key = phonetic_key(''.join(words))
+        self.trigrams = _trigrams(''.join(words))
+        self.numbers = _numbers(words)
+        self.accepts_tail = accepts_tail
+
+
+class FuzzyMatcher:
+    """Per-context trigram and phonetic index over the registered phrases"""
+
+    MAX_CANDIDATES = 8  # Phrases scored per utterance prefix, by shared trigrams
+
+    def __init__(self, patterns=()):
+        """
+        Args:
+            patterns: (phrase, action, group, tail) tuples, as CommandRegistry.patterns
+        """
+        self.context = 'general'
+        self._indexes = {}
+        self.compile(patterns)
+
+    def compile(self, patterns):
+        """Index the phrases of every context (also used to load a new table)"""
+        patterns = list(patterns)
+        indexes = {}
+        for context in CONTEXTS:
+            groups = CONTEXT_GROUPS[context]
+            entries = {}
+            for phrase, action, group, tail in patterns:
+                if group not in groups:
+                    continue
+                tokens = phrase.split()
+                words = []
+                for token in tokens:
+                    if token.startswith('{'):
+                        break
+                    words.append(token)
+                if not words:
+                    continue
+                accepts_tail = tail != 'none' or len(words) < len(tokens)
+                key = (tuple(words), accepts_tail)
+                if key not in entries:
+                    entries[key] = _Entry(tuple(words), phrase, accepts_tail)
+            indexes[context] = self._build_index(list(entries.values()))
+        self._indexes = indexes
+        self._index = indexes[self.context]
+
+    @staticmethod
+    def _build_index(entries):
+        """(entries, trigram -> entry positions, longest phrase in words)"""
+        postings = {}
+        for position, entry in enumerate(entries):
+            for trigram in entry.trigrams:
+                postings.setdefault(trigram, []).append(position)
+        longest = max((len(entry.words) for entry in entries), default=0)
+        return entries, postings, longest
+
+    def set_context(self, context):
+        """Make context's index the active one"""
+        if context not in self._indexes:
+            raise ValueError(f"Unknown command context: {context}")
+        self.context = context
+        self._index = self._indexes[context]
+
+    def match(self, command_text):
+        """
+        Closest registered phrase to the start of an utterance
+
+        Args:
+            command_text: Normalized (lowercase) utterance that didn't match exactly
+
+        Returns:
+            (corrected text, phrase, confidence), or None if nothing is close.
+            The corrected text keeps any words after the phrase ("goat to example.com"
+            -> "go to example.com").
+        """
+        entries, postings, longest = self._index
+        words = command_text.split()
+        best = None
+        best_key = (0.0, 0)
+        # Try each utterance prefix; one extra word allows for a phrase split in two
+        for length in range(1, min(len(words), longest + 1) + 1):
+            head_words = words[:length]
+            head = ''.join(head_words)
+            head_numbers = _numbers(head_words)
+            has_tail = len(words) > length
+            trigrams = _trigrams(head)
+            shared = {}
+            for trigram in trigrams:
+                for position in postings.get(trigram, ()):
+                    shared[position] = shared.get(position, 0) + 1
+            if not shared:
+                continue
+            head_key = phonetic_key(head)
+            for position in sorted(shared, key=shared.get, reverse=True)[:self.MAX_CANDIDATES]:
+                entry = entries[position]
+                if has_tail and not entry.accepts_tail:
+                    continue
+                if head_numbers != entry.numbers:
+                    continue  # A different number is a different command
+                penalty = _penalty(head_words, entry)
+                spelling = 2.0 * shared[position] / (len(trigrams) + len(entry.trigrams))
+                if penalty * (PHONETIC_WEIGHT + (1 - PHONETIC_WEIGHT) * spelling) < best_key[0]:
+                    continue  # Can't win even if it sounds identical
+                sound = _similarity(head_key, entry.key)
+                score = penalty * (PHONETIC_WEIGHT * sound + (1 - PHONETIC_WEIGHT) * spelling)
+                # Covering more of the utterance wins ties ("close all tabs" over "close")
+                if (score, length) > best_key:
+                    best, best_key = (entry, words[length:]), (score, length)
+        if best is None:
+            return None
+        entry, rest = best
+        corrected = ' '.join(entry.words + tuple(rest))
+        return corrected, entry.phrase, round(best_key[0], 3)
@@ -15,6 +15,7 @@ class GlobalHotkeyManager(QObject):
     # Signals
     hotkey_triggered = pyqtSignal(str)  # Emits the hotkey name
     toggle_listening = pyqtSignal()  # For Ctrl+Space toggle
+    stop_typing = pyqtSignal()  # For Ctrl+Shift+S - cancel text being typed
     
     def __init__(self):
         super().__init__()
@@ -26,11 +27,14 @@ class GlobalHotkeyManager(QObject):
         self.hotkeys = {
             'toggle_listening': {Key.ctrl_l, Key.space},  # Left Ctrl + Space
             'toggle_listening_r': {Key.ctrl_r, Key.space},  # Right Ctrl + Space (also works)
+            'stop_typing': {Key.ctrl_l, Key.shift, KeyCode.from_char('s')},
+            'stop_typing_r': {Key.ctrl_r, Key.shift, KeyCode.from_char('s')},
         }
         
         print("Global hotkey manager initialized")
         print("Hotkeys available:")
         print("  - Ctrl+Space: Toggle voice listening")
+        print("  - Ctrl+Shift+S: Stop typing")
     
     def start(self):
         """Start listening for global hotkeys"""
@@ -66,8 +70,15 @@ class GlobalHotkeyManager(QObject):
     def _normalize_key(self, key):
         """Normalize key representation for comparison"""
         # Handle both Key enum and KeyCode
-        if isinstance(key, KeyCode):
-            return key
+        if isinstance(key, KeyCode) and key.char:
+            char = key.char
+            # With Ctrl held some platforms report control characters ('\x13' for S)
+            if len(char) == 1 and ord(char) < 32:
+                char = chr(ord(char) + 96)
+            # Shift reports upper case; compare letters case-insensitively
+            return KeyCode.from_char(char.lower())
+        if key in (Key.shift_l, Key.shift_r):
+            return Key.shift
         return key
     
     def _on_press(self, key):
@@ -110,6 +121,12 @@ class GlobalHotkeyManager(QObject):
             # Clear keys to prevent repeated triggers
             # (wait for release before allowing another trigger)
             self.current_keys.clear()
+        elif self.hotkeys['stop_typing'].issubset(self.current_keys) or \
+             self.hotkeys['stop_typing_r'].issubset(self.current_keys):
+            print("⏹️ Ctrl+Shift+S detected - stopping typing")
+            self.stop_typing.emit()
+            self.hotkey_triggered.emit('stop_typing')
+            self.current_keys.clear()
     
     def cleanup(self):
         """Clean up resources"""
@@ -126,7 +143,7 @@ class HotkeyConfig:
     DEFAULT_HOTKEYS = {
         'toggle_listening': 'Ctrl+Space',
         'start_typing': 'Ctrl+Shift+T',
-        'stop_all': 'Ctrl+Shift+S',
+        'stop_typing': 'Ctrl+Shift+S',
         'show_commands': 'Ctrl+Shift+H',
     }
     
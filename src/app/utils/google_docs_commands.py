@@ -17,6 +17,7 @@ class GoogleDocsCommands(QObject):
         super().__init__()
         self.browser_name = browser_name
         self.process_name = "Google Chrome" if "chrome" in browser_name.lower() else browser_name
+        self.key_repeat_delay = 0.005  # Seconds between repeated key events inside one script (typing.key_repeat_interval)
     
     def set_browser(self, browser_name):
         """Update which browser Google Docs is running in"""
@@ -76,6 +77,33 @@ class GoogleDocsCommands(QObject):
         script = '\n'.join(script_parts)
         return self.execute_applescript(script)
     
+    def press_key_code(self, key_code, count=1, modifiers=()):
+        """
+        Press a key count times from a single AppleScript run
+        
+        One osascript process handles the whole burst, so "delete 40 characters"
+        costs one script launch instead of forty.
+        
+        Args:
+            key_code: macOS virtual key code (51 = delete/backspace)
+            count: Number of presses
+            modifiers: AppleScript modifier names, e.g. ('option',) or ('command', 'shift')
+        """
+        using = ''
+        if modifiers:
+            using = ' using {' + ', '.join(f'{mod} down' for mod in modifiers) + '}'
+        script = f'''
+        tell application "System Events"
+            tell process "{self.process_name}"
+                repeat {int(count)} times
+                    key code {int(key_code)}{using}
+                    delay {self.key_repeat_delay}
+                end repeat
+            end tell
+        end tell
+        '''
+        return self.execute_applescript(script)
+    
     # Text Style Commands
     def make_bold(self):
         """Toggle bold formatting"""
@@ -361,11 +389,10 @@ class GoogleDocsCommands(QObject):
                 self.command_failed.emit(f"Invalid backspace count: {count} (must be 1-100)")
                 return
             
-            for _ in range(count):
-                success, msg = self._press_special_key(51)  # 51 is delete/backspace key code
-                if not success:
-                    self.command_failed.emit(f"Failed to backspace: {msg}")
-                    return
+            success, msg = self.press_key_code(51, count)  # 51 is delete/backspace key code
+            if not success:
+                self.command_failed.emit(f"Failed to backspace: {msg}")
+                return
             
             self.command_executed.emit(f"Deleted {count} character{'s' if count > 1 else ''}")
         except ValueError:
@@ -373,14 +400,7 @@ class GoogleDocsCommands(QObject):
     
     def delete_word(self):
         """Delete the previous word (Option+Delete)"""
-        script = '''
-        tell application "System Events"
-            tell process "''' + self.process_name + '''"
-                key code 51 using {option down}
-            end tell
-        end tell
-        '''
-        success, msg = self.execute_applescript(script)
+        success, msg = self.press_key_code(51, modifiers=('option',))
         if success:
             self.command_executed.emit("Deleted word")
         else:
@@ -388,14 +408,7 @@ class GoogleDocsCommands(QObject):
     
     def delete_line(self):
         """Delete the current line (Cmd+Delete)"""
-        script = '''
-        tell application "System Events"
-            tell process "''' + self.process_name + '''"
-                key code 51 using {command down}
-            end tell
-        end tell
-        '''
-        success, msg = self.execute_applescript(script)
+        success, msg = self.press_key_code(51, modifiers=('command',))
         if success:
             self.command_executed.emit("Deleted line")
         else:
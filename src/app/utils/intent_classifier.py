@@ -0,0 +1,208 @@
+"""
+Intent Classifier
+Decides whether an utterance is a command or dictation. A logistic regression over
+hashed word and word-pair features, with extra features for the opening words, since
+that is where commands and sentences differ most ("make bold" vs "make sure you add...").
+
+It is trained from the command registry (every phrase, with sample slot values) as the
+command class and from a seed set of ordinary sentences plus the user's own dictation
+history as the dictation class. Training takes a few tens of milliseconds; scoring is a
+handful of hashes and additions. Trained on log loss, the output is a probability, so
+callers can route on confidence thresholds rather than a yes/no guess.
+
+Only labels the user confirmed are learned - a command that ran, dictation that stayed
+on screen, dictation undone because it was a command - never the classifier's own
+routing guesses.
+"""
+
+import json
+import math
+import os
+import random
+import re
+import zlib
+from array import array
+from collections import deque
+
+TOKEN = re.compile(r"[a-z0-9']+")
+
+# Ordinary sentences, many opening with words that also start commands
+SEED_DICTATION = (
+    "make sure you add the figures before friday",
+    "make it clear that the deadline is firm",
+    "add a note about pricing to the appendix",
+    "open the meeting with a short introduction",
+    "close the loop with the finance team",
+    "go ahead and send it to the whole group",
+    "find a time that works for everyone",
+    "search results were better than expected",
+    "new hires start on monday",
+    "change is hard but this is worth it",
+    "set up a call with the vendor next week",
+    "remove anything that is not relevant",
+    "increase in revenue was driven by renewals",
+    "clear communication matters more than speed",
+    "switch the order of the last two sections",
+    "scroll through the photos from the trip",
+    "help me understand what went wrong",
+    "bold ideas need careful testing",
+    "the quick brown fox jumps over the lazy dog",
+    "we should meet tomorrow to review the draft",
+    "thanks for getting back to me so quickly",
+    "i think the second option is better",
+    "please let me know if you have any questions",
+    "our team shipped the new release last night",
+    "this paragraph explains the main argument",
+    "the results are summarized in the table below",
+    "let's keep the introduction short",
+    "she said the report would be ready soon",
+    "it was a long day but we made progress",
+    "call me when you land",
+    "dear sam thank you for the invitation",
+    "the budget needs another review",
+    "delete the old files once the migration is done",
+    "highlights of the quarter include three new customers",
+    "align the team around one goal",
+    "center the discussion on user needs",
+    "justify the cost in the proposal",
+    "underline the risks in your summary",
+)
+
+# Filler used to turn registry patterns into example utterances
+SAMPLE_NUMBERS = ("2", "3", "5", "10")
+SAMPLE_TEXT = ("example.com", "cheap flights", "pricing", "the weather today")
+SAMPLE_APPS = ("safari", "slack", "visual studio code", "google chrome", "mail")
+
+
+class IntentClassifier:
+    """Hashed n-gram logistic regression: probability that an utterance is a command"""
+
+    EPOCHS = 15
+    LEARNING_RATE = 0.2
+    L2 = 1e-4
+    HISTORY_SIZE = 500  # Recent utterances of each kind kept for retraining
+    SAVE_EVERY = 20  # Write the history after this many new examples
+
+    def __init__(self, history_path=None, buckets=1 << 14):
+        """
+        Args:
+            history_path: JSON file for the user's labelled utterances, in plain text
+                          (None = keep them for this session only)
+            buckets: Size of the hashed feature space
+        """
+        self.history_path = history_path
+        self.buckets = buckets
+        self.weights = array('d', bytes(8 * buckets))
+        self.commands = deque(maxlen=self.HISTORY_SIZE)
+        self.dictation = deque(maxlen=self.HISTORY_SIZE)
+        self._unsaved = 0
+        self._load_history()
+
+    def _load_history(self):
+        if not self.history_path or not os.path.exists(self.history_path):
+            return
+        try:
+            with open(self.history_path, 'r') as f:
+                data = json.load(f)
+            self.commands.extend(data.get('commands', []))
+            self.dictation.extend(data.get('dictation', []))
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not load intent history: {e}")
+
+    def save(self):
+        """Write the labelled history to disk"""
+        if not self.history_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.history_path), exist_ok=True)
+            with open(self.history_path, 'w') as f:
+                json.dump({'commands': list(self.commands), 'dictation': list(self.dictation)}, f)
+            self._unsaved = 0
+        except OSError as e:
+            print(f"Warning: Could not save intent history: {e}")
+
+    def _features(self, text):
+        """Hashed feature indices for an utterance"""
+        words = TOKEN.findall(text.lower())
+        features = ['<bias>', f'<len:{min(len(words), 8)}>']
+        if words:
+            features.append('^' + words[0])
+            if len(words) > 1:
+                features.append('^' + words[0] + ' ' + words[1])
+        features.extend(words)
+        features.extend(f'{first} {second}' for first, second in zip(words, words[1:]))
+        buckets = self.buckets
+        return [zlib.crc32(feature.encode('utf-8')) % buckets for feature in features]
+
+    def probability(self, text):
+        """Probability that text is a command (0.0 - 1.0)"""
+        weights = self.weights
+        score = sum(weights[index] for index in self._features(text))
+        if score >= 0:
+            return 1.0 / (1.0 + math.exp(-score))
+        odds = math.exp(score)
+        return odds / (1.0 + odds)
+
+    def _step(self, features, label, weight):
+        """One SGD step on log loss (with L2 shrinkage on the touched weights)"""
+        weights = self.weights
+        score = sum(weights[index] for index in features)
+        predicted = 1.0 / (1.0 + math.exp(-max(-30.0, min(30.0, score))))
+        gradient = self.LEARNING_RATE * weight * (label - predicted)
+        for index in features:
+            weights[index] += gradient - self.LEARNING_RATE * self.L2 * weights[index]
+
+    @staticmethod
+    def command_examples(registry):
+        """Example command utterances generated from a CommandRegistry"""
+        examples = set()
+        for phrase, action, group, tail in registry.patterns:
+            for index in range(len(SAMPLE_NUMBERS)):
+                text = phrase.replace('{number}', SAMPLE_NUMBERS[index])
+                text = text.replace('{text}', SAMPLE_TEXT[index % len(SAMPLE_TEXT)])
+                if tail == 'args':
+                    text += ' ' + SAMPLE_APPS[index % len(SAMPLE_APPS)]
+                examples.add(text)
+            if tail == 'ignore':
+                examples.add(phrase.replace('{number}', '3') + ' page')
+        for keywords, action, group, with_text in registry.keywords:
+            examples.update(keywords)
+        for context in ('general', 'browser', 'google_docs'):
+            for suggestion in registry.suggestions(context):
+                examples.add(re.sub(r'\[[^\]]+\]', SAMPLE_APPS[0], suggestion))
+        return sorted(examples)
+
+    def train(self, registry):
+        """
+        Fit the model from the registry, the seed sentences and the user's history
+
+        Args:
+            registry: CommandRegistry providing the command phrases
+        """
+        commands = self.command_examples(registry) + list(self.commands)
+        dictation = list(SEED_DICTATION) + list(self.dictation)
+        # Weight examples so both classes count equally
+        data = [(self._features(text), 1.0, 0.5 / len(commands)) for text in commands]
+        data += [(self._features(text), 0.0, 0.5 / len(dictation)) for text in dictation]
+        scale = len(data)
+        self.weights = array('d', bytes(8 * self.buckets))
+        shuffler = random.Random(0)
+        for _ in range(self.EPOCHS):
+            shuffler.shuffle(data)
+            for features, label, weight in data:
+                self._step(features, label, weight * scale)
+
+    def record(self, text, is_command):
+        """
+        Learn from an utterance whose kind the user confirmed
+
+        The example is kept for the next full training and applied right away with one SGD step.
+        """
+        text = ' '.join(TOKEN.findall(text.lower()))
+        if not text:
+            return
+        (self.commands if is_command else self.dictation).append(text)
+        self._step(self._features(text), 1.0 if is_command else 0.0, 1.0)
+        self._unsaved += 1
+        if self._unsaved >= self.SAVE_EVERY:
+            self.save()
@@ -4,6 +4,10 @@ Simulates keyboard typing for voice dictation into applications
 """
 
 from pynput.keyboard import Controller, Key
+import os
+import platform
+import shutil
+import subprocess
 import time
 
 
@@ -14,34 +18,195 @@ class KeyboardTyper:
         self.keyboard = Controller()
         self.typing_delay = 0.01  # Small delay between characters for reliability
         self.word_delay = 0.02    # Slightly longer delay between words
+        self.paste_threshold = 40  # Text this long or longer is pasted in one go (0 = always type)
+        self.paste_restore_delay = 0.15  # Time the target app gets to read the clipboard
+        self.repeat_interval = 0.002  # Seconds between events of a repeated key burst
+        self.repeat_chunk = 25  # Presses per native flush; a cancel takes effect between flushes
+        self._clipboard_commands = self._find_clipboard_commands()
+        self.rate_profiles = None  # Optional TypingRateProfiles: per-app delays instead of the fixed ones
+        self.target_app = None  # Frontmost app, selects the rate profile
+        self.injector = None  # Native XTestInjector on Linux/X11 (see set_backend), else pynput
     
-    def type_text(self, text, delay=None):
+    def set_backend(self, backend='auto'):
+        """
+        Choose how key events are injected
+        
+        Args:
+            backend: 'xtest' (batched X11 events), 'pynput', or 'auto' (xtest when available)
+        """
+        if self.injector:
+            self.injector.close()
+            self.injector = None
+        if backend not in ('auto', 'xtest'):
+            return
+        from . import xtest_injector
+        if not xtest_injector.is_available():
+            if backend == 'xtest':
+                print("XTest injection needs an X11 display and python-xlib; using pynput")
+            return
+        try:
+            self.injector = xtest_injector.XTestInjector()
+            print("⌨️ Typing through XTest")
+        except RuntimeError as e:
+            print(f"Warning: {e}; using pynput")
+    
+    def close(self):
+        """Release the native injector (restores any borrowed keycodes)"""
+        self.set_backend('pynput')
+    
+    @staticmethod
+    def _key_name(key):
+        """Name of a pynput Key ('backspace') or the character itself"""
+        return getattr(key, 'name', key)
+    
+    def set_target_app(self, app_name):
+        """Remember which app keystrokes are going to (picks its rate profile)"""
+        self.target_app = app_name
+    
+    def type_text(self, text, delay=None, should_stop=None, on_progress=None):
         """
         Type text using keyboard simulation
         
+        Long text is pasted through the clipboard instead, which takes the same
+        fraction of a second at any length.
+        
         Args:
             text: The text to type
-            delay: Optional custom delay between characters (seconds)
+            delay: Optional custom delay between characters (seconds); overrides the app's rate profile
+            should_stop: Optional callable checked between characters; typing stops when it returns True
+            on_progress: Optional callable(typed, total) called after each word
+            
+        Returns:
+            Number of characters typed
         """
         if not text:
-            return
+            return 0
+        total = len(text)
+        
+        if self.paste_threshold and total >= self.paste_threshold:
+            if should_stop and should_stop():
+                return 0
+            if self.paste_text(text):
+                if on_progress:
+                    on_progress(total, total)
+                return total
         
-        char_delay = delay if delay is not None else self.typing_delay
+        app = self.target_app
+        adaptive = delay is None and self.rate_profiles is not None and bool(app)
+        if adaptive:
+            char_delay, word_delay = self.rate_profiles.delays_for(app, self.typing_delay, self.word_delay)
+        else:
+            char_delay = delay if delay is not None else self.typing_delay
+            word_delay = self.word_delay
+        typed = 0
         
         # Split into words to handle spacing better
         words = text.split(' ')
         
+        if self.injector:
+            typed = self._type_with_injector(words, char_delay, word_delay, should_stop, on_progress)
+            if adaptive and self.rate_profiles.should_verify(app):
+                self.rate_profiles.verify(app, text)
+            return typed
+        
         for i, word in enumerate(words):
             # Type each character in the word
             for char in word:
+                if should_stop and should_stop():
+                    return typed
                 self._type_character(char)
+                typed += 1
                 time.sleep(char_delay)
             
             # Add space between words (except after last word)
             if i < len(words) - 1:
                 self.keyboard.press(' ')
                 self.keyboard.release(' ')
-                time.sleep(self.word_delay)
+                typed += 1
+                time.sleep(word_delay)
+            if on_progress:
+                on_progress(typed, total)
+        
+        if adaptive and self.rate_profiles.should_verify(app):
+            self.rate_profiles.verify(app, text)
+        return typed
+    
+    def _type_with_injector(self, words, char_delay, word_delay, should_stop, on_progress):
+        """One XTest flush per word; the X server applies the delays"""
+        total = sum(len(word) for word in words) + len(words) - 1
+        typed = 0
+        for i, word in enumerate(words):
+            if should_stop and should_stop():
+                return typed
+            typed += self.injector.type_text(word, char_delay)
+            if i < len(words) - 1:
+                typed += self.injector.type_text(' ', word_delay)
+            # Wait for this word to land so progress and cancellation stay accurate
+            self.injector.wait()
+            if on_progress:
+                on_progress(typed, total)
+        return typed
+    
+    @staticmethod
+    def _find_clipboard_commands():
+        """(copy, paste) commands for the system clipboard, or None if there's no tool for it"""
+        if platform.system() == 'Darwin':
+            return ['pbcopy'], ['pbpaste']
+        if shutil.which('xclip'):
+            return ['xclip', '-selection', 'clipboard'], ['xclip', '-selection', 'clipboard', '-o']
+        if shutil.which('xsel'):
+            return ['xsel', '--clipboard', '--input'], ['xsel', '--clipboard', '--output']
+        if shutil.which('wl-copy') and shutil.which('wl-paste'):
+            return ['wl-copy'], ['wl-paste', '--no-newline']
+        return None
+    
+    def _run_clipboard(self, command, text=None):
+        # pbcopy/pbpaste only handle non-ASCII text (—, •) in a UTF-8 locale
+        env = dict(os.environ, LANG='en_US.UTF-8')
+        return subprocess.run(command, input=text, capture_output=True, text=True,
+                              encoding='utf-8', env=env, timeout=1.0, check=True)
+    
+    def _read_clipboard(self):
+        try:
+            return self._run_clipboard(self._clipboard_commands[1]).stdout
+        except (OSError, subprocess.SubprocessError):
+            return ''
+    
+    def _write_clipboard(self, text):
+        try:
+            self._run_clipboard(self._clipboard_commands[0], text)
+            return True
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"Warning: Could not write to clipboard: {e}")
+            return False
+    
+    def paste_text(self, text):
+        """
+        Insert text with a single paste chord, then put the previous clipboard back
+        
+        Only text clipboard contents can be restored; if the clipboard held
+        something else (an image, files) the dictated text is left on it.
+        
+        Args:
+            text: The text to insert
+            
+        Returns:
+            True if pasted, False if the clipboard isn't usable (type it instead)
+        """
+        if not self._clipboard_commands:
+            return False
+        previous = self._read_clipboard()
+        if not self._write_clipboard(text):
+            return False
+        
+        paste_modifier = Key.cmd if platform.system() == 'Darwin' else Key.ctrl
+        self.type_with_hotkey('v', paste_modifier)
+        
+        # The target app reads the clipboard asynchronously - don't swap it back too early
+        time.sleep(self.paste_restore_delay)
+        if previous:
+            self._write_clipboard(previous)
+        return True
     
     def _type_character(self, char):
         """
@@ -74,6 +239,9 @@ class KeyboardTyper:
         Args:
             key: Key from pynput.keyboard.Key enum
         """
+        if self.injector:
+            self.press_repeated(key, 1)
+            return
         try:
             self.keyboard.press(key)
             self.keyboard.release(key)
@@ -88,6 +256,9 @@ class KeyboardTyper:
             text: The text/key to type
             *modifiers: Modifier keys (Key.cmd, Key.ctrl, etc.)
         """
+        if self.injector:
+            self.press_repeated(text, 1, *modifiers)
+            return
         try:
             # Press all modifiers
             for mod in modifiers:
@@ -103,11 +274,63 @@ class KeyboardTyper:
         except Exception as e:
             print(f"Warning: Hotkey typing failed: {e}")
     
-    def backspace(self, count=1):
-        """Delete characters using backspace"""
-        for _ in range(count):
-            self.press_key(Key.backspace)
-            time.sleep(0.05)
+    def press_repeated(self, key, count, *modifiers, interval=None, should_stop=None):
+        """
+        Send the same key (or chord) count times in one burst
+        
+        Modifiers are held once for the whole burst (once per chunk with the native
+        injector) rather than per press.
+        
+        Args:
+            key: Key to repeat (pynput Key or character)
+            count: Number of presses
+            *modifiers: Modifier keys held during the burst
+            interval: Seconds between presses (default: repeat_interval)
+            should_stop: Optional callable checked between presses
+            
+        Returns:
+            Number of presses sent
+        """
+        interval = self.repeat_interval if interval is None else interval
+        if self.injector:
+            # A chunk of the burst per flush, waiting for each so should_stop can cut it short
+            names = [self._key_name(mod) for mod in modifiers]
+            sent = 0
+            while sent < count:
+                if should_stop and should_stop():
+                    break
+                chunk = self.injector.press_repeated(
+                    self._key_name(key), min(self.repeat_chunk, count - sent), names, interval)
+                self.injector.wait()
+                if not chunk:
+                    break
+                sent += chunk
+            return sent
+        sent = 0
+        try:
+            for mod in modifiers:
+                self.keyboard.press(mod)
+            for _ in range(count):
+                if should_stop and should_stop():
+                    break
+                self.keyboard.press(key)
+                self.keyboard.release(key)
+                sent += 1
+                if interval:
+                    time.sleep(interval)
+        except Exception as e:
+            print(f"Warning: Could not repeat key {key}: {e}")
+        finally:
+            for mod in reversed(modifiers):
+                try:
+                    self.keyboard.release(mod)
+                except Exception:
+                    pass
+        return sent
+    
+    def backspace(self, count=1, should_stop=None):
+        """Delete characters using backspace (should_stop can cut a long burst short)"""
+        return self.press_repeated(Key.backspace, count, should_stop=should_stop)
     
     def set_typing_speed(self, speed='normal'):
         """
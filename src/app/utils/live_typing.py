@@ -0,0 +1,89 @@
+"""
+Live Typing
+Types a phrase while it is still being spoken. Interim hypotheses are typed as soon
+as their words stabilize; when a later hypothesis (or the final transcript) revises
+what is already on screen, only the changed tail is fixed: keep the common prefix,
+backspace over the rest and type the new ending.
+"""
+
+import os
+from collections import deque
+
+
+def minimal_edit(typed, target):
+    """
+    Keystrokes that turn typed into target
+
+    Returns:
+        (backspaces, text to insert)
+    """
+    prefix = len(os.path.commonprefix([typed, target]))
+    return len(typed) - prefix, target[prefix:]
+
+
+class LiveDictation:
+    """Tracks what has been typed for the current phrase and the edits to correct it"""
+
+    def __init__(self, stable_hypotheses=2):
+        """
+        Args:
+            stable_hypotheses: A word is typed once this many consecutive hypotheses agree on it
+        """
+        self.typed = ''
+        self._recent = deque(maxlen=stable_hypotheses)
+
+    @property
+    def active(self):
+        """Whether a phrase is in progress (something was typed or hypotheses were seen)"""
+        return bool(self.typed or self._recent)
+
+    def _edit_to(self, target):
+        backspaces, insert = minimal_edit(self.typed, target)
+        self.typed = target
+        if not backspaces and not insert:
+            return None
+        return backspaces, insert
+
+    def update(self, hypothesis):
+        """
+        Take an interim hypothesis (already formatted for typing)
+
+        Returns:
+            (backspaces, text) to send, or None if nothing should change yet
+        """
+        self._recent.append(hypothesis.split())
+        if len(self._recent) < self._recent.maxlen:
+            return None
+
+        # Words every recent hypothesis agrees on
+        stable = []
+        for words in zip(*self._recent):
+            if any(word != words[0] for word in words):
+                break
+            stable.append(words[0])
+        target = ' '.join(stable)
+
+        # A shorter agreement just means the newest words are still settling - don't take text back
+        if self.typed.startswith(target):
+            return None
+        return self._edit_to(target)
+
+    def finish(self, final_text):
+        """
+        The final transcript arrived: correct what was typed to match it, and start a new phrase
+
+        Returns:
+            (backspaces, text) to send, or None if the screen already matches
+        """
+        edit = self._edit_to(final_text)
+        self.reset()
+        return edit
+
+    def abandon(self):
+        """The phrase turned out not to be dictation: erase what was typed for it"""
+        return self.finish('')
+
+    def reset(self):
+        """Forget the phrase without touching the screen"""
+        self.typed = ''
+        self._recent.clear()
@@ -0,0 +1,166 @@
+"""
+Partial Recognizer
+Interim transcripts while the user is still speaking. The main recognizer only
+returns text once a phrase has ended; this feeds the same microphone audio into a
+local Vosk model, which revises its hypothesis as more audio arrives. Live dictation
+types these hypotheses and corrects them when the final transcript comes in; in
+command mode they narrow the command suggestions while the command is spoken.
+
+Vosk is too slow to run inside the audio callback, so submit() only queues the chunk
+and a worker thread feeds the model. The queue is bounded: if the worker falls
+behind, chunks are dropped, which only costs interim accuracy (the final transcript
+comes from the main recognizer).
+"""
+
+import importlib.util
+import json
+import os
+import queue
+import threading
+
+
+class PartialRecognizer:
+    """Streaming partial hypotheses from a local Vosk model"""
+
+    MAX_PENDING = 32  # Audio chunks queued for the worker before new ones are dropped
+
+    def __init__(self, model_path='model'):
+        """
+        Args:
+            model_path: Vosk model directory (same default as speech_recognition's recognize_vosk)
+        """
+        self.model_path = model_path
+        self._model = None
+        self._recognizer = None
+        self._sample_rate = None
+        self._last_partial = ''
+        self._paused = False  # Set after Vosk's own endpoint until reset() (the final is pending)
+        self._lock = threading.Lock()
+        self._generation = 0  # Bumped by reset(); queued audio from an earlier utterance is skipped
+        self._queue = queue.Queue(maxsize=self.MAX_PENDING)
+        self._on_hypothesis = None
+        self._thread = None
+        self._stopping = threading.Event()
+        self.dropped = 0  # Chunks dropped because the worker was behind
+
+    def is_available(self):
+        """Whether Vosk is installed and the model directory exists"""
+        return importlib.util.find_spec('vosk') is not None and os.path.isdir(self.model_path)
+
+    def load(self):
+        """Load the model (slow - call off the GUI thread)"""
+        if self._model is not None:
+            return True
+        try:
+            import vosk
+            vosk.SetLogLevel(-1)
+            self._model = vosk.Model(self.model_path)
+            print(f"Partial recognizer loaded from {self.model_path}")
+            return True
+        except Exception as e:
+            print(f"Warning: Could not load partial recognizer: {e}")
+            return False
+
+    def is_loaded(self):
+        return self._model is not None
+
+    def reset(self, sample_rate=None):
+        """
+        Start a new utterance (called once its final transcript has been emitted)
+
+        Args:
+            sample_rate: Rate of the audio passed to accept(); keeps the previous one if None
+        """
+        with self._lock:
+            if sample_rate:
+                self._sample_rate = sample_rate
+            self._recognizer = None
+            self._last_partial = ''
+            self._paused = False
+            self._generation += 1
+
+    def start(self, on_hypothesis):
+        """
+        Recognize submitted audio on a worker thread
+
+        Args:
+            on_hypothesis: Called from the worker with each new hypothesis
+        """
+        if self._thread is not None:
+            return
+        self._on_hypothesis = on_hypothesis
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="partial-recognizer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the worker (queued audio is discarded)"""
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._thread.join(timeout=1.0)
+        self._thread = None
+
+    def submit(self, chunk, sample_rate):
+        """
+        Queue audio for the worker without blocking (safe to call from the audio callback)
+
+        Args:
+            chunk: Raw 16-bit mono audio bytes
+            sample_rate: Sample rate of chunk
+        """
+        if self._model is None or self._thread is None:
+            return
+        try:
+            self._queue.put_nowait((self._generation, chunk, sample_rate))
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                generation, chunk, sample_rate = self._queue.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            if generation != self._generation:
+                continue  # Audio of an utterance that has already been finalized
+            try:
+                hypothesis = self.accept(chunk, sample_rate)
+            except Exception as e:
+                print(f"Warning: Partial recognition failed: {e}")
+                continue
+            if hypothesis and generation == self._generation:
+                self._on_hypothesis(hypothesis)
+
+    def accept(self, chunk, sample_rate):
+        """
+        Feed 16-bit mono audio and wait for the result (the worker's step; see submit)
+
+        Args:
+            chunk: Raw audio bytes
+            sample_rate: Sample rate of chunk
+
+        Returns:
+            The new hypothesis when it changed, otherwise None
+        """
+        if self._model is None:
+            return None
+        with self._lock:
+            if self._paused:
+                return None
+            if self._recognizer is None or sample_rate != self._sample_rate:
+                import vosk
+                self._sample_rate = sample_rate
+                self._recognizer = vosk.KaldiRecognizer(self._model, sample_rate)
+
+            if self._recognizer.AcceptWaveform(chunk):
+                # Vosk thinks the phrase ended; hold its result until the real final arrives
+                text = json.loads(self._recognizer.Result()).get('text', '')
+                self._paused = True
+            else:
+                text = json.loads(self._recognizer.PartialResult()).get('partial', '')
+
+            if not text or text == self._last_partial:
+                return None
+            self._last_partial = text
+            return text
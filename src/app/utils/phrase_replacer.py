@@ -0,0 +1,36 @@
+"""
+Phrase Replacer
+Replaces spoken phrases (like "question mark") with their output in a single pass.
+All phrases are compiled into one regex alternation, longest first, so overlapping
+phrases such as "dash", "em dash" and "dash bullet" always resolve to the longest match.
+"""
+
+import re
+
+
+class PhraseReplacer:
+    """Single-pass, longest-match replacement driven by a phrase -> output table"""
+
+    def __init__(self, table):
+        """
+        Args:
+            table: Dict of spoken phrase -> replacement text (copied and compiled once)
+        """
+        self.table = dict(table)
+        self._lookup = {self._normalize(phrase): output for phrase, output in self.table.items()}
+        self._pattern = None
+        if self._lookup:
+            # Longest phrases first - Python's alternation takes the first branch that matches
+            phrases = sorted(self._lookup, key=len, reverse=True)
+            alternation = '|'.join(r'\s+'.join(re.escape(word) for word in phrase.split()) for phrase in phrases)
+            self._pattern = re.compile(r'\b(?:' + alternation + r')\b', re.IGNORECASE)
+
+    @staticmethod
+    def _normalize(phrase):
+        return ' '.join(phrase.lower().split())
+
+    def replace(self, text):
+        """Replace every spoken phrase in text in one scan"""
+        if self._pattern is None or not text:
+            return text
+        return self._pattern.sub(lambda match: self._lookup[self._normalize(match.group(0))], text)
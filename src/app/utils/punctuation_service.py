@@ -0,0 +1,429 @@
+"""
+Punctuation Service
+Runs auto-punctuation in a separate worker process so transformer inference never
+holds the GUI process's GIL. Requests go over a queue; results come back in
+submission order, and a request that takes too long falls back to the raw text.
+The worker can load an int8-quantized model from memory-mapped weights, and is shut
+down after a period without dictation so its memory goes back to the system.
+"""
+
+import itertools
+import multiprocessing
+import os
+import queue
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+
+def _punctuate_batch(model, batch):
+    """
+    Punctuate several consecutive utterances with a single model call
+
+    The first request's context words are prepended so the model sees the end of
+    the previous sentence, but labels are only emitted for the new words.
+
+    Args:
+        batch: List of (request_id, text, context_words); each request's context
+               is assumed to end with the previous request's words
+
+    Returns:
+        List of (request_id, punctuated_text)
+    """
+    context = model.preprocess(' '.join(batch[0][2])) if batch[0][2] else []
+    segments = [model.preprocess(text) for _, text, _ in batch]
+    words = context + [word for segment in segments for word in segment]
+    if not words:
+        return [(request_id, text) for request_id, text, _ in batch]
+
+    prediction = model.predict(words)
+    results = []
+    start = len(context)
+    for (request_id, text, _), segment in zip(batch, segments):
+        end = start + len(segment)
+        results.append((request_id, model.prediction_to_text(prediction[start:end]) if segment else text))
+        start = end
+    return results
+
+
+MODEL_NAME = "oliverguhr/fullstop-punctuation-multilang-large"
+MODEL_VARIANTS = ('standard', 'quantized')
+WARMUP_TEXT = "thanks for the update i will review it tomorrow and send notes"
+
+
+def _resident_mb():
+    """Resident memory of this process in MB (peak on platforms without /proc)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS, kilobytes on Linux
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _quantized_cache_path(cache_dir, torch_version, transformers_version, model_revision):
+    """Cache file for the int8 model; a new torch, transformers or model revision gets a new file"""
+    key = f"{MODEL_NAME}-{model_revision or 'unknown'}-torch{torch_version}-transformers{transformers_version}"
+    return os.path.join(cache_dir, 'punctuation_int8-' + re.sub(r'[^A-Za-z0-9.+-]+', '_', key) + '.pt')
+
+
+def _load_quantized_model(cache_dir):
+    """
+    PunctuationModel backed by an int8 copy of the network
+
+    The first load quantizes the fp32 model's Linear layers and saves the result;
+    later loads memory-map that file, so the large embedding matrix is paged in on
+    demand instead of being read into memory up front. The file is pickled with the
+    running torch/transformers, so it is keyed by their versions and the model
+    revision, and quantized again if it can't be loaded.
+    """
+    import torch
+    import transformers
+    from transformers import AutoConfig, AutoTokenizer, pipeline
+    from deepmultilingualpunctuation import PunctuationModel
+
+    torch.set_num_threads(max(1, min(4, os.cpu_count() or 1)))
+    revision = getattr(AutoConfig.from_pretrained(MODEL_NAME), '_commit_hash', None)
+    path = _quantized_cache_path(cache_dir, torch.__version__, transformers.__version__, revision)
+    network = None
+    if os.path.exists(path):
+        try:
+            network = torch.load(path, mmap=True, weights_only=False)
+            tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+        except Exception as e:
+            print(f"Cached quantized punctuation model is unusable ({e}) - quantizing again")
+            network = None
+    if network is None:
+        print("Quantizing punctuation model (first run only)...")
+        original = PunctuationModel()
+        network = torch.quantization.quantize_dynamic(
+            original.pipe.model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+        tokenizer = original.pipe.tokenizer
+        os.makedirs(cache_dir, exist_ok=True)
+        torch.save(network, path + '.tmp')
+        os.replace(path + '.tmp', path)
+        del original
+        # Copies made by other torch/transformers versions will never be loaded again
+        for name in os.listdir(cache_dir):
+            stale = os.path.join(cache_dir, name)
+            if name.startswith('punctuation_int8') and name.endswith('.pt') and stale != path:
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+
+    # Reuse PunctuationModel's pre/post-processing around the quantized network
+    model = PunctuationModel.__new__(PunctuationModel)
+    model.pipe = pipeline("ner", model=network, tokenizer=tokenizer, aggregation_strategy="none", device=-1)
+    return model
+
+
+def _load_model(variant, cache_dir):
+    if variant == 'quantized':
+        return _load_quantized_model(cache_dir)
+    from deepmultilingualpunctuation import PunctuationModel
+    return PunctuationModel()
+
+
+def _continues(previous, request):
+    """True if request's context ends with the previous request's words"""
+    previous_words = previous[1].split()
+    context = request[2] or []
+    return bool(previous_words) and context[-len(previous_words):] == previous_words
+
+
+def _punctuation_worker(request_queue, response_queue, variant='standard', cache_dir=None,
+                        batch_window=0.0, max_batch_words=200):
+    """Worker process entry point: load the model, then serve requests until told to stop"""
+    try:
+        # Heavy import (torch/transformers) happens only in the worker
+        load_start = time.perf_counter()
+        model = _load_model(variant, cache_dir or os.path.expanduser('~/.voice_assistant'))
+        load_seconds = time.perf_counter() - load_start
+
+        # The first inference pays for lazy initialization; do it before reporting ready
+        inference_start = time.perf_counter()
+        _punctuate_batch(model, [(0, WARMUP_TEXT, [])])
+        first_inference = time.perf_counter() - inference_start
+    except Exception as e:
+        response_queue.put(('failed', None, str(e)))
+        return
+    response_queue.put(('ready', None, {
+        'variant': variant,
+        'load_seconds': round(load_seconds, 2),
+        'first_inference_ms': round(first_inference * 1000),
+        'resident_mb': round(_resident_mb()),
+    }))
+
+    carried = None  # Request read while batching that didn't fit the batch
+    stopping = False
+    while not stopping:
+        request = carried if carried is not None else request_queue.get()
+        carried = None
+        if request is None:
+            break
+
+        # Batch utterances that queued up (or arrive within batch_window) and continue the same text
+        batch = [request]
+        batch_words = len(request[1].split())
+        while batch_words < max_batch_words:
+            try:
+                if batch_window > 0:
+                    following = request_queue.get(timeout=batch_window)
+                else:
+                    following = request_queue.get_nowait()
+            except queue.Empty:
+                break
+            if following is None:
+                stopping = True
+                break
+            if not _continues(batch[-1], following):
+                carried = following
+                break
+            batch.append(following)
+            batch_words += len(following[1].split())
+
+        try:
+            for request_id, text in _punctuate_batch(model, batch):
+                response_queue.put(('result', request_id, text))
+        except Exception as e:
+            for request_id, _, _ in batch:
+                response_queue.put(('error', request_id, str(e)))
+
+
+class PunctuationService(QObject):
+    """Client side of the punctuation worker process"""
+
+    ready = pyqtSignal()
+    failed = pyqtSignal(str)
+    result_ready = pyqtSignal(str, object)  # text (punctuated, or original on fallback), caller's tag
+    _flush_requested = pyqtSignal(bool)  # Reader thread -> GUI thread: release finished results (force)
+
+    def __init__(self, timeout=2.0, batch_window=0.0, variant='standard', idle_timeout=0, cache_dir=None):
+        """
+        Args:
+            timeout: Seconds to wait for a result before falling back to the raw text
+            batch_window: Extra seconds the worker waits for more utterances to batch with;
+                          0 only batches requests that queued up while it was busy
+            variant: 'standard' or 'quantized' (int8, memory-mapped weights)
+            idle_timeout: Seconds without requests before the worker is shut down (0 = never)
+            cache_dir: Where the quantized model is kept
+        """
+        super().__init__()
+        self.timeout = timeout
+        self.batch_window = batch_window
+        self.variant = variant if variant in MODEL_VARIANTS else 'standard'
+        self.idle_timeout = idle_timeout
+        self.cache_dir = cache_dir
+        self.stats = {}  # Load time, first-inference latency and resident memory of the last load
+        self._enabled = False  # Wanted by the user; the worker may still be unloaded while idle
+        self._last_used = time.monotonic()
+        self._context = multiprocessing.get_context('spawn')  # Never fork a Qt process
+        self._process = None
+        self._requests = None
+        self._responses = None
+        self._reader = None
+        self._running = False
+        self._ready = False
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        # request id -> {'text', 'tag', 'deadline', 'result'}, in submission order. Entries stay
+        # here until the GUI thread has emitted them, so has_pending() covers results in transit
+        self._pending = OrderedDict()
+        # Only the GUI thread flushes; the reader just records results and asks for a flush
+        self._flush_requested.connect(self._flush)
+
+    @property
+    def is_ready(self):
+        return self._ready and self._process is not None and self._process.is_alive()
+
+    @property
+    def is_running(self):
+        return self._running
+
+    def has_pending(self):
+        with self._lock:
+            return bool(self._pending)
+
+    def start(self):
+        """Spawn the worker process (loads the model in the background)"""
+        self._enabled = True
+        self._last_used = time.monotonic()
+        if self._running:
+            return
+        if self._process is not None:
+            # Left over from an idle unload
+            self._process.join(timeout=1.0)
+        print(f"Starting punctuation worker process ({self.variant} model)...")
+        self._requests = self._context.Queue()
+        self._responses = self._context.Queue()
+        self._process = self._context.Process(
+            target=_punctuation_worker,
+            args=(self._requests, self._responses, self.variant, self.cache_dir, self.batch_window),
+            name="punctuation-worker",
+            daemon=True
+        )
+        self._process.start()
+        self._running = True
+        self._reader = threading.Thread(
+            target=self._read_responses, args=(self._process, self._responses),
+            name="punctuation-reader", daemon=True
+        )
+        self._reader.start()
+
+    def ensure_started(self):
+        """Reload the worker in the background if it was unloaded while idle"""
+        self._last_used = time.monotonic()
+        if self._enabled and not self._running:
+            print("Reloading punctuation model after idle unload...")
+            self.start()
+
+    def set_variant(self, variant):
+        """Switch between the standard and quantized model, restarting the worker if it's up"""
+        if variant not in MODEL_VARIANTS or variant == self.variant:
+            return
+        self.variant = variant
+        if self._running:
+            self.stop()
+            self.start()
+
+    def submit(self, text, punctuate=True, tag=None, context=None):
+        """
+        Queue text for punctuation
+
+        Args:
+            text: Raw recognized text
+            punctuate: False to pass the text through untouched but keep its place
+                       in the ordered output (e.g. spoken commands)
+            tag: Any object; handed back with the result
+            context: Words that came right before this text, to help the model
+
+        Returns:
+            Request id; the result arrives via result_ready in submission order
+        """
+        request_id = next(self._ids)
+        send = punctuate and self.is_ready
+        if punctuate:
+            self._last_used = time.monotonic()
+        with self._lock:
+            self._pending[request_id] = {
+                'text': text,
+                'tag': tag,
+                'deadline': time.monotonic() + self.timeout,
+                'result': None if send else text,
+            }
+        if send:
+            self._requests.put((request_id, text, list(context or [])))
+        else:
+            self._flush()
+        return request_id
+
+    def _read_responses(self, process, responses):
+        """Reader thread: collect worker responses and have the GUI thread release them in order"""
+        while self._running and self._process is process:
+            try:
+                kind, request_id, payload = responses.get(timeout=self._next_wait())
+            except queue.Empty:
+                if self.has_pending():
+                    self._flush_requested.emit(False)  # Let timed-out requests fall back
+                if self._is_idle():
+                    self._unload()
+                continue
+            except (EOFError, OSError):
+                break
+
+            if kind == 'ready':
+                self._ready = True
+                self.stats = payload or {}
+                print(f"Punctuation worker ready ({self.variant}: "
+                      f"{self.stats.get('resident_mb', '?')} MB resident, "
+                      f"loaded in {self.stats.get('load_seconds', '?')}s, "
+                      f"first inference {self.stats.get('first_inference_ms', '?')} ms)")
+                self.ready.emit()
+            elif kind == 'failed':
+                print(f"Warning: Could not load punctuation model: {payload}")
+                self._running = False
+                self._enabled = False
+                self.failed.emit(payload)
+            else:
+                with self._lock:
+                    entry = self._pending.get(request_id)
+                    if entry is not None and entry['result'] is None:
+                        if kind == 'result':
+                            entry['result'] = payload
+                        else:
+                            print(f"Error applying auto-punctuation: {payload}")
+                            entry['result'] = entry['text']
+            self._flush_requested.emit(False)
+
+        # Worker gone - release anything still waiting unpunctuated
+        if self._process is process:
+            self._flush_requested.emit(True)
+
+    def _is_idle(self):
+        if not self.idle_timeout or not self._ready:
+            return False
+        with self._lock:
+            if self._pending:
+                return False
+        return time.monotonic() - self._last_used >= self.idle_timeout
+
+    def _unload(self):
+        """Shut the worker down to free its memory; ensure_started() brings it back"""
+        print(f"Unloading punctuation model after {self.idle_timeout / 60:g} idle minutes")
+        self._ready = False
+        self._running = False
+        try:
+            self._requests.put(None)
+        except Exception:
+            pass
+
+    def _next_wait(self):
+        """How long the reader may block before the oldest request times out"""
+        with self._lock:
+            if not self._pending:
+                return 0.25
+            oldest = next(iter(self._pending.values()))
+        return min(0.25, max(0.0, oldest['deadline'] - time.monotonic()))
+
+    def _flush(self, force=False):
+        """Emit every finished (or timed out) result at the head of the queue (GUI thread only)"""
+        while True:
+            with self._lock:
+                if not self._pending:
+                    return
+                entry = next(iter(self._pending.values()))
+                if entry['result'] is None:
+                    if not force and time.monotonic() < entry['deadline']:
+                        return
+                    print(f"Auto-punctuation timed out after {self.timeout}s - using raw text")
+                    entry['result'] = entry['text']
+                self._pending.popitem(last=False)
+            self.result_ready.emit(entry['result'], entry['tag'])
+
+    def stop(self):
+        """Shut the worker process down"""
+        self._enabled = False
+        if not self._running and self._process is None:
+            return
+        self._running = False
+        self._ready = False
+        try:
+            self._requests.put(None)
+            self._process.join(timeout=1.0)
+        except Exception:
+            pass
+        if self._process.is_alive():
+            self._process.terminate()
+        self._process = None
+        if self._reader:
+            self._reader.join(timeout=1.0)
+            self._reader = None
+        self._flush(force=True)
@@ -0,0 +1,214 @@
+"""
+Recognition Router
+Chooses a speech recognition backend for each utterance.
+Short commands go to a fast local engine, dictation goes to the accurate remote engine,
+and backends that keep failing are skipped until they cool down.
+"""
+
+import importlib.util
+import time
+
+import speech_recognition as sr
+
+
+class BackendHealth:
+    """Tracks recent failures and latency for a single recognition backend"""
+
+    def __init__(self, name, failure_limit=3, cooldown=30.0):
+        """
+        Args:
+            name: Backend name (e.g. 'google', 'sphinx')
+            failure_limit: Consecutive failures before the backend is marked unhealthy
+            cooldown: Seconds an unhealthy backend is skipped before being retried
+        """
+        self.name = name
+        self.failure_limit = failure_limit
+        self.cooldown = cooldown
+        self.consecutive_failures = 0
+        self.unhealthy_since = None
+        self.avg_latency = None  # Exponential moving average in seconds
+
+    def record_success(self, latency):
+        """Record a successful (or 'nothing heard') recognition call"""
+        self.consecutive_failures = 0
+        self.unhealthy_since = None
+        if self.avg_latency is None:
+            self.avg_latency = latency
+        else:
+            self.avg_latency = 0.8 * self.avg_latency + 0.2 * latency
+
+    def record_failure(self):
+        """Record a request error or crash from this backend"""
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= self.failure_limit and self.unhealthy_since is None:
+            self.unhealthy_since = time.monotonic()
+            print(f"⚠️ Recognition backend '{self.name}' marked unhealthy")
+
+    def is_healthy(self):
+        """Check whether the backend should currently receive traffic"""
+        if self.unhealthy_since is None:
+            return True
+        if time.monotonic() - self.unhealthy_since >= self.cooldown:
+            # Cooldown over - give it another chance
+            self.unhealthy_since = None
+            self.consecutive_failures = 0
+            return True
+        return False
+
+
+class RecognitionRouter:
+    """Routes each utterance to a recognition backend based on mode, length and health"""
+
+    # Backend name -> (Recognizer method, module required for it to work locally)
+    BACKENDS = {
+        'google': ('recognize_google', None),
+        'sphinx': ('recognize_sphinx', 'pocketsphinx'),
+        'vosk': ('recognize_vosk', 'vosk'),
+        'whisper': ('recognize_whisper', 'whisper'),
+    }
+
+    def __init__(self, command_backend='sphinx', dictation_backend='google',
+                 max_command_seconds=2.5, language='en-US'):
+        """
+        Args:
+            command_backend: Fast (ideally local) backend for short command utterances
+            dictation_backend: High-accuracy backend for dictation
+            max_command_seconds: Utterances longer than this use the dictation backend
+            language: Recognition language
+        """
+        self.command_backend = command_backend
+        self.dictation_backend = dictation_backend
+        self.max_command_seconds = max_command_seconds
+        self.language = language
+        self.health = {name: BackendHealth(name) for name in self.BACKENDS}
+        self.decision_counts = {}
+        self._available = {name: self._check_available(name) for name in self.BACKENDS}
+
+        if not self._available.get(command_backend):
+            print(f"Note: '{command_backend}' backend not installed - commands will use '{dictation_backend}'")
+
+    def _check_available(self, name):
+        """Check if the backend's local dependency is installed"""
+        _, module = self.BACKENDS[name]
+        if module is None:
+            return True
+        return importlib.util.find_spec(module) is not None
+
+    def is_usable(self, name):
+        """Check if a backend is installed and currently healthy"""
+        return name in self.BACKENDS and self._available.get(name, False) and self.health[name].is_healthy()
+
+    @staticmethod
+    def get_duration(audio):
+        """Length of an AudioData clip in seconds"""
+        bytes_per_second = audio.sample_rate * audio.sample_width
+        if not bytes_per_second:
+            return 0.0
+        return len(audio.frame_data) / bytes_per_second
+
+    def choose_backends(self, mode, duration):
+        """
+        Decide which backends to try, in order, for one utterance
+
+        Args:
+            mode: 'command' or 'dictation'
+            duration: Utterance length in seconds
+
+        Returns:
+            (list of backend names, reason string)
+        """
+        if mode == 'command' and duration <= self.max_command_seconds:
+            preferred, fallback = self.command_backend, self.dictation_backend
+            reason = "short command"
+        elif mode == 'command':
+            preferred, fallback = self.dictation_backend, self.command_backend
+            reason = f"long command ({duration:.1f}s > {self.max_command_seconds}s)"
+        else:
+            preferred, fallback = self.dictation_backend, self.command_backend
+            reason = "dictation"
+
+        order = [name for name in (preferred, fallback) if self.is_usable(name)]
+        if order and order[0] != preferred:
+            reason += f", '{preferred}' unavailable"
+        if not order:
+            # Nothing looks healthy - still try the accurate backend rather than give up
+            order = [self.dictation_backend]
+            reason += ", no healthy backend"
+        return order, reason
+
+    def recognize(self, recognizer, audio, mode='command'):
+        """
+        Recognize an utterance using the routed backend, falling back if it fails
+
+        Returns:
+            Recognized text (the top hypothesis)
+
+        Raises:
+            sr.UnknownValueError if no backend understood the audio
+            sr.RequestError if every backend failed
+        """
+        return self.recognize_alternatives(recognizer, audio, mode)[0][0]
+
+    def recognize_alternatives(self, recognizer, audio, mode='command'):
+        """
+        Like recognize(), but returns the backend's n-best list
+
+        Returns:
+            List of (transcript, confidence) tuples, best first. Confidence is
+            None when the backend doesn't report one.
+        """
+        duration = self.get_duration(audio)
+        order, reason = self.choose_backends(mode, duration)
+        print(f"🧭 Routing {mode} ({duration:.2f}s) → {order[0]} [{reason}]")
+
+        last_error = None
+        for name in order:
+            key = (mode, name)
+            self.decision_counts[key] = self.decision_counts.get(key, 0) + 1
+            method_name, _ = self.BACKENDS[name]
+            start = time.monotonic()
+            try:
+                alternatives = self._call_backend(recognizer, method_name, audio)
+                latency = time.monotonic() - start
+                self.health[name].record_success(latency)
+                print(f"🧭 {name} answered in {latency * 1000:.0f} ms")
+                return alternatives
+            except sr.UnknownValueError as e:
+                # Backend works but didn't understand - let the next one try
+                self.health[name].record_success(time.monotonic() - start)
+                last_error = e
+            except Exception as e:
+                self.health[name].record_failure()
+                print(f"Recognition backend '{name}' failed: {str(e)}")
+                last_error = e if isinstance(e, sr.RequestError) else sr.RequestError(str(e))
+
+        raise last_error
+
+    def _call_backend(self, recognizer, method_name, audio):
+        """Invoke a single Recognizer backend method and normalize its n-best output"""
+        method = getattr(recognizer, method_name)
+        if method_name == 'recognize_google':
+            # show_all returns the raw response with every alternative instead of just the top one
+            response = method(audio, language=self.language, show_all=True)
+            if not isinstance(response, dict) or not response.get('alternative'):
+                raise sr.UnknownValueError()
+            alternatives = [
+                (alt['transcript'], alt.get('confidence'))
+                for alt in response['alternative'] if alt.get('transcript')
+            ]
+            if not alternatives:
+                raise sr.UnknownValueError()
+            return alternatives
+        if method_name == 'recognize_sphinx':
+            return [(method(audio, language=self.language), None)]
+        return [(method(audio), None)]
+
+    def get_stats(self):
+        """Routing counts and backend latencies, for tuning"""
+        return {
+            'decisions': {f"{mode}:{name}": count for (mode, name), count in self.decision_counts.items()},
+            'latency_ms': {
+                name: round(health.avg_latency * 1000)
+                for name, health in self.health.items() if health.avg_latency is not None
+            },
+        }
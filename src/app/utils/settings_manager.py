@@ -1,11 +1,51 @@
 import json
 import os
+import threading
 from pathlib import Path
 
 class SettingsManager:
+    # Named latency/power trade-offs. Each profile sets every latency-relevant knob
+    # (audio capture, endpointing, window polling, typing) so they stay consistent.
+    PERFORMANCE_PROFILES = {
+        "low_latency": {
+            "voice_recognition": {
+                "sample_rate": 16000,  # What the recognizers use anyway - less to resample/upload
+                "chunk_size": 512,  # 32 ms buffers
+                "pause_threshold": 0.5,
+                "non_speaking_duration": 0.3,
+            },
+            "window_detection": {"poll_interval": 250},
+            "typing": {"typing_delay": 0.005, "word_delay": 0.01},
+        },
+        "balanced": {
+            "voice_recognition": {
+                "sample_rate": 44100,
+                "chunk_size": 2048,  # 46 ms buffers
+                "pause_threshold": 0.8,
+                "non_speaking_duration": 0.5,
+            },
+            "window_detection": {"poll_interval": 500},
+            "typing": {"typing_delay": 0.01, "word_delay": 0.02},
+        },
+        "power_saver": {
+            "voice_recognition": {
+                "sample_rate": 16000,
+                "chunk_size": 4096,  # 256 ms buffers - far fewer wakeups
+                "pause_threshold": 1.0,
+                "non_speaking_duration": 0.5,
+            },
+            "window_detection": {"poll_interval": 1500},
+            # Fewer key events per second; the typing worker keeps the UI free meanwhile
+            "typing": {"typing_delay": 0.02, "word_delay": 0.04},
+        },
+    }
+
     def __init__(self):
         self.settings_dir = os.path.expanduser("~/.voice_assistant")
         self.settings_file = os.path.join(self.settings_dir, "settings.json")
+        # Settings are also saved from the recognition thread (learned endpointing);
+        # hold this while changing self.settings or writing the file
+        self.lock = threading.RLock()
         self.default_settings = {
             "voice_recognition": {
                 "energy_threshold": 150,  # Lower = more sensitive (was 300)
@@ -16,6 +56,49 @@ class SettingsManager:
                 "phrase_threshold": 0.2,  # Quicker detection (was 0.3)
                 "non_speaking_duration": 0.5,  # Better end detection
                 "audio_threshold": 0.01,
+                "command_backend": "sphinx",  # Fast local engine for short commands
+                "dictation_backend": "google",  # High-accuracy engine for dictation
+                "max_command_seconds": 2.5,  # Longer 'commands' are routed like dictation
+                "sample_rate": 44100,
+                "chunk_size": 2048,
+                "streaming_model": "model",  # Vosk model directory for interim hypotheses
+                "streaming_suggestions": True,  # Narrow command suggestions while a command is spoken (needs vosk)
+            },
+            "performance": {
+                "profile": "balanced",  # low_latency, balanced or power_saver
+            },
+            "window_detection": {
+                "poll_interval": 500,  # ms between active window checks
+            },
+            "typing": {
+                "typing_delay": 0.01,  # Seconds between characters
+                "word_delay": 0.02,  # Seconds between words
+                "paste_threshold": 40,  # Paste text at least this long via the clipboard (0 = always type)
+                "adaptive_rate": True,  # Calibrate the fastest safe typing speed per app
+                "app_rates": {},  # Calibrated per-app rate profiles (written by TypingRateProfiles)
+                "backend": "auto",  # Key injection: auto (XTest on Linux/X11 if available), xtest or pynput
+                "key_repeat_interval": 0.002,  # Seconds between repeated keys (backspace bursts)
+                "live_dictation": False,  # Type while speaking and correct as the transcript firms up (needs vosk)
+            },
+            "commands": {
+                "fuzzy_matching": True,  # Recover misheard commands ("scroll dawn" -> "scroll down")
+                "fuzzy_execute_threshold": 0.85,  # Run the closest command at or above this confidence
+                "fuzzy_suggest_threshold": 0.65,  # Ask "did you mean" at or above this confidence
+                "intent_command_threshold": 0.8,  # Treat speech as a command at or above this probability
+                "intent_dictation_threshold": 0.3,  # Treat it as dictation at or below; in between, only exact commands
+                "intent_history": False,  # Keep confirmed utterances in intent_history.json to train on next session
+            },
+            "endpointing": {
+                "adaptive": True,  # Learn pause/phrase thresholds per mode from the user's speech
+            },
+            "voice_typing": {
+                "auto_punctuation": False,
+                "punctuation_timeout": 2.0,  # Seconds before falling back to unpunctuated text
+                "punctuation_model": "standard",  # "quantized" = int8 weights, far less resident memory
+                "punctuation_idle_minutes": 10,  # Unload the model after this long without dictation (0 = never)
+                "language_model": True,  # Learn names/jargon from accepted dictation
+                "language_model_buckets": 262144,  # Slots per n-gram order (~3 MB on disk)
+                "snippet_expansion": True,  # Apply ~/.voice_assistant/expansions.json while dictating
             },
             "theme": {
                 "dark_mode": None,  # None means follow system
@@ -56,12 +139,15 @@ class SettingsManager:
             return self.default_settings
 
     def save_settings(self, settings):
-        """Save settings to file"""
+        """Save settings to file (thread-safe; the file is replaced atomically)"""
         try:
-            os.makedirs(self.settings_dir, exist_ok=True)
-            with open(self.settings_file, 'w') as f:
-                json.dump(settings, f, indent=4)
-            self.settings = settings
+            with self.lock:
+                os.makedirs(self.settings_dir, exist_ok=True)
+                temp_file = self.settings_file + '.tmp'
+                with open(temp_file, 'w') as f:
+                    json.dump(settings, f, indent=4)
+                os.replace(temp_file, self.settings_file)
+                self.settings = settings
             return True
         except Exception as e:
             print(f"Error saving settings: {e}")
@@ -77,10 +163,33 @@ class SettingsManager:
 
     def update_setting(self, category, key, value):
         """Update a specific setting"""
-        if category not in self.settings:
-            self.settings[category] = {}
-        self.settings[category][key] = value
-        return self.save_settings(self.settings)
+        with self.lock:
+            if category not in self.settings:
+                self.settings[category] = {}
+            self.settings[category][key] = value
+            return self.save_settings(self.settings)
+
+    def get_profile_names(self):
+        """Names of the available performance profiles"""
+        return list(self.PERFORMANCE_PROFILES.keys())
+
+    def apply_profile(self, name):
+        """
+        Write every setting covered by a performance profile and remember the choice
+        
+        Returns:
+            The profile's settings (category -> values), or None if the name is unknown
+        """
+        profile = self.PERFORMANCE_PROFILES.get(name)
+        if profile is None:
+            print(f"Unknown performance profile: {name}")
+            return None
+        with self.lock:
+            for category, values in profile.items():
+                self.settings.setdefault(category, {}).update(values)
+            self.settings.setdefault("performance", {})["profile"] = name
+            self.save_settings(self.settings)
+        return profile
 
     def _merge_settings(self, defaults, saved):
         """Merge saved settings with defaults to ensure all settings exist"""
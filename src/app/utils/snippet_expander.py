@@ -0,0 +1,201 @@
+"""
+Snippet Expander
+User-defined text expansions applied while dictating ("acme ticket" -> "ACME-",
+"pie torch" -> "PyTorch"). All phrases are compiled into one Aho-Corasick automaton,
+so the text is scanned once however many expansions there are. The dictionary is a
+JSON file the user edits by hand; changes are picked up without restarting.
+
+File format (~/.voice_assistant/expansions.json):
+    {
+        "expansions": {
+            "pie torch": "PyTorch",
+            "acme ticket": {"text": "ACME-", "join_next": true}
+        }
+    }
+"join_next" glues the expansion to the following word ("acme ticket 42" -> "ACME-42").
+"""
+
+import json
+import os
+import time
+from collections import deque
+
+
+class AhoCorasickMatcher:
+    """Finds every occurrence of many phrases in one left-to-right pass"""
+
+    def __init__(self, phrases):
+        """
+        Args:
+            phrases: Lowercase phrases; match results refer to them by index
+        """
+        self.phrases = list(phrases)
+        # Trie as parallel lists: goto[node] maps a character to the next node
+        self._goto = [{}]
+        self._fail = [0]
+        self._terminal = [-1]  # Phrase ending exactly at this node
+        self._next_output = [0]  # Nearest node on the failure chain that ends a phrase (0 = none)
+        self._lengths = [len(phrase) for phrase in self.phrases]
+        for index, phrase in enumerate(self.phrases):
+            self._insert(phrase, index)
+        self._link()
+
+    def _insert(self, phrase, index):
+        node = 0
+        for char in phrase:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._terminal.append(-1)
+                self._next_output.append(0)
+            node = next_node
+        self._terminal[node] = index
+
+    def _link(self):
+        """Breadth-first pass setting failure and output links"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                fail = self._goto[fallback].get(char, 0)
+                self._fail[child] = fail
+                self._next_output[child] = fail if self._terminal[fail] != -1 else self._next_output[fail]
+
+    def find(self, text):
+        """
+        Every phrase occurrence in text
+
+        Returns:
+            List of (start, end, phrase_index), ordered by end
+        """
+        matches = []
+        node = 0
+        goto, fail, terminal, next_output = self._goto, self._fail, self._terminal, self._next_output
+        lengths = self._lengths
+        for position, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            output = node if terminal[node] != -1 else next_output[node]
+            while output:
+                index = terminal[output]
+                matches.append((position + 1 - lengths[index], position + 1, index))
+                output = next_output[output]
+        return matches
+
+
+class SnippetExpander:
+    """Applies the user's expansion dictionary to dictated text, reloading it when the file changes"""
+
+    RELOAD_CHECK_INTERVAL = 1.0  # Seconds between file modification checks
+
+    def __init__(self, path):
+        """
+        Args:
+            path: Expansion dictionary (JSON); created empty if it doesn't exist
+        """
+        self.path = path
+        self.entries = {}  # phrase -> (replacement, join_next)
+        self._matcher = None
+        self._mtime = None
+        self._last_check = 0.0
+        if not os.path.exists(path):
+            self._create_empty()
+        self.reload()
+
+    def _create_empty(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'w') as f:
+                json.dump({"expansions": {}}, f, indent=4)
+        except OSError as e:
+            print(f"Warning: Could not create expansion file: {e}")
+
+    def reload(self):
+        """Load the dictionary and rebuild the automaton (keeps the old one if the file is invalid)"""
+        try:
+            self._mtime = os.path.getmtime(self.path)
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            entries = self._parse(data)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not load expansions from {self.path}: {e}")
+            return False
+
+        self.entries = entries
+        self._matcher = AhoCorasickMatcher(entries) if entries else None
+        print(f"Loaded {len(entries)} text expansions")
+        return True
+
+    @staticmethod
+    def _parse(data):
+        """phrase -> (replacement, join_next) from the file's JSON; ValueError if it isn't shaped right"""
+        if not isinstance(data, dict):
+            raise ValueError("expected an object at the top level")
+        expansions = data.get("expansions", {})
+        if not isinstance(expansions, dict):
+            raise ValueError('"expansions" must be an object of phrase -> text')
+        entries = {}
+        for phrase, value in expansions.items():
+            if isinstance(value, dict):
+                text = value.get("text", "")
+                join_next = value.get("join_next", False)
+            else:
+                text, join_next = value, False
+            if text is None or isinstance(text, (dict, list)):
+                raise ValueError(f'expansion for "{phrase}" must be text')
+            phrase = ' '.join(phrase.lower().split())
+            if phrase:
+                entries[phrase] = (str(text), bool(join_next))
+        return entries
+
+    def reload_if_changed(self):
+        """Reload when the file's modification time changes (checked at most once a second)"""
+        now = time.monotonic()
+        if now - self._last_check < self.RELOAD_CHECK_INTERVAL:
+            return
+        self._last_check = now
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime != self._mtime:
+            self.reload()
+
+    def expand(self, text):
+        """Replace every whole-word phrase in text, leftmost and longest first"""
+        self.reload_if_changed()
+        if not self._matcher or not text:
+            return text
+
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # Lowercasing changed the length (rare Unicode); match per character instead
+            lowered = ''.join(char if len(char.lower()) != 1 else char.lower() for char in text)
+
+        pieces = []
+        position = 0
+        phrases = self._matcher.phrases
+        for start, end, index in sorted(self._matcher.find(lowered), key=lambda match: (match[0], -match[1])):
+            if start < position:
+                continue  # Overlaps a phrase already replaced
+            if (start > 0 and text[start - 1].isalnum()) or (end < len(text) and text[end].isalnum()):
+                continue  # Not a whole word
+            replacement, join_next = self.entries[phrases[index]]
+            pieces.append(text[position:start])
+            pieces.append(replacement)
+            position = end
+            if join_next:
+                while position < len(text) and text[position] == ' ':
+                    position += 1
+        if not pieces:
+            return text
+        pieces.append(text[position:])
+        return ''.join(pieces)
@@ -0,0 +1,133 @@
+"""
+Suggestion Index
+Command suggestions as a prefix trie over every word start of every suggestion, so
+"ta" finds "close tab" and "new tab" without scanning the whole list. Results are
+ranked by how often and how recently each suggestion was used: every use adds one to
+a score that halves every HALF_LIFE_DAYS. Usage is saved to disk, so the ranking
+carries over between sessions.
+"""
+
+import json
+import os
+import time
+
+
+class _Node:
+    __slots__ = ('children', 'ids')
+
+    def __init__(self):
+        self.children = {}
+        self.ids = set()  # Suggestions with a word starting with this node's prefix
+
+
+class SuggestionIndex:
+    """Per-context prefix tries over suggestion texts with usage-based ranking"""
+
+    HALF_LIFE_DAYS = 7.0
+    SAVE_EVERY = 10  # Write usage after this many recorded uses
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path: JSON file for usage scores (None = don't persist)
+        """
+        self.path = path
+        self.usage = {}  # text -> [score, last used (epoch seconds)]
+        self._texts = []
+        self._tries = {}  # context -> (trie root, text id -> position in the context's list)
+        self._unsaved = 0
+        self._load()
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                self.usage = {text: list(entry) for text, entry in json.load(f).items()}
+        except (OSError, ValueError, TypeError) as e:
+            print(f"Warning: Could not load suggestion usage: {e}")
+
+    def save(self):
+        """Write usage scores to disk"""
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'w') as f:
+                json.dump(self.usage, f)
+            self._unsaved = 0
+        except OSError as e:
+            print(f"Warning: Could not save suggestion usage: {e}")
+
+    def build(self, contexts):
+        """
+        Index the suggestions of each context
+
+        Args:
+            contexts: context -> suggestion texts in display order (the fallback ranking)
+        """
+        texts = []
+        ids = {}
+        tries = {}
+        for context, suggestions in contexts.items():
+            root = _Node()
+            positions = {}
+            for text in suggestions:
+                if text not in ids:
+                    ids[text] = len(texts)
+                    texts.append(text)
+                positions.setdefault(ids[text], len(positions))
+                self._insert(root, text.lower(), ids[text])
+            tries[context] = (root, positions)
+        self._texts = texts
+        self._tries = tries
+
+    @staticmethod
+    def _insert(root, text, text_id):
+        """Add every word-start suffix of text ("close tab", "tab")"""
+        root.ids.add(text_id)
+        for start in range(len(text)):
+            if start and text[start - 1] != ' ':
+                continue
+            node = root
+            for char in text[start:]:
+                node = node.children.setdefault(char, _Node())
+                node.ids.add(text_id)
+
+    def _score(self, text, now):
+        entry = self.usage.get(text)
+        if not entry:
+            return 0.0
+        score, last_used = entry
+        return score * 0.5 ** ((now - last_used) / (self.HALF_LIFE_DAYS * 86400))
+
+    def suggest(self, context, prefix="", limit=None):
+        """
+        Suggestions containing a word that starts with prefix, best first
+
+        Args:
+            context: Context whose suggestions to search
+            prefix: What has been said so far ("" lists everything)
+            limit: Maximum number of results (None = all)
+        """
+        if context not in self._tries:
+            return []
+        node, positions = self._tries[context]
+        for char in ' '.join(prefix.lower().split()):
+            node = node.children.get(char)
+            if node is None:
+                return []
+        now = time.time()
+        texts = self._texts
+        ranked = sorted(node.ids, key=lambda text_id: (-self._score(texts[text_id], now), positions[text_id]))
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [texts[text_id] for text_id in ranked]
+
+    def record(self, text):
+        """Count a use of a suggestion"""
+        now = time.time()
+        self.usage[text] = [self._score(text, now) + 1.0, now]
+        self._unsaved += 1
+        if self._unsaved >= self.SAVE_EVERY:
+            self.save()
@@ -0,0 +1,359 @@
+"""
+Text Normalizer
+Inverse text normalization: turns spoken numbers into their written form
+("twenty five dollars" -> "$25", "march third twenty twenty four" -> "March 3, 2024",
+"backspace three" -> "backspace 3"). One regex, compiled at import, finds every number
+phrase in a single pass; a small table-driven parser turns the words into values.
+"""
+
+import re
+
+UNITS = {
+    'zero': 0, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6, 'seven': 7,
+    'eight': 8, 'nine': 9, 'ten': 10, 'eleven': 11, 'twelve': 12, 'thirteen': 13,
+    'fourteen': 14, 'fifteen': 15, 'sixteen': 16, 'seventeen': 17, 'eighteen': 18, 'nineteen': 19,
+}
+TENS = {
+    'twenty': 20, 'thirty': 30, 'forty': 40, 'fifty': 50,
+    'sixty': 60, 'seventy': 70, 'eighty': 80, 'ninety': 90,
+}
+SCALES = {'thousand': 10 ** 3, 'million': 10 ** 6, 'billion': 10 ** 9}
+
+# Ordinal word -> the cardinal word it stands for
+ORDINALS = {
+    'first': 'one', 'second': 'two', 'third': 'three', 'fourth': 'four', 'fifth': 'five',
+    'sixth': 'six', 'seventh': 'seven', 'eighth': 'eight', 'ninth': 'nine', 'tenth': 'ten',
+    'eleventh': 'eleven', 'twelfth': 'twelve', 'hundredth': 'hundred',
+}
+ORDINALS.update({word + 'th': word for word in UNITS if word.endswith('teen')})
+ORDINALS.update({word[:-1] + 'ieth': word for word in TENS})
+ORDINALS.update({word + 'th': word for word in SCALES})
+
+MONTHS = ['january', 'february', 'march', 'april', 'may', 'june', 'july',
+          'august', 'september', 'october', 'november', 'december']
+
+# Spoken currency -> (symbol, goes after the amount)
+CURRENCIES = {
+    'dollar': ('$', False), 'dollars': ('$', False), 'bucks': ('$', False),
+    'euro': ('€', False), 'euros': ('€', False), 'yen': ('¥', False),
+    'cent': ('¢', True), 'cents': ('¢', True),
+}
+MEASURES = {'percent': '%', 'per cent': '%', 'degree': '°', 'degrees': '°'}
+# Words after which "nineteen ninety" is a year rather than two numbers
+YEAR_CONTEXT = frozenset(['in', 'since', 'from', 'until', 'till', 'by', 'of', 'year', 'circa',
+                          'during', 'before', 'after', 'around'])
+
+
+def _alternation(words):
+    """Regex alternation, longest first so 'seventeen' wins over 'seven'"""
+    return '|'.join(re.escape(word) for word in sorted(words, key=len, reverse=True))
+
+
+_SEP = r'(?:\s+|-)'
+_CARDINAL_WORD = rf"(?:{_alternation(list(UNITS) + list(TENS) + ['hundred'] + list(SCALES))})\b"
+_ORDINAL_WORD = rf"(?:{_alternation(ORDINALS)})\b"
+_DIGIT_WORD = rf"(?:{_alternation([word for word, value in UNITS.items() if value < 10] + ['oh'])})\b"
+# "a hundred", "a thousand"
+_A_SCALE = r"(?:a\s+(?=(?:hundred|thousand|million|billion)\b))"
+_CARDINAL = rf"{_A_SCALE}?{_CARDINAL_WORD}(?:{_SEP}(?:and\s+)?{_CARDINAL_WORD})*"
+_ORDINAL = rf"(?:{_CARDINAL}{_SEP})?{_ORDINAL_WORD}"
+_DECIMAL = rf"{_CARDINAL}\s+point(?:\s+{_DIGIT_WORD})+"
+_DIGITS = r"\d[\d,]*(?:\.\d+)?\b"
+# Day of the month: "fifth", "twenty first", "thirty", "5th"
+_DAY_ONES = [word for word, value in UNITS.items() if 0 < value < 10]
+_DAY_ONES += [ordinal for ordinal, word in ORDINALS.items() if word in _DAY_ONES]
+_DAY = (rf"(?:twenty|thirty){_SEP}(?:{_alternation(_DAY_ONES)})\b"
+        rf"|(?:{_alternation(list(ORDINALS) + list(UNITS) + ['twenty', 'thirty'])})\b"
+        r"|\d{1,2}(?:st|nd|rd|th)?\b")
+# "may" is only a month when the recognizer capitalized it
+_MONTH = rf"(?:{_alternation([m for m in MONTHS if m != 'may'])}|(?-i:May))\b"
+_MERIDIEM = r"[ap]\.?\s?m\b\.?"
+
+# Every number phrase starts with one of these - checked before trying the branches below
+_TRIGGER_WORDS = frozenset(list(UNITS) + list(TENS) + ['hundred'] + list(SCALES) + list(ORDINALS) + MONTHS)
+_START = rf"(?=\d|a\s|(?:{_alternation(_TRIGGER_WORDS)})\b)"
+
+_DIGIT = re.compile(r"\d")
+_LAST_WORD = re.compile(r"([a-z]+)\W*$", re.IGNORECASE)
+_WORD = re.compile(r"[a-z]+")
+_WORD_SEPARATOR = re.compile(r"[\s-]+")
+
+# The number is matched once; what follows it decides whether it's a time, money or a measure
+_PATTERN = re.compile(
+    rf"\b{_START}(?:"
+    rf"(?P<month>{_MONTH})\s+(?P<day>{_DAY})(?:,?\s+(?P<year>{_DIGITS}|{_CARDINAL}))?"
+    rf"|(?P<number>{_DIGITS}|{_DECIMAL}|{_ORDINAL}|{_CARDINAL})"
+    rf"(?:\s+(?:"
+    rf"(?P<meridiem>{_MERIDIEM})|(?P<oclock>o'?clock\b)"
+    rf"|(?P<currency>{_alternation(CURRENCIES)})\b(?:\s+and\s+(?P<cents>{_DIGITS}|{_CARDINAL})\s+cents?\b)?"
+    rf"|(?P<measure>{_alternation(MEASURES)})\b"
+    rf"))?"
+    rf")",
+    re.IGNORECASE
+)
+
+
+def _parse_cardinal(words):
+    """
+    Group number words into values
+
+    Words that can't continue the current number start a new one, so
+    "nineteen ninety" gives two values and "five and six" keeps its "and".
+
+    Returns:
+        List of (value, words) - value is None for a literal word
+    """
+    segments = []
+    total = current = 0
+    last = None  # Kind of the previous word: zero, unit, teen, tens, hundred, scale
+    last_scale = None
+    taken = []  # Words of the value being built
+    since_scale = 0  # How many of them came after the last scale word
+
+    def flush():
+        nonlocal total, current, last, last_scale, taken, since_scale
+        if last is not None:
+            segments.append((total + current, taken))
+        total = current = 0
+        last = last_scale = None
+        taken = []
+        since_scale = 0
+
+    for word in words:
+        if word == 'and':
+            if last in ('hundred', 'scale'):
+                taken.append(word)  # "one hundred and five"
+                continue
+            flush()
+            segments.append((None, [word]))
+            continue
+
+        if word in UNITS or word == 'a':
+            value = UNITS.get(word, 1)
+            kind = 'zero' if value == 0 else 'unit' if value < 10 else 'teen'
+            fits = last in (None, 'hundred', 'scale') or (kind == 'unit' and last == 'tens')
+            if not fits or (kind == 'zero' and last is not None):
+                flush()
+            current += value
+        elif word in TENS:
+            kind, value = 'tens', TENS[word]
+            if last not in (None, 'hundred', 'scale'):
+                flush()
+            current += value
+        elif word == 'hundred':
+            kind = 'hundred'
+            if last in ('unit', 'teen', 'tens') and 0 < current < 100:
+                current *= 100
+            else:
+                flush()
+                current = 100
+        else:
+            kind, scale = 'scale', SCALES[word]
+            if last in (None, 'zero', 'scale'):
+                flush()
+                current = 1
+            elif last_scale is not None and scale >= last_scale:
+                # "one thousand two thousand" - close the first number, keep "two" for this one
+                segments.append((total, taken[:len(taken) - since_scale]))
+                taken = taken[len(taken) - since_scale:]
+                total = 0
+            total += current * scale
+            current = 0
+            last_scale = scale
+            since_scale = -1
+        last = kind
+        taken.append(word)
+        since_scale += 1
+    flush()
+    return segments
+
+
+_NUMBER_WORDS = frozenset(list(UNITS) + list(TENS) + ['hundred'] + list(SCALES))
+
+
+def parse_number(words):
+    """
+    Value of the number at the start of a word list, as digits or as spoken words
+
+    Only the words of the number itself are read ("twenty five words" -> (25, 2)),
+    so callers can convert a command's number slot and leave the rest as spoken.
+
+    Returns:
+        (value, words used), or None if words don't start with a number
+    """
+    if not words:
+        return None
+    if words[0].isdigit():
+        return int(words[0]), 1
+    run = []
+    for word in words:
+        if word not in _NUMBER_WORDS:
+            break
+        run.append(word)
+    if not run:
+        return None
+    value, taken = _parse_cardinal(run)[0]
+    return value, len(taken)
+
+
+def _words(span):
+    return [word for word in _WORD_SEPARATOR.split(span.lower()) if word]
+
+
+def _format_value(value):
+    """Digits, with thousands separators from five digits up (years stay '2024')"""
+    return f"{value:,}" if value >= 10000 else str(value)
+
+
+def _joined_year(segments):
+    """'nineteen ninety nine' / 'twenty twenty four' read as one year (1000-2099), else None"""
+    values = [value for value, _ in segments]
+    if len(values) == 2 and None not in values and 10 <= values[0] <= 20 and 10 <= values[1] <= 99:
+        return values[0] * 100 + values[1]
+    return None
+
+
+def _ordinal_suffix(value):
+    if 10 <= value % 100 <= 20:
+        return 'th'
+    return {1: 'st', 2: 'nd', 3: 'rd'}.get(value % 10, 'th')
+
+
+class TextNormalizer:
+    """Rewrites spoken numbers, money, percentages, times and dates in written form"""
+
+    def normalize(self, text, keep_small_numbers=False):
+        """
+        Normalize every number phrase in text in one scan
+
+        Args:
+            text: Recognized text
+            keep_small_numbers: Leave standalone numbers under ten as words ("one of
+                                the three options"), as in prose. Commands want digits.
+        """
+        if not text:
+            return text
+        # Most dictation has no numbers at all - skip the regex scan entirely
+        if not _DIGIT.search(text) and _TRIGGER_WORDS.isdisjoint(_WORD.findall(text.lower())):
+            return text
+        return _PATTERN.sub(lambda match: self._replace(match, keep_small_numbers), text)
+
+    def _replace(self, match, keep_small_numbers):
+        groups = match.groupdict()
+        try:
+            if groups['month']:
+                return self._date(groups)
+            number = groups['number']
+            if groups['meridiem'] or groups['oclock']:
+                return self._time(groups)
+            if groups['currency']:
+                return self._money(groups)
+            if groups['measure']:
+                return self._amount(number) + MEASURES[' '.join(_words(groups['measure']))]
+            if number[0].isdigit():
+                return number
+            if _words(number)[-1] in ORDINALS:
+                return self._ordinal(number, keep_small_numbers)
+            if ' point ' in number.lower():
+                return self._amount(number)
+            previous = _LAST_WORD.search(match.string, 0, match.start())
+            year_context = previous is not None and previous.group(1).lower() in YEAR_CONTEXT
+            return self._cardinal(number, keep_small_numbers, year_context)
+        except (KeyError, ValueError):
+            return match.group(0)
+
+    def _amount(self, span):
+        """A single number: digits, a decimal ("three point five") or words"""
+        if span[0].isdigit():
+            return span
+        words = _words(span)
+        if 'point' in words:
+            split = words.index('point')
+            digits = ''.join('0' if word == 'oh' else str(UNITS[word]) for word in words[split + 1:])
+            prefix = self._cardinal(' '.join(words[:split]), False)
+            head, _, whole = prefix.rpartition(' ')
+            return f"{head} {whole}.{digits}" if head else f"{whole}.{digits}"
+        return self._cardinal(span, False)
+
+    def _cardinal(self, span, keep_small_numbers, year_context=False):
+        segments = _parse_cardinal(_words(span))
+        # "in nineteen ninety" is a year; "fifty fifty" or "at eleven fifteen" are not
+        year = _joined_year(segments) if year_context else None
+        if year is not None:
+            return str(year)
+        back_to_back = any(a is not None and b is not None for (a, _), (b, _) in zip(segments, segments[1:]))
+        if keep_small_numbers and back_to_back:
+            # Runs like "three thirty" are ambiguous in prose - leave them as spoken
+            return span
+        parts = []
+        for value, words in segments:
+            if value is None or (keep_small_numbers and value < 10):
+                parts.append(' '.join(words))
+            else:
+                parts.append(_format_value(value))
+        return ' '.join(parts)
+
+    def _ordinal(self, span, keep_small_numbers):
+        words = _words(span)
+        if keep_small_numbers and len(words) == 1 and UNITS.get(ORDINALS[words[0]], 10) < 10:
+            return span
+        *head, last = _parse_cardinal(words[:-1] + [ORDINALS[words[-1]]])
+        value = last[0]
+        prefix = ' '.join(_format_value(v) if v is not None else ' '.join(w) for v, w in head)
+        ordinal = f"{_format_value(value)}{_ordinal_suffix(value)}"
+        return f"{prefix} {ordinal}" if prefix else ordinal
+
+    def _day(self, span):
+        if span[0].isdigit():
+            return str(int(re.match(r'\d+', span).group(0)))
+        words = _words(span)
+        if words[-1] in ORDINALS:
+            words[-1] = ORDINALS[words[-1]]
+        value = _parse_cardinal(words)
+        if len(value) != 1 or not 1 <= value[0][0] <= 31:
+            raise ValueError(span)
+        return str(value[0][0])
+
+    def _date(self, groups):
+        date = f"{groups['month'].capitalize()} {self._day(groups['day'])}"
+        year = groups['year']
+        if year:
+            if not year[0].isdigit():
+                segments = _parse_cardinal(_words(year))
+                value = _joined_year(segments)
+                if value is None:
+                    if len(segments) != 1:
+                        raise ValueError(year)
+                    value = segments[0][0]
+                if value < 1000:
+                    raise ValueError(year)
+                year = str(value)
+            date += f", {year}"
+        return date
+
+    def _time(self, groups):
+        clock = groups['number']
+        if clock[0].isdigit():
+            hour, minute = clock, None
+        else:
+            values = [value for value, _ in _parse_cardinal(_words(clock))]
+            if None in values or len(values) > 2:
+                raise ValueError(clock)
+            hour, minute = values[0], values[1] if len(values) == 2 else None
+            if not 1 <= hour <= 12 or (minute is not None and not 0 <= minute <= 59):
+                raise ValueError(clock)
+        written = f"{hour}:{minute:02d}" if minute is not None else str(hour)
+        meridiem = groups['meridiem']
+        if meridiem:
+            return f"{written} {meridiem[0].upper()}M"
+        return f"{written}:00" if minute is None else written
+
+    def _money(self, groups):
+        symbol, suffix = CURRENCIES[groups['currency'].lower()]
+        amount = self._amount(groups['number'])
+        head, _, amount = amount.rpartition(' ')
+        if groups['cents']:
+            cents = int(self._cardinal(groups['cents'], False).replace(',', ''))
+            amount = f"{amount}.{cents:02d}"
+        money = f"{amount}{symbol}" if suffix else f"{symbol}{amount}"
+        return f"{head} {money}" if head else money
@@ -0,0 +1,193 @@
+"""
+Typing Rate Profiles
+Per-application typing speed. Apps differ in how fast they accept synthetic key
+events: some drop keys at 5 ms per character, others take 1 ms bursts. Each app
+starts at the configured typing delay; after a typing job the focused text field is
+read back. Every clean read-back halves the delay until keys go missing; then the
+delay is doubled, and only long clean streaks probe a little faster again, never as
+fast as a rate that has dropped keys. Apps whose text can't be read back keep the
+configured delay, and are probed again after a day. Profiles are saved in the
+settings so every app keeps its fastest safe rate.
+"""
+
+import platform
+import subprocess
+import threading
+import time
+
+
+# Text of the focused UI element of the frontmost app (needs Accessibility permission)
+FOCUSED_TEXT_SCRIPT = '''
+tell application "System Events"
+    set frontApp to first application process whose frontmost is true
+    set focusedElement to value of attribute "AXFocusedUIElement" of frontApp
+    return value of attribute "AXValue" of focusedElement
+end tell
+'''
+
+
+def read_focused_text():
+    """
+    Current contents of the focused text field
+
+    Returns:
+        The text, or None if it can't be read (no permission, not a text field, not macOS)
+    """
+    if platform.system() != 'Darwin':
+        return None
+    try:
+        result = subprocess.run(['osascript', '-e', FOCUSED_TEXT_SCRIPT],
+                                capture_output=True, text=True, timeout=1)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.rstrip('\n')
+
+
+class TypingRateProfiles:
+    """Fastest safe character delay per application, calibrated from read-back checks"""
+
+    FASTEST_DELAY = 0.001  # Calibration never goes below this
+    SLOWEST_DELAY = 0.05  # Backoff never goes beyond the old "slow" speed
+    BACKOFF_FACTOR = 2.0
+    PROBE_FACTOR = 0.75  # Try this much faster after a clean streak
+    PROBE_AFTER = 10  # Clean checks at the current delay before probing faster
+    SETTLE_CHECKS = 3  # Check every job until this many clean checks, then every VERIFY_EVERY jobs
+    VERIFY_EVERY = 5
+    WORD_DELAY_RATIO = 2.0  # Pause after a space relative to the character delay
+    REPROBE_AFTER = 86400.0  # Seconds before an app that couldn't be read back is tried again
+
+    def __init__(self, settings_manager=None, reader=read_focused_text):
+        """
+        Args:
+            settings_manager: Where profiles are persisted (typing.app_rates); None keeps them in memory
+            reader: Callable returning the focused field's text, or None if unreadable
+        """
+        self.settings_manager = settings_manager
+        self.reader = reader
+        self._lock = threading.Lock()
+        self._jobs = {}  # app -> jobs typed this session, for sampling checks
+        self.profiles = {}
+        if settings_manager:
+            saved = settings_manager.get_setting('typing', 'app_rates') or {}
+            for app, profile in saved.items():
+                if profile.get('delay') is None:
+                    continue
+                self.profiles[app] = {
+                    'delay': float(profile['delay']),
+                    'unsafe': float(profile.get('unsafe', 0.0)),
+                    'clean': int(profile.get('clean', 0)),
+                    'verified': bool(profile.get('verified', False)),
+                    'verifiable': bool(profile.get('verifiable', True)),
+                    'unverifiable_since': float(profile.get('unverifiable_since', 0.0)),
+                }
+
+    def _profile(self, app, delay=None):
+        """app's profile, created at delay (the configured one) if it has none yet"""
+        profile = self.profiles.get(app)
+        if profile is None:
+            profile = {'delay': self.SLOWEST_DELAY if delay is None else delay, 'unsafe': 0.0,
+                       'clean': 0, 'verified': False, 'verifiable': True, 'unverifiable_since': 0.0}
+            self.profiles[app] = profile
+        elif not profile['verifiable'] and time.time() - profile['unverifiable_since'] > self.REPROBE_AFTER:
+            # Permissions or the app may have changed since - read it back again
+            profile['verifiable'] = True
+        return profile
+
+    def delays_for(self, app, default_delay, default_word_delay):
+        """
+        (character delay, word delay) to type into app
+
+        The configured delays are used until a read-back shows that text typed into app
+        arrives intact: without verification there's no way to tell a faster rate is safe.
+        """
+        with self._lock:
+            profile = self._profile(app, default_delay)
+            if not profile['verifiable'] or not profile['verified']:
+                return default_delay, default_word_delay
+            return profile['delay'], profile['delay'] * self.WORD_DELAY_RATIO
+
+    def should_verify(self, app):
+        """Whether the job just typed into app should be read back"""
+        with self._lock:
+            profile = self._profile(app)
+            if not profile['verifiable']:
+                return False
+            jobs = self._jobs.get(app, 0) + 1
+            self._jobs[app] = jobs
+            return profile['clean'] < self.SETTLE_CHECKS or jobs % self.VERIFY_EVERY == 0
+
+    def verify(self, app, text):
+        """
+        Read the focused field back and adjust app's rate
+
+        Args:
+            app: Application the text was typed into
+            text: The text that was typed
+
+        Returns:
+            True if all of text arrived, False if keys were dropped, None if unknown
+        """
+        value = self.reader()
+        if value is None:
+            ok = None
+        else:
+            ok = ' '.join(text.split()) in ' '.join(value.split())
+        self.record(app, ok)
+        return ok
+
+    def record(self, app, ok):
+        """
+        Update app's profile with a check result
+
+        Args:
+            app: Application name
+            ok: True (text arrived intact), False (keys dropped) or None (couldn't read back)
+        """
+        with self._lock:
+            profile = self._profile(app)
+            before = dict(profile)
+            if ok is None:
+                profile['verifiable'] = False
+                profile['unverifiable_since'] = time.time()
+                print(f"⌨️ Can't read text back from {app}; using the configured typing speed")
+            elif not ok:
+                profile['unsafe'] = max(profile['unsafe'], profile['delay'])
+                profile['delay'] = min(self.SLOWEST_DELAY, profile['delay'] * self.BACKOFF_FACTOR)
+                profile['clean'] = 0
+                profile['verified'] = True  # The slower delay is now the calibrated one
+                print(f"⌨️ Dropped keys in {app}; slowing to {profile['delay'] * 1000:.1f} ms per character")
+            else:
+                profile['clean'] += 1
+                profile['verified'] = True
+                if not profile['unsafe']:
+                    # No rate has dropped keys yet: halve the delay after every clean check
+                    faster = max(self.FASTEST_DELAY, profile['delay'] / self.BACKOFF_FACTOR)
+                    ready = True
+                else:
+                    faster = max(self.FASTEST_DELAY, profile['delay'] * self.PROBE_FACTOR)
+                    ready = profile['clean'] >= self.PROBE_AFTER
+                if ready and profile['unsafe'] < faster < profile['delay']:
+                    profile['delay'] = faster
+                    profile['clean'] = 0
+                    print(f"⌨️ Trying {faster * 1000:.1f} ms per character in {app}")
+            changed = any(profile[key] != before[key] for key in ('delay', 'verified', 'verifiable'))
+            snapshot = {name: dict(values) for name, values in self.profiles.items()}
+
+        # Only rate changes are written; clean-streak counts are saved along with them
+        if changed and self.settings_manager:
+            self.settings_manager.update_setting('typing', 'app_rates', snapshot)
+
+    def reset(self, app=None):
+        """Forget the calibration for one app, or for all of them"""
+        with self._lock:
+            if app is None:
+                self.profiles.clear()
+                self._jobs.clear()
+            else:
+                self.profiles.pop(app, None)
+                self._jobs.pop(app, None)
+            snapshot = {name: dict(values) for name, values in self.profiles.items()}
+        if self.settings_manager:
+            self.settings_manager.update_setting('typing', 'app_rates', snapshot)
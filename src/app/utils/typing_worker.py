@@ -0,0 +1,117 @@
+"""
+Typing Worker
+Types dictated text on a background thread so the GUI stays responsive while long
+text is injected. Jobs run strictly in the order they were submitted; cancelling
+stops the job being typed and drops everything still queued.
+"""
+
+import itertools
+import queue
+import threading
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+
+class TypingWorker(QObject):
+    """Ordered, cancellable typing queue in front of a KeyboardTyper"""
+
+    job_started = pyqtSignal(int, int)  # job id, characters to type
+    progress = pyqtSignal(int, int, int)  # job id, characters typed, total
+    job_finished = pyqtSignal(int, str)  # job id, text
+    job_cancelled = pyqtSignal(int, int)  # job id, characters typed before stopping
+    job_failed = pyqtSignal(int, str)  # job id, error
+    idle = pyqtSignal()  # Queue drained
+
+    def __init__(self, typer):
+        """
+        Args:
+            typer: KeyboardTyper that does the actual key presses
+        """
+        super().__init__()
+        self.typer = typer
+        self._jobs = queue.Queue()
+        self._thread = None
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._generation = 0  # Bumped by cancel(); jobs from older generations are dropped
+        self._outstanding = 0
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="typing-worker", daemon=True)
+        self._thread.start()
+
+    def submit(self, text, backspaces=0):
+        """
+        Queue text to be typed after everything already queued
+        
+        Args:
+            text: Text to type
+            backspaces: Characters to delete before typing (live dictation corrections)
+
+        Returns:
+            Job id used in the signals
+        """
+        job_id = next(self._ids)
+        with self._lock:
+            self._outstanding += 1
+            self._jobs.put((job_id, text, backspaces, self._generation))
+        return job_id
+
+    def cancel(self):
+        """Stop the current job and drop queued ones ("stop typing")"""
+        with self._lock:
+            if not self._outstanding:
+                return False
+            self._generation += 1
+        print("⏹️ Typing cancelled")
+        return True
+
+    def is_busy(self):
+        with self._lock:
+            return self._outstanding > 0
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            job_id, text, backspaces, generation = job
+            is_cancelled = lambda: self._generation != generation
+            typed = 0
+
+            if is_cancelled():
+                self.job_cancelled.emit(job_id, 0)
+            else:
+                self.job_started.emit(job_id, len(text))
+
+                def report(count, total):
+                    nonlocal typed
+                    typed = count
+                    self.progress.emit(job_id, count, total)
+
+                try:
+                    if backspaces:
+                        self.typer.backspace(backspaces, should_stop=is_cancelled)
+                    typed = self.typer.type_text(text, should_stop=is_cancelled, on_progress=report)
+                    if is_cancelled() and typed < len(text):
+                        self.job_cancelled.emit(job_id, typed)
+                    else:
+                        self.job_finished.emit(job_id, text)
+                except Exception as e:
+                    self.job_failed.emit(job_id, str(e))
+
+            with self._lock:
+                self._outstanding -= 1
+                drained = self._outstanding == 0
+            if drained:
+                self.idle.emit()
+
+    def stop(self):
+        """Cancel pending work and end the thread"""
+        self.cancel()
+        self._jobs.put(None)
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
@@ -1,12 +1,17 @@
 import speech_recognition as sr
-import pyttsx3
 from PyQt6.QtCore import QObject, pyqtSignal
-import pyaudio
-import numpy as np
+import threading
+import time
+
+from .partial_recognizer import PartialRecognizer
+from .recognition_router import RecognitionRouter
+from .adaptive_endpointing import AdaptiveEndpointer
 
 class VoiceRecognitionManager(QObject):
     text_received = pyqtSignal(str)
     partial_text_received = pyqtSignal(str)  # For real-time transcription preview
+    hypothesis_received = pyqtSignal(str)  # Interim transcript of the phrase being spoken ("" = phrase discarded)
+    alternatives_received = pyqtSignal(list)  # N-best transcripts, emitted just before text_received
     error_occurred = pyqtSignal(str)
     audio_level = pyqtSignal(float)
     state_changed = pyqtSignal(str)  # States: ready, listening, processing, speaking, error
@@ -17,12 +22,15 @@ class VoiceRecognitionManager(QObject):
         
         self.settings_manager = settings_manager
         self.recognizer = sr.Recognizer()
-        self.engine = pyttsx3.init()
+        # Text-to-speech and PortAudio are slow to load; created on first use (see properties below)
+        self._engine = None
+        self._audio = None
+        self._devices_listed = False
         self.is_listening = False
         self.microphone = None
         self.stop_listening_callback = None
-        self.audio = pyaudio.PyAudio()
         self.level_stream = None  # Separate stream for audio level monitoring
+        self.partial_recognizer = None  # Set by enable_streaming_partials()
         
         # Load settings from settings_manager or use defaults
         if self.settings_manager:
@@ -33,6 +41,11 @@ class VoiceRecognitionManager(QObject):
             dynamic_energy_ratio = self.settings_manager.get_setting('voice_recognition', 'dynamic_energy_ratio')
             phrase_threshold = self.settings_manager.get_setting('voice_recognition', 'phrase_threshold')
             non_speaking_duration = self.settings_manager.get_setting('voice_recognition', 'non_speaking_duration')
+            command_backend = self.settings_manager.get_setting('voice_recognition', 'command_backend')
+            dictation_backend = self.settings_manager.get_setting('voice_recognition', 'dictation_backend')
+            max_command_seconds = self.settings_manager.get_setting('voice_recognition', 'max_command_seconds')
+            sample_rate = self.settings_manager.get_setting('voice_recognition', 'sample_rate')
+            chunk_size = self.settings_manager.get_setting('voice_recognition', 'chunk_size')
         else:
             # Use optimal defaults from testing
             energy_threshold = 150
@@ -42,6 +55,11 @@ class VoiceRecognitionManager(QObject):
             dynamic_energy_ratio = 1.5
             phrase_threshold = 0.2
             non_speaking_duration = 0.5
+            command_backend = 'sphinx'
+            dictation_backend = 'google'
+            max_command_seconds = 2.5
+            sample_rate = 44100
+            chunk_size = 2048
         
         # Apply optimal settings from testing
         self.recognizer.energy_threshold = energy_threshold
@@ -52,10 +70,28 @@ class VoiceRecognitionManager(QObject):
         self.recognizer.phrase_threshold = phrase_threshold
         self.recognizer.non_speaking_duration = non_speaking_duration
         
+        # Endpointing learned from the user's own pauses, per mode
+        self.endpointer = None
+        adaptive = self.settings_manager.get_setting('endpointing', 'adaptive') if self.settings_manager else True
+        if adaptive:
+            self.endpointer = AdaptiveEndpointer(self.settings_manager, defaults={
+                'pause_threshold': pause_threshold,
+                'phrase_threshold': phrase_threshold,
+                'non_speaking_duration': non_speaking_duration,
+            })
+            self.endpointer.apply(self.recognizer, 'command')
+        
+        # Per-utterance backend routing (fast local engine for commands, accurate remote for dictation)
+        self.recognition_mode = 'command'
+        self.router = RecognitionRouter(
+            command_backend=command_backend,
+            dictation_backend=dictation_backend,
+            max_command_seconds=max_command_seconds
+        )
+        
         # Audio settings optimized for your microphone
-        self.RATE = 44100  # Higher quality sample rate for better recognition
-        self.CHUNK = 2048  # Larger chunks for smoother processing
-        self.FORMAT = pyaudio.paFloat32
+        self.RATE = sample_rate  # Set by the performance profile (44100 for balanced)
+        self.CHUNK = chunk_size  # Frames per buffer - smaller means lower latency, more wakeups
         self.CHANNELS = 1
         self.AUDIO_THRESHOLD = 0.1  # Adjusted for your audio levels
         self.GAIN = 0.2  # Reduced gain since we're getting strong input
@@ -67,8 +103,22 @@ class VoiceRecognitionManager(QObject):
         print(f"- Audio threshold: {self.AUDIO_THRESHOLD}")
         print(f"- Gain: {self.GAIN}")
         print(f"- Sample rate: {self.RATE}")
-        
-        self.list_audio_devices()
+
+    @property
+    def engine(self):
+        """pyttsx3 engine, initialized the first time something is spoken"""
+        if self._engine is None:
+            import pyttsx3
+            self._engine = pyttsx3.init()
+        return self._engine
+
+    @property
+    def audio(self):
+        """PyAudio instance, opened the first time audio is captured"""
+        if self._audio is None:
+            import pyaudio
+            self._audio = pyaudio.PyAudio()
+        return self._audio
 
     def list_audio_devices(self):
         print("\n=== Available Audio Input Devices ===")
@@ -85,6 +135,51 @@ class VoiceRecognitionManager(QObject):
                     print("  ^^^ DEFAULT INPUT DEVICE ^^^")
         print("=====================================\n")
 
+    def set_recognition_mode(self, mode):
+        """Tell the router whether upcoming utterances are commands or dictation"""
+        if mode not in ('command', 'dictation'):
+            raise ValueError(f"Unknown recognition mode: {mode}")
+        if mode != self.recognition_mode:
+            self.recognition_mode = mode
+            print(f"Recognition mode: {mode}")
+            if self.endpointer:
+                params = self.endpointer.apply(self.recognizer, mode)
+                print(f"Endpointing for {mode}: pause {params['pause_threshold']}s")
+
+    def enable_streaming_partials(self, enabled, model_path='model'):
+        """
+        Emit interim hypotheses (hypothesis_received) while speaking, in both modes
+        
+        Needs Vosk and a local model; the model loads on a background thread.
+        
+        Returns:
+            False if partial recognition isn't available
+        """
+        if self.partial_recognizer:
+            self.partial_recognizer.stop()
+            self.partial_recognizer = None
+        if not enabled:
+            return True
+        recognizer = PartialRecognizer(model_path)
+        if not recognizer.is_available():
+            print(f"Interim hypotheses need vosk and a model in '{model_path}'; using final text only")
+            return False
+        threading.Thread(target=recognizer.load, name="partial-model-load", daemon=True).start()
+        # Vosk runs on the recognizer's worker thread; the audio callback only queues chunks
+        recognizer.start(self.hypothesis_received.emit)
+        self.partial_recognizer = recognizer
+        return True
+
+    def _reset_partials(self):
+        if self.partial_recognizer:
+            self.partial_recognizer.reset(self.RATE)
+
+    def _discard_partials(self):
+        """The phrase produced no final text - take back anything typed from its hypotheses"""
+        if self.partial_recognizer:
+            self.partial_recognizer.reset(self.RATE)
+            self.hypothesis_received.emit("")
+
     def start_listening(self):
         if not self.is_listening:
             try:
@@ -93,8 +188,11 @@ class VoiceRecognitionManager(QObject):
                 self.state_changed.emit("listening")
                 
                 # Initialize microphone
+                if not self._devices_listed:
+                    self.list_audio_devices()
+                    self._devices_listed = True
                 print("Initializing microphone...")
-                self.microphone = sr.Microphone(sample_rate=self.RATE)
+                self.microphone = sr.Microphone(sample_rate=self.RATE, chunk_size=self.CHUNK)
                 
                 # Calibrate for ambient noise
                 with self.microphone as source:
@@ -148,6 +246,8 @@ class VoiceRecognitionManager(QObject):
         """Callback for listen_in_background - handles recognized audio"""
         if not self.is_listening:
             return
+        received_at = time.monotonic()
+        import numpy as np
             
         try:
             # Calculate audio level for UI display
@@ -164,22 +264,34 @@ class VoiceRecognitionManager(QObject):
             # Try to recognize speech
             print("Attempting speech recognition...")
             try:
-                text = recognizer.recognize_google(audio, language='en-US')
+                alternatives = self.router.recognize_alternatives(recognizer, audio, self.recognition_mode)
+                # The GUI thread rescores the n-best list against the commands it knows
+                text = alternatives[0][0]
                 print(f"Successfully recognized: {text}")
                 
                 # Clear partial text and emit final text
                 self.partial_text_received.emit("")
+                self.alternatives_received.emit([transcript for transcript, _ in alternatives])
                 self.text_received.emit(text)
+                self._reset_partials()
+                
+                # Learn endpointing from real speech only (not noise the recognizer rejected)
+                if self.endpointer:
+                    mode = self.recognition_mode
+                    self.endpointer.observe_utterance(mode, audio, recognizer.energy_threshold, received_at)
+                    self.endpointer.apply(recognizer, mode)
                 
                 # Return to listening state
                 self.state_changed.emit("listening")
             except sr.UnknownValueError:
                 print("Speech not recognized")
                 self.partial_text_received.emit("")
+                self._discard_partials()
                 self.state_changed.emit("listening")
             except sr.RequestError as e:
                 print(f"Recognition error: {str(e)}")
                 self.partial_text_received.emit("")
+                self._discard_partials()
                 self.state_changed.emit("error")
                 self.error_occurred.emit(f"Recognition error: {str(e)}")
                 
@@ -193,6 +305,8 @@ class VoiceRecognitionManager(QObject):
     
     def _level_monitoring_callback(self, in_data, frame_count, time_info, status):
         """Callback for audio level monitoring stream"""
+        import numpy as np
+        import pyaudio
         if not self.is_listening:
             return (None, pyaudio.paComplete)
         
@@ -203,6 +317,12 @@ class VoiceRecognitionManager(QObject):
             audio_level = float(np.max(np.abs(audio_data))) / 32768.0
             self.audio_level.emit(audio_level)
             
+            # Interim transcript for live dictation and command suggestions
+            # (recognized on the partial recognizer's thread)
+            partials = self.partial_recognizer
+            if partials:
+                partials.submit(in_data, self.RATE)
+            
             return (None, pyaudio.paContinue)
         except Exception as e:
             return (None, pyaudio.paContinue)
@@ -210,6 +330,7 @@ class VoiceRecognitionManager(QObject):
     def _start_level_monitoring(self):
         """Start a separate audio stream for level monitoring"""
         try:
+            import pyaudio
             default_device = self.audio.get_default_input_device_info()
             self.level_stream = self.audio.open(
                 format=pyaudio.paInt16,
@@ -234,6 +355,32 @@ class VoiceRecognitionManager(QObject):
                 print(f"Error stopping level monitoring: {str(e)}")
             self.level_stream = None
 
+    def apply_latency_settings(self, sample_rate, chunk_size, pause_threshold, non_speaking_duration):
+        """
+        Switch capture and endpointing settings live (used by performance profiles)
+        
+        If audio is being captured, the streams are restarted with the new settings.
+        """
+        was_listening = self.is_listening
+        if was_listening and (sample_rate != self.RATE or chunk_size != self.CHUNK):
+            self.stop_listening()
+        
+        self.RATE = sample_rate
+        self.CHUNK = chunk_size
+        self.recognizer.non_speaking_duration = min(non_speaking_duration, pause_threshold)
+        self.recognizer.pause_threshold = pause_threshold
+        if self.endpointer:
+            # Learned values still win once there is enough data; these are the new fallbacks
+            self.endpointer.defaults.update({
+                'pause_threshold': pause_threshold,
+                'non_speaking_duration': non_speaking_duration,
+            })
+            self.endpointer.apply(self.recognizer, self.recognition_mode)
+        print(f"Latency settings: {sample_rate} Hz, {chunk_size}-frame chunks, pause {self.recognizer.pause_threshold}s")
+        
+        if was_listening and not self.is_listening:
+            self.start_listening()
+
     def update_sensitivity(self, value):
         try:
             self.recognizer.energy_threshold = value
@@ -264,8 +411,13 @@ class VoiceRecognitionManager(QObject):
         for line in traceback.format_stack()[:-1]:
             print(line.strip())
         self.stop_listening()
-        if self.audio:
-            self.audio.terminate()
+        if self.partial_recognizer:
+            self.partial_recognizer.stop()
+        if self.endpointer:
+            self.endpointer.save()
+        if self._audio:
+            self._audio.terminate()
+            self._audio = None
 
     def __del__(self):
         print("⚠️ VoiceRecognitionManager.__del__ called (object being destroyed)")
@@ -1,8 +1,17 @@
-import re
-from deepmultilingualpunctuation import PunctuationModel
+import os
+from collections import deque
+
+from .dictation_language_model import DictationLanguageModel
+from .phrase_replacer import PhraseReplacer
+from .punctuation_service import PunctuationService
+from .snippet_expander import SnippetExpander
+from .text_normalizer import TextNormalizer
+
 
 class VoiceTypingMode:
     """Handles voice typing specific functionality"""
+    PUNCTUATION_CONTEXT_WORDS = 24  # Tail of earlier dictation shown to the punctuation model
+    
     def __init__(self, voice_manager, settings_manager=None):
         self.voice_manager = voice_manager
         self.settings_manager = settings_manager
@@ -12,9 +21,16 @@ class VoiceTypingMode:
         self.last_char = ""  # Track last character for capitalization
         self.sentence_start = True  # Start of a new sentence
         
-        # Initialize automatic punctuation model (lazy loading)
-        self._punctuation_model = None
+        # Automatic punctuation runs in a worker process, warmed up in the background
+        self.punctuation_service = PunctuationService(
+            timeout=self._typing_setting('punctuation_timeout') or 2.0,
+            variant=self._typing_setting('punctuation_model') or 'standard',
+            idle_timeout=60 * (self._typing_setting('punctuation_idle_minutes') or 0),
+            cache_dir=self.settings_manager.settings_dir if self.settings_manager else None
+        )
+        self.punctuation_service.failed.connect(self._on_punctuation_load_failed)
         self._auto_punctuation_enabled = False
+        self._punctuation_context = deque(maxlen=self.PUNCTUATION_CONTEXT_WORDS)
         
         # Load auto-punctuation setting
         if self.settings_manager:
@@ -24,25 +40,84 @@ class VoiceTypingMode:
                 )
             except (KeyError, AttributeError):
                 self._auto_punctuation_enabled = False
-    
-    @property
-    def punctuation_model(self):
-        """Lazy load the punctuation model when first needed"""
-        if self._punctuation_model is None and self._auto_punctuation_enabled:
-            print("Loading automatic punctuation model...")
+        
+        # User-editable text expansions (product names, ticket prefixes, ...)
+        self.snippet_expander = None
+        if self.settings_manager and self._typing_setting('snippet_expansion'):
+            self.snippet_expander = SnippetExpander(
+                os.path.join(self.settings_manager.settings_dir, 'expansions.json')
+            )
+        
+        # Personal n-gram model for rescoring recognition alternatives
+        self.language_model = None
+        if self.settings_manager and self.settings_manager.get_setting('voice_typing', 'language_model'):
             try:
-                self._punctuation_model = PunctuationModel()
-                print("Punctuation model loaded successfully")
+                self.language_model = DictationLanguageModel(
+                    os.path.join(self.settings_manager.settings_dir, 'dictation_lm.bin'),
+                    buckets=self.settings_manager.get_setting('voice_typing', 'language_model_buckets')
+                )
             except Exception as e:
-                print(f"Warning: Could not load punctuation model: {e}")
-                self._auto_punctuation_enabled = False
-        return self._punctuation_model
+                print(f"Warning: Could not open dictation language model: {e}")
+    
+    def _typing_setting(self, key):
+        return self.settings_manager.get_setting('voice_typing', key) if self.settings_manager else None
+    
+    def is_punctuation_ready(self):
+        """True when auto-punctuation is enabled and the worker has loaded the model"""
+        return self._auto_punctuation_enabled and self.punctuation_service.is_ready
+    
+    def preload_punctuation_model(self):
+        """Start the punctuation worker (it loads the model in the background) if auto-punctuation is on"""
+        if self._auto_punctuation_enabled:
+            self.punctuation_service.start()
+    
+    def needs_auto_punctuation(self, text):
+        """Whether text should go through the punctuation model before process_text"""
+        if not text:
+            return False
+        if not self.is_punctuation_ready():
+            if self._auto_punctuation_enabled:
+                # Unloaded while idle - bring it back; this utterance goes through unpunctuated
+                self.punctuation_service.ensure_started()
+            return False
+        # Spoken commands must reach process_text exactly as said
+        text_lower = text.lower().strip()
+        if text_lower == "undo that" or text_lower in self.list_commands:
+            return False
+        return self._handle_formatting_commands(text) == text
+    
+    def punctuation_context_for(self, text):
+        """
+        Words preceding text, for the punctuation model, then roll text into the window
+        
+        Called in submission order so consecutive utterances chain together.
+        """
+        context = list(self._punctuation_context)
+        self._punctuation_context.extend(text.split())
+        return context
+    
+    def reset_punctuation_context(self):
+        """Forget earlier dictation (e.g. after switching documents)"""
+        self._punctuation_context.clear()
     
     def set_auto_punctuation(self, enabled):
         """Enable or disable automatic punctuation"""
         self._auto_punctuation_enabled = enabled
         if self.settings_manager:
-            self.settings_manager.set_setting('voice_typing', 'auto_punctuation', enabled)
+            self.settings_manager.update_setting('voice_typing', 'auto_punctuation', enabled)
+        if enabled:
+            self.preload_punctuation_model()
+        else:
+            self.punctuation_service.stop()
+    
+    def set_punctuation_model(self, variant):
+        """Use the 'standard' or int8 'quantized' punctuation model"""
+        if self.settings_manager:
+            self.settings_manager.update_setting('voice_typing', 'punctuation_model', variant)
+        self.punctuation_service.set_variant(variant)
+    
+    def _on_punctuation_load_failed(self, error):
+        self._auto_punctuation_enabled = False
 
     def setup_punctuation_commands(self):
         """Set up voice commands for punctuation"""
@@ -91,6 +166,10 @@ class VoiceTypingMode:
             "number five": "5. ",
         }
         
+        # One precompiled longest-match pass over the table
+        self.punctuation_replacer = PhraseReplacer(self.punctuation_commands)
+        self.text_normalizer = TextNormalizer()
+        
         # Common list formatting
         self.list_commands = {
             "add bullets": "bullet",
@@ -98,8 +177,16 @@ class VoiceTypingMode:
             "numbered list": "number one",
         }
 
-    def process_text(self, text):
-        """Process recognized text for voice typing"""
+    def process_text(self, text, alternatives=None):
+        """
+        Process recognized text for voice typing
+        
+        Args:
+            text: The recognizer's chosen transcript
+            alternatives: Optional n-best transcripts (best first) to rescore
+                          with the personal language model
+        """
+        text = self.select_hypothesis(text, alternatives)
         self.last_text = text
 
         if text.lower() == "undo that":
@@ -119,28 +206,54 @@ class VoiceTypingMode:
             self._update_sentence_state(formatted_text)
             return formatted_text
         
-        # Apply automatic punctuation if enabled
-        if self._auto_punctuation_enabled and self.punctuation_model:
-            try:
-                text = self._apply_auto_punctuation(text)
-            except Exception as e:
-                print(f"Auto-punctuation error: {e}")
-                # Fall through to manual punctuation
-        
-        # Apply voice-commanded punctuation (replace spoken punctuation)
-        for command, punctuation in self.punctuation_commands.items():
-            # Match whole words only to avoid partial replacements
-            pattern = r'\b' + re.escape(command) + r'\b'
-            text = re.sub(pattern, punctuation, text, flags=re.IGNORECASE)
-        
-        # Auto-capitalize first letter if at sentence start
-        text = self._apply_auto_capitalization(text)
+        # Automatic punctuation (if any) was already applied by the punctuation service
+        text = self.format_text(text)
         
         # Update sentence state for next input
         self._update_sentence_state(text)
         
         return text
     
+    def format_text(self, text):
+        """
+        Turn dictated words into the text to type, without changing sentence state
+        
+        Also used to preview interim hypotheses during live dictation.
+        """
+        # Write spoken numbers, money, times and dates as digits ("twenty five dollars" -> "$25")
+        text = self.text_normalizer.normalize(text, keep_small_numbers=True)
+        
+        # Expand the user's snippets in one pass over the text
+        if self.snippet_expander:
+            text = self.snippet_expander.expand(text)
+        
+        # Apply voice-commanded punctuation (replace spoken punctuation, whole words only)
+        text = self.punctuation_replacer.replace(text)
+        
+        # Auto-capitalize first letter if at sentence start
+        return self._apply_auto_capitalization(text)
+    
+    def select_hypothesis(self, text, alternatives=None):
+        """Rescore recognition alternatives with the personal language model"""
+        if alternatives and self.language_model:
+            rescored = self.language_model.best_hypothesis(alternatives)
+            if rescored != text:
+                print(f"📚 Language model picked '{rescored}' over '{text}'")
+                return rescored
+        return text
+    
+    def accept_dictation(self, text):
+        """Learn from a transcript the user kept (it left the dictation journal uncorrected)"""
+        if self.language_model and text:
+            self.language_model.learn(text)
+    
+    def close(self):
+        """Stop the punctuation worker and release the language model"""
+        self.punctuation_service.stop()
+        if self.language_model:
+            self.language_model.close()
+            self.language_model = None
+    
     def _apply_auto_capitalization(self, text):
         """Auto-capitalize the first letter if at the start of a sentence"""
         if not text:
@@ -148,11 +261,14 @@ class VoiceTypingMode:
         
         # If we're at the start of a sentence, capitalize the first letter
         if self.sentence_start and text:
-            # Find the first letter and capitalize it
+            # Skip leading quotes and brackets; a sentence that opens with a number
+            # ("100 people", "$25") has nothing to capitalize
             for i, char in enumerate(text):
                 if char.isalpha():
                     text = text[:i] + char.upper() + text[i+1:]
                     break
+                if char.isalnum():
+                    break
         
         return text
     
@@ -174,19 +290,6 @@ class VoiceTypingMode:
                 self.sentence_start = False
             # Don't change state for other punctuation like commas
     
-    def _apply_auto_punctuation(self, text):
-        """Apply automatic punctuation using the AI model"""
-        if not text or not self.punctuation_model:
-            return text
-        
-        # The model adds punctuation to unpunctuated text
-        try:
-            result = self.punctuation_model.restore_punctuation(text)
-            return result
-        except Exception as e:
-            print(f"Error applying auto-punctuation: {e}")
-            return text
-
     def _handle_formatting_commands(self, text):
         """Handle basic text formatting commands"""
         commands = {
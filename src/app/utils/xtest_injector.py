@@ -0,0 +1,205 @@
+"""
+XTest Injector
+Native key injection for Linux/X11. pynput's Controller makes a round trip to the X
+server for every press and release; this queues fake key events through the XTEST
+extension and sends a whole word (or a whole key repeat burst) in one flush. The
+inter-key delay travels with each event, so the X server does the pacing.
+
+Characters that aren't on the current keyboard layout (é on a US layout, emoji) are
+typed by temporarily binding them to a spare keycode, the same trick xdotool uses.
+The original bindings are restored by close().
+"""
+
+import os
+import platform
+
+# pynput Key names -> X keysym names
+KEY_NAMES = {
+    'backspace': 'BackSpace', 'enter': 'Return', 'tab': 'Tab', 'space': 'space',
+    'esc': 'Escape', 'delete': 'Delete', 'home': 'Home', 'end': 'End',
+    'left': 'Left', 'right': 'Right', 'up': 'Up', 'down': 'Down',
+    'page_up': 'Prior', 'page_down': 'Next',
+    'shift': 'Shift_L', 'shift_l': 'Shift_L', 'shift_r': 'Shift_R',
+    'ctrl': 'Control_L', 'ctrl_l': 'Control_L', 'ctrl_r': 'Control_R',
+    'alt': 'Alt_L', 'alt_l': 'Alt_L', 'alt_r': 'Alt_R',
+    'cmd': 'Super_L', 'cmd_l': 'Super_L', 'cmd_r': 'Super_R',
+}
+
+SPARE_KEYCODES = 4  # Keycodes rebound round-robin for characters missing from the layout
+
+
+def is_available():
+    """Whether an X display is reachable and python-xlib is installed (Linux only)"""
+    if platform.system() != 'Linux' or not os.environ.get('DISPLAY'):
+        return False
+    try:
+        import Xlib.ext.xtest  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class XTestInjector:
+    """Batched key events through the XTEST extension"""
+
+    def __init__(self, display_name=None):
+        """
+        Args:
+            display_name: X display (default: $DISPLAY)
+
+        Raises:
+            RuntimeError: If the display can't be opened or lacks XTEST
+        """
+        from Xlib import X, XK, display, error
+        from Xlib.ext import xtest  # noqa: F401 - registers xtest_fake_input
+
+        self._X = X
+        self._XK = XK
+        try:
+            self._display = display.Display(display_name)
+        except (error.DisplayError, error.ConnectionClosedError) as e:
+            raise RuntimeError(f"Cannot open X display: {e}")
+        if not self._display.has_extension('XTEST'):
+            self._display.close()
+            raise RuntimeError("X server has no XTEST extension")
+
+        self._shift = self._display.keysym_to_keycode(XK.string_to_keysym('Shift_L'))
+        self._spare = self._find_spare_keycodes()
+        self._remapped = {}  # keysym -> spare keycode currently bound to it
+        self._next_spare = 0
+
+    def _find_spare_keycodes(self):
+        """Keycodes with no keysyms bound - free to borrow for missing characters"""
+        info = self._display.display.info
+        first = info.min_keycode
+        mapping = self._display.get_keyboard_mapping(first, info.max_keycode - first + 1)
+        spare = [first + offset for offset, syms in enumerate(mapping) if not any(syms)]
+        if not spare:
+            print("Warning: No spare keycodes; characters missing from the layout will be skipped")
+        return spare[-SPARE_KEYCODES:]
+
+    def _keysym_for(self, char):
+        if char == '\n':
+            return self._XK.string_to_keysym('Return')
+        if char == '\t':
+            return self._XK.string_to_keysym('Tab')
+        code = ord(char)
+        # Latin-1 keysyms equal their code point; everything else uses the Unicode keysym range
+        return code if 0x20 <= code <= 0xff else 0x01000000 + code
+
+    def _resolve(self, keysym):
+        """
+        Keycode and whether Shift is needed for keysym
+
+        Returns:
+            (keycode, shifted), or None if the keysym can't be typed
+        """
+        for keycode, index in self._display.keysym_to_keycodes(keysym):
+            if index in (0, 1):
+                return keycode, index == 1
+        if keysym in self._remapped:
+            return self._remapped[keysym], False
+        if not self._spare:
+            return None
+
+        keycode = self._spare[self._next_spare % len(self._spare)]
+        self._next_spare += 1
+        for bound, code in list(self._remapped.items()):
+            if code == keycode:
+                del self._remapped[bound]
+        # Events already queued must reach the server before their keycode is rebound
+        self._display.sync()
+        self._display.change_keyboard_mapping(keycode, [(keysym, keysym)])
+        self._display.sync()
+        self._remapped[keysym] = keycode
+        return keycode, False
+
+    def _queue(self, keycode, shifted, delay_ms):
+        fake = self._display.xtest_fake_input
+        X = self._X
+        if shifted:
+            fake(X.KeyPress, self._shift, delay_ms)
+        fake(X.KeyPress, keycode, 0 if shifted else delay_ms)
+        fake(X.KeyRelease, keycode)
+        if shifted:
+            fake(X.KeyRelease, self._shift)
+
+    def type_text(self, text, delay=0.0):
+        """
+        Type text in one flush
+
+        Args:
+            text: Characters to type
+            delay: Seconds between characters, applied by the X server
+
+        Returns:
+            Number of characters sent
+        """
+        delay_ms = int(round(delay * 1000))
+        sent = 0
+        for char in text:
+            resolved = self._resolve(self._keysym_for(char))
+            if resolved is None:
+                print(f"Warning: Could not type character '{char}'")
+                continue
+            self._queue(*resolved, delay_ms)
+            sent += 1
+        self._display.flush()
+        return sent
+
+    def press_repeated(self, key_name, count, modifiers=(), delay=0.0):
+        """
+        Press a named key count times with modifiers held, in one flush
+
+        Args:
+            key_name: pynput Key name ('backspace') or X keysym name ('BackSpace')
+            count: Number of presses
+            modifiers: Modifier key names held for the burst
+            delay: Seconds between presses, applied by the X server
+
+        Returns:
+            Number of presses sent
+        """
+        keycode = self._keycode_for_name(key_name)
+        mod_codes = [self._keycode_for_name(name) for name in modifiers]
+        if keycode is None or None in mod_codes:
+            return 0
+
+        fake = self._display.xtest_fake_input
+        X = self._X
+        delay_ms = int(round(delay * 1000))
+        for code in mod_codes:
+            fake(X.KeyPress, code)
+        for _ in range(count):
+            fake(X.KeyPress, keycode, delay_ms)
+            fake(X.KeyRelease, keycode)
+        for code in reversed(mod_codes):
+            fake(X.KeyRelease, code)
+        self._display.flush()
+        return count
+
+    def wait(self):
+        """Block until the X server has processed (and paced out) everything sent"""
+        self._display.sync()
+
+    def _keycode_for_name(self, name):
+        if len(name) == 1:
+            resolved = self._resolve(self._keysym_for(name))
+            return resolved[0] if resolved else None
+        keysym = self._XK.string_to_keysym(KEY_NAMES.get(name, name))
+        keycode = self._display.keysym_to_keycode(keysym) if keysym else 0
+        return keycode or None
+
+    def close(self):
+        """Unbind borrowed keycodes and disconnect"""
+        if self._display is None:
+            return
+        try:
+            for keycode in self._remapped.values():
+                self._display.change_keyboard_mapping(keycode, [(0, 0)])
+            self._display.sync()
+            self._display.close()
+        except Exception as e:
+            print(f"Warning: Could not close X display: {e}")
+        self._display = None
+        self._remapped.clear()
@@ -1,5 +1,65 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QListWidget
-from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QListView
+from PyQt6.QtCore import pyqtSignal, Qt, QAbstractListModel, QModelIndex
+
+
+class SuggestionListModel(QAbstractListModel):
+    """
+    Suggestion texts as a list model
+
+    set_suggestions only touches the rows that changed, so a new partial transcript
+    that keeps most of the list costs a few row signals instead of a full reset.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._suggestions = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._suggestions)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._suggestions):
+            return None
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return self._suggestions[index.row()]
+        return None
+
+    def suggestions(self):
+        return list(self._suggestions)
+
+    def set_suggestions(self, suggestions):
+        """Replace the list, updating only the middle stretch that differs"""
+        old = self._suggestions
+        new = list(suggestions)
+        if new == old:
+            return
+
+        # Rows shared at the start and end stay untouched
+        start = 0
+        while start < len(old) and start < len(new) and old[start] == new[start]:
+            start += 1
+        end = 0
+        while end < len(old) - start and end < len(new) - start and old[-1 - end] == new[-1 - end]:
+            end += 1
+        old_middle = len(old) - start - end
+        new_middle = len(new) - start - end
+
+        # Rewrite rows present in both, then remove or insert the difference
+        common = min(old_middle, new_middle)
+        if common:
+            old[start:start + common] = new[start:start + common]
+            self.dataChanged.emit(self.index(start), self.index(start + common - 1))
+        if old_middle > new_middle:
+            first = start + common
+            self.beginRemoveRows(QModelIndex(), first, first + old_middle - new_middle - 1)
+            del old[first:first + old_middle - new_middle]
+            self.endRemoveRows()
+        elif new_middle > old_middle:
+            first = start + common
+            self.beginInsertRows(QModelIndex(), first, first + new_middle - old_middle - 1)
+            old[first:first] = new[first:first + new_middle - old_middle]
+            self.endInsertRows()
+
 
 class CommandSuggestions(QWidget):
     command_selected = pyqtSignal(str)
@@ -10,22 +70,27 @@ class CommandSuggestions(QWidget):
 
     def init_ui(self):
         layout = QVBoxLayout(self)
-        
+
         # Title
         title = QLabel("Suggested Commands")
         layout.addWidget(title)
-        
-        # List widget for suggestions
-        self.suggestions_list = QListWidget()
-        self.suggestions_list.itemClicked.connect(self._handle_selection)
+
+        # List view over the suggestion model
+        self.model = SuggestionListModel(self)
+        self.suggestions_list = QListView()
+        self.suggestions_list.setModel(self.model)
+        self.suggestions_list.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
+        self.suggestions_list.setUniformItemSizes(True)  # Skips measuring every row on updates
+        self.suggestions_list.clicked.connect(self._handle_selection)
         layout.addWidget(self.suggestions_list)
 
     def update_suggestions(self, suggestions):
         """Update the list of command suggestions"""
-        self.suggestions_list.clear()
         if isinstance(suggestions, list):
-            self.suggestions_list.addItems(suggestions)
+            self.model.set_suggestions(suggestions)
+        else:
+            self.model.set_suggestions([])
 
-    def _handle_selection(self, item):
+    def _handle_selection(self, index):
         """Emit the selected command"""
-        self.command_selected.emit(item.text())
\ No newline at end of file
+        self.command_selected.emit(self.model.data(index))
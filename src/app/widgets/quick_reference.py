@@ -1,8 +1,15 @@
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QTextEdit
 
+from ..utils.command_registry import CommandRegistry
+
 class QuickReferenceCard(QWidget):
-    def __init__(self):
+    def __init__(self, registry=None):
+        """
+        Args:
+            registry: CommandRegistry to render (shared with the CommandHandler)
+        """
         super().__init__()
+        self.registry = registry or CommandRegistry()
         self.init_ui()
 
     def init_ui(self):
@@ -34,23 +41,9 @@ class QuickReferenceCard(QWidget):
         commands = "Common Commands:\n\n"
         
         if "typing" in context.lower():
-            commands += "Voice Typing Commands:\n"
-            commands += "- 'period' - Add a period\n"
-            commands += "- 'comma' - Add a comma\n"
-            commands += "- 'question mark' - Add a question mark\n"
-            commands += "- 'new line' - Start a new line\n"
-            commands += "- 'new paragraph' - Start a new paragraph\n"
-            commands += "- 'capitalize that' - Capitalize the last phrase\n"
-            commands += "- 'all caps' - Convert to uppercase\n"
-            commands += "- 'lowercase' - Convert to lowercase\n"
-            commands += "- 'undo that' - Undo last change\n"
+            commands += self._format_reference('typing', sections=False)
         else:
-            commands += "System Commands:\n"
-            commands += "- 'open [app name]' - Open an application\n"
-            commands += "- 'close [app name]' - Close an application\n"
-            commands += "- 'switch to [app name]' - Switch to an open application\n"
-            commands += "- 'minimize window' - Minimize the current window\n"
-            commands += "- 'maximize window' - Maximize the current window\n"
+            commands += self._format_reference('general', sections=False)
         
         return commands
 
@@ -68,38 +61,38 @@ class QuickReferenceCard(QWidget):
         
         self.reference_text.setText(commands)
     
+    def _format_reference(self, context, sections=True):
+        """
+        Registry reference for a context as text
+        
+        Args:
+            context: Registry context ('general', 'browser', 'google_docs', 'typing')
+            sections: Group entries under their section names
+        """
+        self.registry.reload_if_changed()
+        reference = self.registry.reference(context)
+        if not reference:
+            return ""
+        title, groups = reference
+        blocks = []
+        for name, entries in groups:
+            lines = [f"{name}:"] if sections else []
+            for labels, help_text in entries:
+                spoken = " / ".join(f"'{label}'" for label in labels)
+                lines.append(f"- {spoken} - {help_text}" if help_text else f"- {spoken}")
+            blocks.append("\n".join(lines) + "\n")
+        separator = "\n" if sections else ""
+        return f"{title}:\n" + ("\n" if sections else "") + separator.join(blocks)
+    
     def show_browser_commands(self):
         """Show browser-specific commands"""
-        commands = "🌐 Browser Commands:\n\n"
-        commands += "Tab Management:\n"
-        commands += "- 'close tab' - Close current tab\n"
-        commands += "- 'new tab' - Open a new tab\n"
-        commands += "- 'close all tabs' - Close all tabs\n\n"
-        commands += "Navigation:\n"
-        commands += "- 'go back' - Navigate back\n"
-        commands += "- 'go forward' - Navigate forward\n"
-        commands += "- 'refresh' - Reload the page\n"
-        commands += "- 'go to [url]' - Navigate to URL\n"
-        commands += "- 'search for [query]' - Search Google\n\n"
-        commands += "Page Control:\n"
-        commands += "- 'scroll up/down' - Scroll the page\n"
-        commands += "- 'scroll to top/bottom' - Jump to top/bottom\n"
-        commands += "- 'zoom in/out' - Adjust zoom level\n"
-        commands += "- 'find [text] on page' - Find text\n"
-        commands += "- 'bookmark this' - Bookmark current page\n"
+        commands = self._format_reference('browser')
         
         self.reference_text.setText(commands)
     
     def show_general_commands(self):
         """Show general system commands"""
-        commands = "System Commands:\n\n"
-        commands += "Application Control:\n"
-        commands += "- 'open [app name]' - Open an application\n"
-        commands += "- 'close [app name]' - Close an application\n"
-        commands += "- 'switch to [app name]' - Switch to an app\n\n"
-        commands += "Window Management:\n"
-        commands += "- 'minimize window' - Minimize current window\n"
-        commands += "- 'maximize window' - Maximize current window\n\n"
+        commands = self._format_reference('general') + "\n"
         commands += "Voice Typing:\n"
         commands += "- Use 'Start Typing' button\n"
         commands += "- Say punctuation: 'period', 'comma', etc.\n"
@@ -109,30 +102,7 @@ class QuickReferenceCard(QWidget):
     
     def show_google_docs_commands(self):
         """Show Google Docs-specific commands"""
-        commands = "📝 Google Docs Commands:\n\n"
-        commands += "Text Formatting:\n"
-        commands += "- 'make bold' / 'bold' - Toggle bold\n"
-        commands += "- 'make italic' / 'italic' - Toggle italic\n"
-        commands += "- 'underline this' - Toggle underline\n"
-        commands += "- 'strikethrough' - Toggle strikethrough\n\n"
-        commands += "Font Size & Spacing:\n"
-        commands += "- 'increase font size' - Make text bigger\n"
-        commands += "- 'decrease font size' - Make text smaller\n"
-        commands += "- 'single space' - Set single spacing\n"
-        commands += "- 'double space' - Set double spacing\n"
-        commands += "- '1.5 spacing' - Set 1.5 line spacing\n\n"
-        commands += "Lists & Alignment:\n"
-        commands += "- 'add bullets' - Create bullet list\n"
-        commands += "- 'add numbering' - Create numbered list\n"
-        commands += "- 'align left/center/right' - Align text\n"
-        commands += "- 'justify' - Justify text\n\n"
-        commands += "Headings:\n"
-        commands += "- 'heading one/two/three' - Apply heading\n"
-        commands += "- 'normal text' - Apply normal style\n\n"
-        commands += "Other:\n"
-        commands += "- 'change text color' - Open color picker\n"
-        commands += "- 'highlight this' - Open highlight picker\n"
-        commands += "- 'clear formatting' - Remove formatting\n"
+        commands = self._format_reference('google_docs')
         
         self.reference_text.setText(commands)
     
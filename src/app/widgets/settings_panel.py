@@ -7,9 +7,11 @@ import qtawesome as qta
 
 class SettingsDialog(QDialog):
     settings_updated = pyqtSignal(dict)  # Emitted when settings are saved
+    profile_changed = pyqtSignal(str)  # Emitted immediately when a performance profile is picked
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, settings_manager=None):
         super().__init__(parent)
+        self.settings_manager = settings_manager
         self.setWindowTitle("Settings")
         self.init_ui()
         
@@ -21,7 +23,9 @@ class SettingsDialog(QDialog):
         
         # Add tabs
         tabs.addTab(GeneralSettings(), "General")
-        tabs.addTab(VoiceSettings(), "Voice")
+        self.voice_settings = VoiceSettings(self.settings_manager)
+        self.voice_settings.profile_changed.connect(self.profile_changed.emit)
+        tabs.addTab(self.voice_settings, "Voice")
         tabs.addTab(ShortcutSettings(), "Shortcuts")
         tabs.addTab(AppearanceSettings(), "Appearance")
         
@@ -69,8 +73,11 @@ class GeneralSettings(QWidget):
         layout.addRow("Language:", self.language_select)
 
 class VoiceSettings(QWidget):
-    def __init__(self):
+    profile_changed = pyqtSignal(str)
+
+    def __init__(self, settings_manager=None):
         super().__init__()
+        self.settings_manager = settings_manager
         self.init_ui()
         
     def init_ui(self):
@@ -91,6 +98,26 @@ class VoiceSettings(QWidget):
         layout.addRow("Listening:", self.continuous_listening)
         layout.addRow("Feedback:", self.audio_feedback)
         layout.addRow("Punctuation:", self.auto_punctuation)
+        
+        # Performance profile (applied live - no restart needed)
+        self.performance_profile = QComboBox()
+        if self.settings_manager:
+            for name in self.settings_manager.get_profile_names():
+                self.performance_profile.addItem(name.replace('_', ' ').title(), name)
+            current = self.settings_manager.get_setting('performance', 'profile')
+            index = self.performance_profile.findData(current)
+            if index >= 0:
+                self.performance_profile.setCurrentIndex(index)
+        else:
+            self.performance_profile.setEnabled(False)
+        self.performance_profile.currentIndexChanged.connect(self._on_profile_selected)
+        layout.addRow("Performance:", self.performance_profile)
+    
+    def _on_profile_selected(self, index):
+        """Switch profiles as soon as one is picked"""
+        name = self.performance_profile.itemData(index)
+        if name:
+            self.profile_changed.emit(name)
 
 class ShortcutSettings(QWidget):
     def __init__(self):
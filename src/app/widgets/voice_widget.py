@@ -4,6 +4,7 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QLabel,
 from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QPainter, QColor
 import qtawesome as qta
+import os
 
 from ..utils.voice_recognition import VoiceRecognitionManager
 from ..utils.voice_typing import VoiceTypingMode
@@ -12,6 +13,11 @@ from ..utils.contextual_help import ContextualHelp
 from ..utils.active_window_detector import ActiveWindowDetector
 from ..utils.global_hotkey import GlobalHotkeyManager
 from ..utils.keyboard_typing import KeyboardTyper
+from ..utils.live_typing import LiveDictation
+from ..utils.dictation_journal import DictationJournal, parse_correction
+from ..utils.intent_classifier import IntentClassifier
+from ..utils.typing_rate import TypingRateProfiles
+from ..utils.typing_worker import TypingWorker
 from .command_suggestions import CommandSuggestions
 from .quick_actions import QuickActionsPanel
 from .quick_reference import QuickReferenceCard
@@ -56,6 +62,8 @@ class AudioLevelIndicator(QProgressBar):
         """)
 
 class VoiceWidget(QWidget):
+    STOP_TYPING_PHRASES = ("stop typing", "cancel typing")
+    
     def __init__(self, settings_manager=None):
         super().__init__()
         self.settings_manager = settings_manager
@@ -66,9 +74,57 @@ class VoiceWidget(QWidget):
         self.window_detector = ActiveWindowDetector()
         self.hotkey_manager = GlobalHotkeyManager()
         self.keyboard_typer = KeyboardTyper()  # For actual typing into applications
+        if self.settings_manager:
+            self.window_detector.set_poll_interval(
+                self.settings_manager.get_setting('window_detection', 'poll_interval'))
+            self.keyboard_typer.typing_delay = self.settings_manager.get_setting('typing', 'typing_delay')
+            self.keyboard_typer.word_delay = self.settings_manager.get_setting('typing', 'word_delay')
+            self.keyboard_typer.paste_threshold = self.settings_manager.get_setting('typing', 'paste_threshold')
+            self.keyboard_typer.repeat_interval = self.settings_manager.get_setting('typing', 'key_repeat_interval')
+            self.command_handler.google_docs_handler.key_repeat_delay = self.keyboard_typer.repeat_interval
+            self.keyboard_typer.set_backend(self.settings_manager.get_setting('typing', 'backend'))
+            self.command_handler.fuzzy_matching = self.settings_manager.get_setting('commands', 'fuzzy_matching')
+            self.command_handler.fuzzy_execute_threshold = self.settings_manager.get_setting('commands', 'fuzzy_execute_threshold')
+            self.command_handler.fuzzy_suggest_threshold = self.settings_manager.get_setting('commands', 'fuzzy_suggest_threshold')
+            if self.settings_manager.get_setting('typing', 'adaptive_rate'):
+                self.keyboard_typer.rate_profiles = TypingRateProfiles(self.settings_manager)
+        # Command vs dictation routing: a learned probability with an uncertain band in between
+        self.command_threshold = 0.8
+        self.dictation_threshold = 0.3
+        history_path = None
+        if self.settings_manager:
+            self.command_threshold = self.settings_manager.get_setting('commands', 'intent_command_threshold')
+            self.dictation_threshold = self.settings_manager.get_setting('commands', 'intent_dictation_threshold')
+            if self.settings_manager.get_setting('commands', 'intent_history'):
+                # Off by default: the history holds dictated sentences in plain text
+                history_path = os.path.join(self.settings_manager.settings_dir, 'intent_history.json')
+        self.intent_classifier = IntentClassifier(history_path)
+        self.intent_classifier.train(self.command_handler.registry)
+        self._intent_registry_version = self.command_handler.registry.version
+        # Key presses happen on a worker thread so the UI keeps animating while text goes in
+        self.typing_worker = TypingWorker(self.keyboard_typer)
+        self.typing_worker.start()
+        # Live dictation: type interim hypotheses in Google Docs and fix them up as they change
+        self.live_dictation = LiveDictation()
+        self.live_dictation_enabled = False
+        self._dictations_in_flight = 0  # Final transcripts (dictation or corrections) still on their way to the typer
+        # Spans typed at the cursor, for "undo that" / "replace X with Y"; the language model
+        # and the intent classifier learn a span only once it leaves the journal uncorrected
+        self.journal = DictationJournal(on_retire=self._keep_dictation, on_undo=self._dictation_undone)
+        if self.settings_manager:
+            # Interim hypotheses feed command suggestions and, if enabled, live dictation
+            live = self.settings_manager.get_setting('typing', 'live_dictation')
+            if live or self.settings_manager.get_setting('voice_recognition', 'streaming_suggestions'):
+                streaming = self.voice_manager.enable_streaming_partials(
+                    True, self.settings_manager.get_setting('voice_recognition', 'streaming_model'))
+                self.live_dictation_enabled = bool(live and streaming)
+        self._last_alternatives = None  # N-best list for the utterance being handled
         self.init_ui()
         self.setup_connections()
         
+        # Warm up the auto-punctuation model so the first dictated sentence doesn't freeze the UI
+        self.typing_mode.preload_punctuation_model()
+        
         # Start window detection and hotkey listening
         self.window_detector.start()
         self.hotkey_manager.start()
@@ -77,6 +133,12 @@ class VoiceWidget(QWidget):
         """Handle cleanup when widget is closed"""
         print("⚠️ closeEvent triggered! Cleaning up...")
         self.voice_manager.cleanup()
+        self.typing_worker.stop()
+        self.keyboard_typer.close()
+        self.journal.clear()  # Whatever is still on screen was kept
+        self.typing_mode.close()
+        self.intent_classifier.save()
+        self.command_handler.suggestion_index.save()
         self.window_detector.cleanup()
         self.hotkey_manager.cleanup()
         super().closeEvent(event)
@@ -163,7 +225,7 @@ class VoiceWidget(QWidget):
         suggestions_reference_layout.addWidget(self.suggestions)
         
         # Right side: Quick reference
-        self.quick_reference = QuickReferenceCard()
+        self.quick_reference = QuickReferenceCard(self.command_handler.registry)
         suggestions_reference_layout.addWidget(self.quick_reference)
         
         command_layout.addLayout(suggestions_reference_layout)
@@ -193,8 +255,10 @@ class VoiceWidget(QWidget):
         
     def setup_connections(self):
         # Connect voice manager signals
+        self.voice_manager.alternatives_received.connect(self.handle_alternatives_received)
         self.voice_manager.text_received.connect(self.handle_text_received)
         self.voice_manager.partial_text_received.connect(self.handle_partial_text)
+        self.voice_manager.hypothesis_received.connect(self.handle_hypothesis)
         self.voice_manager.error_occurred.connect(self.handle_error)
         self.voice_manager.audio_level.connect(self.update_audio_level)
         self.voice_manager.state_changed.connect(self.handle_state_change)
@@ -215,6 +279,13 @@ class VoiceWidget(QWidget):
         
         # Connect global hotkey signals
         self.hotkey_manager.toggle_listening.connect(self.handle_global_toggle)
+        self.hotkey_manager.stop_typing.connect(self.stop_typing)
+        
+        # Typing worker progress
+        self.typing_worker.progress.connect(self.handle_typing_progress)
+        self.typing_worker.job_finished.connect(self.handle_typing_finished)
+        self.typing_worker.job_cancelled.connect(self.handle_typing_cancelled)
+        self.typing_worker.job_failed.connect(self.handle_typing_failed)
         
         # Connect command handler signals
         self.command_handler.command_executed.connect(self.handle_command_executed)
@@ -230,6 +301,11 @@ class VoiceWidget(QWidget):
         # Connect suggestions
         self.suggestions.command_selected.connect(self.handle_suggestion_selected)
         
+        # Auto-punctuation worker
+        self.typing_mode.punctuation_service.result_ready.connect(self.handle_punctuated_text)
+        self.typing_mode.punctuation_service.ready.connect(
+            lambda: self.handle_command_executed("Auto-punctuation ready"))
+        
     def toggle_typing(self):
         self.is_typing = not self.is_typing
         self.is_command_mode = False
@@ -241,6 +317,7 @@ class VoiceWidget(QWidget):
             self.voice_manager.stop_listening()
             self.type_button.setText("Start Typing")
         self.update_button_states()
+        self._update_recognition_mode()
         
     def toggle_command_mode(self):
         self.is_command_mode = not self.is_command_mode
@@ -253,41 +330,88 @@ class VoiceWidget(QWidget):
             self.voice_manager.stop_listening()
             self.command_button.setText("Command Mode")
         self.update_button_states()
+        self._update_recognition_mode()
         
+    def _update_recognition_mode(self):
+        """Route upcoming utterances as dictation or commands based on the current mode"""
+        # Explicit command mode wins; otherwise Google Docs defaults to typing, so it's dictation
+        if self.is_command_mode:
+            self.voice_manager.set_recognition_mode('command')
+        elif self.is_typing or self.current_context == 'google_docs':
+            self.voice_manager.set_recognition_mode('dictation')
+        else:
+            self.voice_manager.set_recognition_mode('command')
+        
+    def handle_alternatives_received(self, alternatives):
+        """Remember the n-best list for the utterance that is about to arrive"""
+        self._last_alternatives = alternatives
+    
     def handle_text_received(self, text):
+        # N-best list for this utterance (emitted just before the text itself)
+        alternatives = self._last_alternatives
+        self._last_alternatives = None
+        if alternatives and text not in alternatives:
+            alternatives = None
+        
+        # "Stop typing" must never be typed itself
+        if text.lower().strip(' .!') in self.STOP_TYPING_PHRASES:
+            self.stop_typing()
+            return
+        
+        # Corrections to text already typed into Docs
+        correction = parse_correction(text) if self.current_context == 'google_docs' else None
+        if correction:
+            if self.live_dictation.active:
+                # Hypotheses of the correction phrase itself may have been typed live
+                self._submit_live_edit(self.live_dictation.abandon(), new_span=False)
+            if self._dictations_in_flight or self.typing_mode.punctuation_service.has_pending():
+                # Earlier dictation isn't journaled yet - apply the correction after it, in order
+                self._dictations_in_flight += 1
+                self.typing_mode.punctuation_service.submit(
+                    text, punctuate=False, tag=('correction', (correction, alternatives)))
+                return
+            if self._apply_correction(*correction):
+                return
+        
+        self._route_utterance(text, alternatives)
+    
+    def _route_utterance(self, text, alternatives):
+        """Handle a final transcript as dictation or as a command"""
+        # A lower-ranked alternative that is a command here beats a top guess that isn't
+        # ("clothes tab" / "close tab"), in Google Docs too - unless the user is typing
+        if alternatives and len(alternatives) > 1 and not self.is_typing:
+            candidate = self.command_handler.rescore_hypotheses(alternatives)
+            if candidate != text and (self.is_command_mode or self._is_likely_command(candidate)):
+                text = candidate
+        
         # Check if this looks like a command or typing
         is_likely_command = self._is_likely_command(text)
+        dictating_into_docs = self.current_context == 'google_docs' and not is_likely_command
+        
+        # Live-typed hypotheses of a phrase that turned out to be a command are taken back
+        if not dictating_into_docs and self.live_dictation.active:
+            self._submit_live_edit(self.live_dictation.abandon(), new_span=False)
         
         # In Google Docs, default to typing mode unless explicitly a command
-        if self.current_context == 'google_docs' and not is_likely_command:
+        if dictating_into_docs:
             # Auto-typing mode in Google Docs
-            processed_text = self.typing_mode.process_text(text)
-            self.text_preview.setText(f"📝 Typing: {processed_text}")
-            
-            # Actually type the text into Google Docs
-            try:
-                self.keyboard_typer.type_text(processed_text)
-                print(f"✓ Typed into Google Docs: {processed_text}")
-            except Exception as e:
-                print(f"✗ Typing failed: {e}")
-                self.text_preview.setText(f"⚠️ Typing error: {processed_text}")
+            self._dictations_in_flight += 1
+            self._dictate(text, alternatives, 'google_docs')
             
         elif self.is_typing:
             # Explicit typing mode
-            processed_text = self.typing_mode.process_text(text)
-            current_text = self.text_preview.toPlainText()
-            if current_text:
-                current_text += " "
-            self.text_preview.setText(current_text + processed_text)
+            self._dictate(text, alternatives, 'preview')
             
             # Update contextual help for typing mode
             help_info = self.contextual_help.get_contextual_help(text)
             self.quick_reference.update_commands(text)
             
         elif self.is_command_mode or is_likely_command:
-            # Command mode - process as command
+            # Command mode - process as command (it may move the cursor, so the journal no longer applies)
+            self.journal.clear()
             self.command_preview.setText(f"Command: {text}")
-            self.command_handler.process_command(text)
+            if self.command_handler.process_command(text):
+                self.intent_classifier.record(text, is_command=True)
             
             # Update suggestions and contextual help
             self.command_handler.get_suggestions(text)
@@ -301,35 +425,180 @@ class VoiceWidget(QWidget):
                 QTimer.singleShot(5000, lambda: self._reset_partial_text_style())
         else:
             # Default: try as command first
+            self.journal.clear()
             self.command_preview.setText(f"Command: {text}")
-            self.command_handler.process_command(text)
+            if self.command_handler.process_command(text):
+                self.intent_classifier.record(text, is_command=True)
     
-    def _is_likely_command(self, text):
-        """Detect if text is likely a command vs regular speech"""
-        text_lower = text.lower().strip()
-        
-        # Common command action verbs
-        command_verbs = [
-            'open', 'close', 'switch', 'go', 'search', 'find', 'new', 'refresh',
-            'scroll', 'zoom', 'bookmark', 'make', 'add', 'remove', 'change',
-            'increase', 'decrease', 'set', 'align', 'clear', 'apply', 'insert'
-        ]
-        
-        # Check if starts with a command verb
-        for verb in command_verbs:
-            if text_lower.startswith(verb + ' ') or text_lower == verb:
-                return True
-        
-        # Very short phrases are likely commands
-        if len(text_lower.split()) <= 3 and any(verb in text_lower for verb in command_verbs):
+    def stop_typing(self):
+        """Cancel the text being typed and anything queued behind it (voice or Ctrl+Shift+S)"""
+        if self.typing_worker.cancel():
+            self.text_preview.setText("⏹️ Typing stopped")
+        # Whatever of the live phrase made it on screen stays; stop tracking it
+        self.live_dictation.reset()
+    
+    def _apply_correction(self, action, argument):
+        """
+        Undo the last typed span or replace a word in recent dictation, using only keystrokes
+        
+        Returns:
+            True if the utterance was handled as a correction, False if there was nothing
+            to undo or the word isn't in recent dictation (so it is ordinary speech)
+        """
+        app = self.keyboard_typer.target_app
+        if action == 'undo':
+            count = self.journal.undo(app)
+            if not count:
+                return False
+            self.typing_worker.submit('', backspaces=count)
+            self.text_preview.setText(f"↩️ Removed {count} characters")
             return True
         
-        # If it's a complete sentence (has multiple words and doesn't start with command verb), likely typing
-        if len(text_lower.split()) > 5:
+        old, new = argument
+        edit = self.journal.replace(old, new, app)
+        if edit is None:
+            # "Replace the old server with a new one." is just a sentence
             return False
+        backspaces, text = edit
+        self.typing_worker.submit(text, backspaces=backspaces)
+        self.text_preview.setText(f"✏️ Replaced '{old}' with '{new}'")
+        return True
+    
+    def _keep_dictation(self, source):
+        """A dictated phrase stayed on screen uncorrected: learn from it"""
+        self.typing_mode.accept_dictation(source)
+        self.intent_classifier.record(source, is_command=False)
+    
+    def _dictation_undone(self, source):
+        """A dictated phrase was taken back; if it is a command here, it was misrouted"""
+        if self.command_handler.can_execute(source):
+            self.intent_classifier.record(source, is_command=True)
+    
+    def handle_typing_progress(self, job_id, typed, total):
+        if total:
+            self.partial_text_label.setText(f"📝 Typing... {100 * typed // total}%")
+    
+    def handle_typing_finished(self, job_id, text):
+        print(f"✓ Typed into Google Docs: {text}")
+        self._reset_partial_text_style()
+    
+    def handle_typing_cancelled(self, job_id, typed):
+        print(f"⏹️ Typing job {job_id} cancelled after {typed} characters")
+        # What is on screen no longer matches the journal (and wasn't kept as dictated)
+        self.journal.clear(retire=False)
+        self._reset_partial_text_style()
+    
+    def handle_typing_failed(self, job_id, error):
+        print(f"✗ Typing failed: {error}")
+        self.text_preview.setText(f"⚠️ Typing error: {error}")
+    
+    def _dictate(self, text, alternatives, target):
+        """
+        Send dictated text through auto-punctuation (off the GUI thread) and then output it
+        
+        Args:
+            target: 'google_docs' to type into the document, 'preview' for the preview box
+        """
+        text = self.typing_mode.select_hypothesis(text, alternatives)
+        service = self.typing_mode.punctuation_service
+        punctuate = self.typing_mode.needs_auto_punctuation(text)
+        if punctuate or service.has_pending():
+            # Results come back in order via handle_punctuated_text
+            context = self.typing_mode.punctuation_context_for(text) if punctuate else None
+            service.submit(text, punctuate=punctuate, tag=(target, text), context=context)
+        else:
+            self._finish_dictation(text, target, text)
+    
+    def handle_punctuated_text(self, text, tag):
+        """Auto-punctuation result (or raw-text fallback) for a dictated utterance"""
+        target, payload = tag
+        if target == 'correction':
+            # A correction that waited for the dictation before it to be typed
+            self._dictations_in_flight = max(0, self._dictations_in_flight - 1)
+            correction, alternatives = payload
+            if not self._apply_correction(*correction):
+                self._route_utterance(text, alternatives)
+            return
+        self._finish_dictation(text, target, payload)
+    
+    def _finish_dictation(self, text, target, raw_text):
+        """Apply voice typing rules and output the result"""
+        processed_text = self.typing_mode.process_text(text)
         
-        return False  # Default to not a command (will be treated as typing)
-        
+        if target == 'google_docs':
+            self.text_preview.setText(f"📝 Typing: {processed_text}")
+            
+            # Type into Google Docs on the typing worker; progress comes back via signals
+            self._dictations_in_flight = max(0, self._dictations_in_flight - 1)
+            if self.live_dictation.active:
+                # Part of the phrase is already on screen - only correct the difference
+                new_span = not self.live_dictation.typed
+                self._submit_live_edit(self.live_dictation.finish(processed_text), new_span)
+                self.journal.attach(raw_text, self.keyboard_typer.target_app)
+            else:
+                self.typing_worker.submit(processed_text)
+                self.journal.record(processed_text, self.keyboard_typer.target_app, source=raw_text)
+        else:
+            # The preview box has no undo or replace, so what it shows is kept
+            self._keep_dictation(raw_text)
+            current_text = self.text_preview.toPlainText()
+            if current_text:
+                current_text += " "
+            self.text_preview.setText(current_text + processed_text)
+    
+    def _is_likely_command(self, text):
+        """
+        Detect if text is likely a command vs regular speech
+        
+        Confident classifier scores decide on their own; in the uncertain band the
+        utterance counts as a command only if it is one in the current context.
+        """
+        registry = self.command_handler.registry
+        if registry.version != self._intent_registry_version:
+            # New phrases were deployed in commands.json
+            self.intent_classifier.train(registry)
+            self._intent_registry_version = registry.version
+        
+        probability = self.intent_classifier.probability(text)
+        if probability >= self.command_threshold:
+            return True
+        if probability <= self.dictation_threshold:
+            return False
+        return self.command_handler.can_execute(text)
+        
+    def handle_hypothesis(self, hypothesis):
+        """Interim transcript of the phrase being spoken ("" when the phrase was discarded)"""
+        if not hypothesis:
+            if self.live_dictation_enabled:
+                self._submit_live_edit(self.live_dictation.abandon(), new_span=False)
+            return
+        looks_like_command = self.is_command_mode or self._is_likely_command(hypothesis)
+        if looks_like_command:
+            # Narrow the suggestions while the command is still being spoken
+            self.command_handler.get_suggestions(hypothesis)
+        if not self.live_dictation_enabled:
+            return
+        # Only plain dictation into Docs, and not while an earlier phrase is still being finalized
+        if self.current_context != 'google_docs' or self._dictations_in_flight:
+            return
+        if looks_like_command or hypothesis.lower() in self.STOP_TYPING_PHRASES:
+            return
+        new_span = not self.live_dictation.typed
+        self._submit_live_edit(self.live_dictation.update(self.typing_mode.format_text(hypothesis)), new_span)
+    
+    def _submit_live_edit(self, edit, new_span):
+        """
+        Queue a live dictation correction
+        
+        Args:
+            edit: (backspaces, text to insert), or None for no change
+            new_span: Whether this starts a new phrase in the journal (else it revises the newest one)
+        """
+        if edit:
+            backspaces, text = edit
+            self.typing_worker.submit(text, backspaces=backspaces)
+            self.journal.record(text, self.keyboard_typer.target_app, backspaces, new_span)
+    
     def handle_partial_text(self, text):
         """Update the partial text display with interim transcription"""
         self.partial_text_label.setText(text)
@@ -471,6 +740,9 @@ class VoiceWidget(QWidget):
     
     def handle_google_docs_inactive(self):
         """Handle when switching away from Google Docs"""
+        self.typing_mode.reset_punctuation_context()
+        self.live_dictation.reset()
+        self.journal.clear()
         # Notify command handler
         self.command_handler.set_google_docs_inactive()
         
@@ -521,14 +793,39 @@ class VoiceWidget(QWidget):
         
         self.context_label.show()
     
+    def apply_performance_profile(self, name):
+        """Switch latency/power profile live across capture, endpointing, polling and typing"""
+        if not self.settings_manager:
+            return
+        profile = self.settings_manager.apply_profile(name)
+        if profile is None:
+            return
+        
+        recognition = profile['voice_recognition']
+        self.voice_manager.apply_latency_settings(
+            recognition['sample_rate'],
+            recognition['chunk_size'],
+            recognition['pause_threshold'],
+            recognition['non_speaking_duration']
+        )
+        self.window_detector.set_poll_interval(profile['window_detection']['poll_interval'])
+        self.keyboard_typer.typing_delay = profile['typing']['typing_delay']
+        self.keyboard_typer.word_delay = profile['typing']['word_delay']
+        
+        print(f"Performance profile: {name}")
+        self.handle_command_executed(f"Performance profile: {name.replace('_', ' ')}")
+    
     def handle_app_changed(self, app_name):
         """Handle when the active app changes"""
         print(f"Active app: {app_name}")
+        self.keyboard_typer.set_target_app(app_name)
+        self.journal.clear()
     
     def handle_context_changed(self, context):
         """Handle when the command context changes"""
         print(f"Command context: {context}")
         self.current_context = context
+        self._update_recognition_mode()
         # Update quick reference if visible
         if hasattr(self, 'quick_reference') and self.quick_reference and self.quick_reference.isVisible():
             self.quick_reference.update_for_context(context)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Tests for learning end-of-speech parameters from the user's pauses
+Run with: python -m pytest test_adaptive_endpointing.py
+"""
+
+import sys
+from types import SimpleNamespace
+sys.path.insert(0, 'src')
+
+import numpy as np
+import pytest
+import speech_recognition as sr
+
+from app.utils.adaptive_endpointing import AdaptiveEndpointer, PauseStatistics
+from app.utils.settings_manager import SettingsManager
+
+RATE = 16000
+ENERGY = 300
+
+
+def utterance(*segments):
+    """AudioData of alternating silence and speech: utterance(0.1, 0.3, 0.2, 0.3) = lead-in, word, pause, word"""
+    chunks = []
+    for index, seconds in enumerate(segments):
+        level = 3000 if index % 2 else 0
+        chunks.append(np.full(int(seconds * RATE), level, dtype=np.int16))
+    return sr.AudioData(np.concatenate(chunks).tobytes(), RATE, 2)
+
+
+def speak(endpointer, mode, pause, count, start=0.0, gap=2.0):
+    """count utterances of two words separated by pause, one every gap seconds"""
+    for index in range(count):
+        audio = utterance(0.1, 0.3, pause, 0.3, 0.1)
+        endpointer.observe_utterance(mode, audio, ENERGY, start + index * gap)
+
+
+def test_percentile_interpolates_like_numpy():
+    values = [0.5, 0.1, 0.3, 0.9, 0.7]
+    stats = PauseStatistics(values)
+    for q in (0, 25, 50, 90, 100):
+        assert stats.percentile(q) == pytest.approx(np.percentile(values, q))
+    assert PauseStatistics().percentile(50) is None
+
+
+def test_defaults_hold_until_enough_pauses_are_seen():
+    endpointer = AdaptiveEndpointer()
+    speak(endpointer, 'command', 0.2, AdaptiveEndpointer.MIN_SAMPLES - 1)
+    assert endpointer.parameters('command') == endpointer.defaults
+
+
+def test_thresholds_follow_the_speakers_pauses_per_mode():
+    endpointer = AdaptiveEndpointer()
+    speak(endpointer, 'command', 0.4, 30)
+    speak(endpointer, 'dictation', 0.2, 30, start=100.0)
+    # 90th percentile of 0.4s pauses, with a 25% margin
+    assert endpointer.parameters('command')['pause_threshold'] == pytest.approx(0.5)
+    # Dictation never drops below its floor, however short the pauses
+    assert endpointer.parameters('dictation')['pause_threshold'] == 0.45
+    # non_speaking_duration may not exceed pause_threshold
+    assert endpointer.parameters('dictation')['non_speaking_duration'] == 0.45
+
+
+def test_quick_follow_ups_cap_the_pause_threshold():
+    endpointer = AdaptiveEndpointer()
+    # Long mid-phrase pauses, but the next command starts 0.7s after the last one ends
+    # (0.5s between recordings plus 0.1s of trailing and leading silence)
+    speak(endpointer, 'command', 1.0, 30, gap=1.8 + 0.5)
+    params = endpointer.parameters('command')
+    assert params['pause_threshold'] == pytest.approx(0.63, abs=0.01)
+
+
+def test_learned_values_are_saved_and_reloaded(tmp_path, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path))
+    endpointer = AdaptiveEndpointer(SettingsManager())
+    speak(endpointer, 'command', 0.4, 30)
+    endpointer.save()
+
+    reloaded = AdaptiveEndpointer(SettingsManager())
+    assert reloaded.parameters('command') == endpointer.parameters('command')
+    assert reloaded.get_report()['command']['utterances'] == 30
+
+    recognizer = SimpleNamespace()
+    reloaded.apply(recognizer, 'command')
+    assert recognizer.pause_threshold == pytest.approx(0.5)
+
+
+def test_silence_and_unknown_modes_are_ignored():
+    endpointer = AdaptiveEndpointer()
+    endpointer.observe_utterance('command', utterance(1.0), ENERGY, 0.0)
+    endpointer.observe_utterance('spelling', utterance(0.1, 0.3), ENERGY, 0.0)
+    assert endpointer.utterance_counts == {'command': 0, 'dictation': 0}
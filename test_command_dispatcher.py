@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests for the compiled per-context command trie
+Run with: python -m pytest test_command_dispatcher.py
+"""
+
+import sys
+sys.path.insert(0, 'src')
+
+import pytest
+
+from app.utils.command_dispatcher import CommandDispatcher, CommandPattern, CommandTrie, KeywordRule
+
+
+def pattern(phrase, group='general', tail='none'):
+    """A pattern whose handler reports which phrase ran, with its arguments"""
+    return CommandPattern(phrase, lambda *args: (phrase, group) + args, group, tail)
+
+
+def run(dispatcher, text):
+    action = dispatcher.match(text)
+    return action() if action else None
+
+
+def test_longest_phrase_wins_whatever_the_declaration_order():
+    dispatcher = CommandDispatcher([pattern("close"), pattern("close all tabs"), pattern("close tab")])
+    assert run(dispatcher, "close tab") == ("close tab", 'general')
+    assert run(dispatcher, "close all tabs") == ("close all tabs", 'general')
+    assert run(dispatcher, "close") == ("close", 'general')
+
+
+def test_literal_words_beat_slots():
+    dispatcher = CommandDispatcher([pattern("heading {number}"), pattern("heading 2"),
+                                    pattern("find {text}"), pattern("find on page")])
+    assert run(dispatcher, "heading 2") == ("heading 2", 'general')
+    assert run(dispatcher, "heading 4") == ("heading {number}", 'general', 4)
+    assert run(dispatcher, "find on page") == ("find on page", 'general')
+    assert run(dispatcher, "find pricing") == ("find {text}", 'general', "pricing")
+
+
+def test_tails():
+    dispatcher = CommandDispatcher([pattern("go back", tail='none'), pattern("scroll down", tail='ignore'),
+                                    pattern("open", tail='args')])
+    assert run(dispatcher, "go back please") is None
+    assert run(dispatcher, "scroll down a bit") == ("scroll down", 'general')
+    assert run(dispatcher, "open visual studio code") == ("open", 'general', "visual studio code")
+    assert run(dispatcher, "open") == ("open", 'general', "")
+
+
+def test_more_specific_context_wins_ties():
+    patterns = [pattern("select all", 'general'), pattern("select all", 'google_docs'),
+                pattern("select all", 'browser')]
+    dispatcher = CommandDispatcher(patterns)
+    assert run(dispatcher, "select all") == ("select all", 'general')
+    dispatcher.set_context('browser')
+    assert run(dispatcher, "select all") == ("select all", 'browser')
+    dispatcher.set_context('google_docs')
+    assert run(dispatcher, "select all") == ("select all", 'google_docs')
+
+    # Length still beats context: a longer general phrase wins over a shorter docs one
+    trie = CommandTrie([pattern("make", 'google_docs'), pattern("make it bold", 'general')],
+                       {'general': 0, 'browser': 1, 'google_docs': 2})
+    found, args = trie.match("make it bold".split())
+    assert found.phrase == "make it bold"
+
+
+def test_keywords_only_apply_when_no_phrase_matches():
+    dispatcher = CommandDispatcher([pattern("delete {number}", tail='ignore')],
+                                   [KeywordRule(["delete"], lambda text: ("keyword", text))])
+    assert run(dispatcher, "delete 3") == ("delete {number}", 'general', 3)
+    assert run(dispatcher, "delete the last word") == ("keyword", "delete the last word")
+
+
+def test_unknown_context_is_rejected():
+    with pytest.raises(ValueError):
+        CommandDispatcher([]).set_context('spreadsheet')
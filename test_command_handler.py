@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Tests for command resolution: number slots and free-text arguments
+Run with: python -m pytest test_command_handler.py
+"""
+
+import sys
+sys.path.insert(0, 'src')
+
+import pytest
+
+from app.utils.command_handler import CommandHandler
+
+
+@pytest.fixture
+def handler(tmp_path, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path))
+    handler = CommandHandler()
+    handler.calls = []
+    monkeypatch.setattr(handler.browser_router, 'execute_command',
+                        lambda name, *args: handler.calls.append((name,) + args))
+    monkeypatch.setattr(handler.app_launcher, 'open_app',
+                        lambda name: handler.calls.append(('open', name)) or (True, name))
+    monkeypatch.setattr(handler.google_docs_handler, 'backspace_chars',
+                        lambda count: handler.calls.append(('backspace', count)))
+    return handler
+
+
+@pytest.mark.parametrize('spoken, expected', [
+    ("search for one direction songs", ('search', 'one direction songs')),
+    ("search for the second world war", ('search', 'the second world war')),
+    ("go to first national bank dot com", ('go_to_url', 'first national bank dot com')),
+])
+def test_text_slots_keep_number_words(handler, spoken, expected):
+    handler.set_browser_active('Google Chrome')
+    handler.process_command(spoken)
+    assert handler.calls == [expected]
+
+
+def test_app_name_keeps_number_words(handler):
+    handler.process_command("open one password")
+    assert handler.calls == [('open', 'one password')]
+
+
+@pytest.mark.parametrize('spoken, count', [
+    ("backspace three", 3),
+    ("backspace 3", 3),
+    ("delete twenty five", 25),
+    ("delete five words", 5),
+    ("delete the last four", 4),
+])
+def test_number_slots_read_spoken_numbers(handler, spoken, count):
+    handler.set_google_docs_active('Google Chrome')
+    handler.process_command(spoken)
+    assert handler.calls == [('backspace', count)]
+
+
+def test_used_commands_are_suggested_first(handler):
+    handler.set_google_docs_active('Google Chrome')
+    suggestions = []
+    handler.suggestion_updated.connect(suggestions.append)
+    handler.get_suggestions("b")
+    assert suggestions[-1][0] != "backspace"
+
+    handler.process_command("backspace three")
+    handler.get_suggestions("b")
+    assert suggestions[-1][0] == "backspace"
+
+
+
+
+def test_misheard_word_runs_the_nearest_command(handler):
+    handler.set_browser_active('Google Chrome')
+    handler.process_command("scroll dawn")
+    assert handler.calls == [('scroll_down',)]
+
+@pytest.mark.parametrize('spoken', ["paragraphs", "centre", "zoo men", "heading 4", "heading four"])
+def test_near_misses_are_not_run(handler, spoken):
+    handler.set_google_docs_active('Google Chrome')
+    failures = []
+    handler.command_failed.connect(failures.append)
+    handler.process_command(spoken)
+    # Nothing ran: the user is told the command wasn't understood (at most with a "did you mean")
+    assert handler.calls == []
+    assert len(failures) == 1 and failures[0].startswith(f"Unknown command: {spoken}")
+    if spoken.startswith("heading"):
+        assert "Did you mean" not in failures[0]
+
+
+@pytest.mark.parametrize('spoken, counted', [
+    ("delete the last word", ["delete word"]),
+    ("delete this line", ["delete line"]),
+    ("backspace three", ["backspace"]),
+])
+def test_only_the_suggestion_that_was_said_is_counted(handler, spoken, counted):
+    handler.set_google_docs_active('Google Chrome')
+    handler.google_docs_handler.delete_word = lambda *args: None
+    handler.google_docs_handler.delete_line = lambda *args: None
+    handler.process_command(spoken)
+    assert sorted(handler.suggestion_index.usage) == counted
+
+
+def test_command_alternative_beats_a_top_guess_that_is_not_one(handler):
+    handler.set_browser_active('Google Chrome')
+    assert handler.rescore_hypotheses(["clothes tab", "close tab"]) == "close tab"
+    assert handler.rescore_hypotheses(["close tab", "clothes tab"]) == "close tab"
+    # An exact phrase beats a phrase with trailing words; otherwise the recognizer's order stands
+    assert handler.rescore_hypotheses(["scroll down a bit", "scroll down"]) == "scroll down"
+    assert handler.rescore_hypotheses(["hello there", "hello where"]) == "hello there"
+    assert handler.rescoring_stats == {'rescored': 4, 'changed': 2, 'repeats_avoided': 1}
+
+
+def test_context_phrases_are_built_once_per_context(handler):
+    general = handler.get_context_phrases()
+    assert handler.get_context_phrases() is general
+    handler.set_browser_active('Google Chrome')
+    browser = handler.get_context_phrases()
+    assert "close tab" in browser and "close tab" not in general
+    assert handler.get_context_phrases() is browser
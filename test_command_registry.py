@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tests for loading, caching and hot-reloading the JSON command registry
+Run with: python -m pytest test_command_registry.py
+"""
+
+import json
+import os
+import sys
+sys.path.insert(0, 'src')
+
+import pytest
+
+from app.utils import command_registry
+from app.utils.command_registry import CACHE_FORMAT, CommandRegistry
+
+
+def write_registry(path, phrases):
+    commands = [{"phrases": [phrase], "action": "help", "suggest": phrase} for phrase in phrases]
+    with open(path, 'w') as f:
+        json.dump({"registry": {"contexts": {"general": {"sections": [{"name": "All", "commands": commands}]}}}}, f)
+
+
+def cached_files(cache_dir):
+    return sorted(name for name in os.listdir(cache_dir) if name.endswith('.pickle'))
+
+
+def test_registry_cache_is_keyed_by_content(tmp_path, monkeypatch):
+    path, cache_dir = tmp_path / 'commands.json', tmp_path / 'cache'
+    write_registry(path, ["show help"])
+    registry = CommandRegistry(str(path), str(cache_dir))
+    first, = cached_files(cache_dir)
+    assert first.startswith(f"commands-{CACHE_FORMAT}-{registry.digest[:16]}")
+
+    # Same content: served from the cache without compiling
+    monkeypatch.setattr(command_registry, 'compile_registry', lambda data: pytest.fail("not cached"))
+    assert CommandRegistry(str(path), str(cache_dir)).phrases('general') == ["show help"]
+    monkeypatch.undo()
+
+    # New content: compiled again, and the stale cache file is removed
+    write_registry(path, ["show help", "what can i say"])
+    registry = CommandRegistry(str(path), str(cache_dir))
+    assert registry.phrases('general') == ["show help", "what can i say"]
+    assert cached_files(cache_dir) == [f"commands-{CACHE_FORMAT}-{registry.digest[:16]}.pickle"]
+
+
+def test_registry_hot_reload(tmp_path, monkeypatch):
+    path = tmp_path / 'commands.json'
+    write_registry(path, ["show help"])
+    registry = CommandRegistry(str(path), cache_dir=None)
+    monkeypatch.setattr(CommandRegistry, 'RELOAD_CHECK_INTERVAL', 0.0)
+    version = registry.version
+
+    def rewrite(content):
+        path.write_text(content) if isinstance(content, str) else write_registry(path, content)
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert not registry.reload_if_changed()  # Nothing changed
+
+    rewrite(["show help", "what can i say"])
+    assert registry.reload_if_changed()
+    assert registry.version == version + 1
+    assert [phrase for phrase, *_ in registry.patterns] == ["show help", "what can i say"]
+
+    # Touched but identical: no new version
+    rewrite(path.read_text())
+    assert not registry.reload_if_changed()
+
+    # Broken file: the previous registry stays loaded
+    rewrite("{not json")
+    assert not registry.reload_if_changed()
+    assert registry.version == version + 1
+    assert registry.phrases('general') == ["show help", "what can i say"]
+
+
+@pytest.mark.parametrize('shape', [
+    [],
+    {"registry": []},
+    {"registry": {"contexts": {"general": []}}},
+    {"registry": {"contexts": {"general": {"sections": {"a": 1}}}}},
+    {"registry": {"contexts": {"general": {"sections": "All"}}}},
+    {"registry": {"contexts": {"general": {"sections": [{"commands": {"phrases": ["x"]}}]}}}},
+    {"registry": {"contexts": {"general": {"sections": [{"commands": [
+        {"phrases": "show help", "action": "help", "suggest": {"a": 1}}]}]}}}},
+    {"registry": {"contexts": {"general": {"sections": [{"commands": [{"phrases": [1], "action": "help"}]}]}}}},
+])
+def test_badly_shaped_registry_keeps_the_previous_one(tmp_path, monkeypatch, shape):
+    path = tmp_path / 'commands.json'
+    write_registry(path, ["show help"])
+    registry = CommandRegistry(str(path), cache_dir=None)
+    monkeypatch.setattr(CommandRegistry, 'RELOAD_CHECK_INTERVAL', 0.0)
+
+    path.write_text(json.dumps(shape))
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert not registry.reload_if_changed()
+    assert registry.phrases('general') == ["show help"]
+
+    # Nor does it stop the app from starting
+    assert CommandRegistry(str(path), cache_dir=None).patterns == []
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests for suggestion ranking and the incremental suggestion list model
+Run with: python -m pytest test_command_suggestions.py
+"""
+
+import sys
+sys.path.insert(0, 'src')
+
+import pytest
+
+from app.utils.suggestion_index import SuggestionIndex
+from app.widgets.command_suggestions import SuggestionListModel
+
+
+@pytest.fixture
+def model():
+    model = SuggestionListModel()
+    model.changes = []
+    model.rowsInserted.connect(lambda parent, first, last: model.changes.append(('insert', first, last)))
+    model.rowsRemoved.connect(lambda parent, first, last: model.changes.append(('remove', first, last)))
+    model.dataChanged.connect(lambda top, bottom: model.changes.append(('change', top.row(), bottom.row())))
+    model.modelReset.connect(lambda: model.changes.append(('reset',)))
+    return model
+
+
+def update(model, suggestions):
+    model.changes.clear()
+    model.set_suggestions(suggestions)
+    assert model.suggestions() == suggestions
+    assert [model.data(model.index(row)) for row in range(model.rowCount())] == suggestions
+    return model.changes
+
+
+def test_only_the_differing_rows_are_touched(model):
+    assert update(model, ["a", "b", "c"]) == [('insert', 0, 2)]
+    assert update(model, ["a", "b", "c"]) == []
+    assert update(model, ["a", "x", "c"]) == [('change', 1, 1)]
+    assert update(model, ["a", "x", "y", "z", "c"]) == [('insert', 2, 3)]
+    assert update(model, ["a", "c"]) == [('remove', 1, 3)]
+    assert update(model, ["q", "r", "s", "c"]) == [('change', 0, 0), ('insert', 1, 2)]
+    assert update(model, ["s", "c"]) == [('remove', 0, 1)]
+    assert update(model, []) == [('remove', 0, 1)]
+
+
+def test_prefix_search_matches_any_word_start():
+    index = SuggestionIndex()
+    index.build({'browser': ["new tab", "close tab", "go back"], 'general': ["backspace"]})
+    assert index.suggest('browser', "ta") == ["new tab", "close tab"]
+    assert index.suggest('browser', "close  t") == ["close tab"]
+    assert index.suggest('browser', "ab") == []
+    assert index.suggest('browser', "", limit=2) == ["new tab", "close tab"]
+    assert index.suggest('general', "b") == ["backspace"]
+    assert index.suggest('google_docs', "b") == []
+
+
+def test_used_suggestions_rank_first_and_decay(tmp_path):
+    path = tmp_path / 'usage.json'
+    index = SuggestionIndex(str(path))
+    index.build({'browser': ["new tab", "close tab"]})
+    index.record("close tab")
+    assert index.suggest('browser', "ta") == ["close tab", "new tab"]
+
+    # Old use fades: a score two half-lives old counts a quarter
+    score, last_used = index.usage["close tab"]
+    assert index._score("close tab", last_used + 2 * SuggestionIndex.HALF_LIFE_DAYS * 86400) \
+        == pytest.approx(score / 4)
+    index.usage["close tab"] = [score, last_used - 2 * SuggestionIndex.HALF_LIFE_DAYS * 86400]
+    index.record("new tab")
+    assert index.suggest('browser', "ta") == ["new tab", "close tab"]
+
+    index.save()
+    reloaded = SuggestionIndex(str(path))
+    reloaded.build({'browser': ["new tab", "close tab"]})
+    assert reloaded.suggest('browser', "") == ["new tab", "close tab"]
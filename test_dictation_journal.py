@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for the dictation journal: corrections and which spans count as kept
+Run with: python -m pytest test_dictation_journal.py
+"""
+
+import sys
+sys.path.insert(0, 'src')
+
+from app.utils.dictation_journal import DictationJournal
+
+APP = "Google Chrome"
+
+
+def make_journal(max_entries=100, on_undo=None):
+    kept = []
+    return DictationJournal(max_entries, on_retire=kept.append, on_undo=on_undo), kept
+
+
+def test_uncorrected_spans_are_retired_on_clear():
+    journal, kept = make_journal()
+    journal.record("Meet Jon at noon. ", APP, source="meet jon at noon")
+    journal.record("Bring the slides.", APP, source="bring the slides")
+    assert kept == []  # Nothing is learned while it can still be corrected
+    journal.clear()
+    assert kept == ["meet jon at noon", "bring the slides"]
+
+
+def test_undone_span_is_never_retired():
+    undone = []
+    journal, kept = make_journal(on_undo=undone.append)
+    journal.record("Meet at noon. ", APP, source="meet at noon")
+    journal.record("Bring the slides.", APP, source="bring the slides")
+    assert journal.undo(APP) == len("Bring the slides.")
+    journal.clear()
+    assert kept == ["meet at noon"]
+    assert undone == ["bring the slides"]
+
+
+def test_replaced_spans_are_never_retired():
+    journal, kept = make_journal()
+    journal.record("Meet Jon at noon. ", APP, source="meet jon at noon")
+    journal.record("Bring the slides.", APP, source="bring the slides")
+    assert journal.replace("jon", "john", APP) == (len("n at noon. Bring the slides."),
+                                                    "hn at noon. Bring the slides.")
+    journal.clear()
+    assert kept == []
+
+
+def test_cancelled_spans_are_dropped_without_retiring():
+    journal, kept = make_journal()
+    journal.record("Half typ", APP, source="half typed")
+    journal.clear(retire=False)
+    assert kept == [] and len(journal) == 0
+
+
+def test_oldest_span_is_retired_when_pushed_out():
+    journal, kept = make_journal(max_entries=2)
+    for word in ("one ", "two ", "three "):
+        journal.record(word, APP, source=word.strip())
+    assert kept == ["one"]
+    assert journal.text() == "two three "
+
+
+def test_switching_apps_retires_the_old_apps_spans():
+    journal, kept = make_journal()
+    journal.record("Hello there.", APP, source="hello there")
+    journal.record("Hi", "Slack", source="hi")
+    assert kept == ["hello there"]
+
+
+def test_attach_ties_a_live_phrase_to_its_transcript():
+    journal, kept = make_journal()
+    journal.record("hello wor", APP)
+    journal.record("ld", APP, new_span=False)
+    journal.attach("hello world", APP)
+    journal.clear()
+    assert kept == ["hello world"]
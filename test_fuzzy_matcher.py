@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for recovering misheard commands
+Run with: python -m pytest test_fuzzy_matcher.py
+"""
+
+import sys
+sys.path.insert(0, 'src')
+
+from app.utils.fuzzy_matcher import FuzzyMatcher, phonetic_key
+
+PATTERNS = [
+    ("scroll down", "browser.scroll_down", 'general', 'none'),
+    ("close tab", "browser.close_tab", 'general', 'none'),
+    ("heading 1", "docs.heading_one", 'general', 'none'),
+    ("heading three", "docs.heading_three", 'general', 'none'),
+    ("paragraph", "docs.normal_text", 'general', 'none'),
+    ("underline", "docs.underline", 'general', 'none'),
+    ("go to {text}", "browser.go_to_url", 'general', 'none'),
+]
+
+
+def confidence(matcher, text):
+    found = matcher.match(text)
+    return found[2] if found else 0.0
+
+
+def test_phonetic_key():
+    assert phonetic_key("dawn") == phonetic_key("down")
+    assert phonetic_key("clothes") == "kl0s"
+    assert phonetic_key("42") == "42"
+
+
+def test_misheard_words_are_recovered():
+    matcher = FuzzyMatcher(PATTERNS)
+    assert matcher.match("scroll dawn") == ("scroll down", "scroll down", 0.88)
+    corrected, phrase, _ = matcher.match("goat to example.com")
+    assert (corrected, phrase) == ("go to example.com", "go to {text}")
+
+
+def test_numbers_must_match_exactly():
+    matcher = FuzzyMatcher(PATTERNS)
+    for text in ("heading 4", "heading four", "heading 2", "heading too"):
+        found = matcher.match(text)
+        assert found is None or found[1] not in ("heading 1", "heading three"), text
+    # The same number, said or written the other way, is still that command
+    assert matcher.match("heading 3")[1] == "heading three"
+    assert matcher.match("heading one")[1] == "heading 1"
+
+
+def test_plurals_and_word_counts_lower_confidence():
+    matcher = FuzzyMatcher(PATTERNS)
+    assert confidence(matcher, "paragraphs") < 0.8
+    assert confidence(matcher, "under line") < 1.0
+    assert confidence(matcher, "scroll dawn") > confidence(matcher, "scroll dawns")
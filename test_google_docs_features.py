@@ -25,6 +25,10 @@ def test_voice_typing():
         ("bullet point", "• "),
         ("number one", "1. "),
         ("em dash", " — "),
+        ("dash bullet", "- "),
+        ("new paragraph", "\n\n"),
+        ("twenty five dollars", "$25"),
+        ("meet at three thirty pm", "3:30 PM"),
     ]
     
     passed = 0
@@ -168,6 +172,7 @@ def test_command_handler():
     print("="*60)
     
     from app.utils.command_handler import CommandHandler
+    from app.utils.suggestion_index import SuggestionIndex
     
     # Create instance
     handler = CommandHandler()
@@ -204,6 +209,43 @@ def test_command_handler():
         print("✗ is_google_docs_active attribute not found")
         failed += 1
     
+    # Spoken numbers reach commands as digits
+    deleted = []
+    # Rank by this run's usage only, without touching the usage saved on disk
+    handler.suggestion_index = SuggestionIndex()
+    handler._index_suggestions()
+    handler.set_google_docs_active("Chrome")
+    handler.google_docs_handler.backspace_chars = deleted.append
+    handler.process_command("backspace three")
+    if deleted == [3]:
+        print("✓ 'backspace three' deletes 3 characters")
+        passed += 1
+    else:
+        print(f"✗ 'backspace three' deleted {deleted} (expected: [3])")
+        failed += 1
+    
+    # Single misheard words are corrected through the fuzzy index
+    executed = []
+    handler.browser_router.execute_command = lambda *args: executed.append(args)
+    handler.process_command("scroll dawn")
+    if executed == [('scroll_down',)]:
+        print("✓ 'scroll dawn' runs 'scroll down'")
+        passed += 1
+    else:
+        print(f"✗ 'scroll dawn' ran {executed} (expected: [('scroll_down',)])")
+        failed += 1
+    
+    # Suggestions are ranked by use
+    suggestions = []
+    handler.suggestion_updated.connect(suggestions.append)
+    handler.get_suggestions("b")
+    if suggestions and suggestions[-1][:1] == ["backspace"]:
+        print("✓ Most used command is suggested first")
+        passed += 1
+    else:
+        print(f"✗ Suggestions for 'b': {suggestions}")
+        failed += 1
+    
     print(f"\nCommand Handler: {passed} passed, {failed} failed")
     return failed == 0
 
@@ -247,6 +289,40 @@ def test_voice_widget():
         print("✗ _is_likely_command() method not found")
         failed += 1
     
+    # Sentences that open with a command verb are still dictation
+    from app.utils.command_registry import CommandRegistry
+    from app.utils.intent_classifier import IntentClassifier
+    classifier = IntentClassifier()
+    classifier.train(CommandRegistry())
+    sentence = classifier.probability("make sure you add the chart to section two")
+    command = classifier.probability("make bold")
+    if sentence < 0.3 and command > 0.8:
+        print(f"✓ Intent classifier separates dictation ({sentence:.2f}) from commands ({command:.2f})")
+        passed += 1
+    else:
+        print(f"✗ Intent classifier gave dictation {sentence:.2f}, command {command:.2f}")
+        failed += 1
+
+    # Corrections are computed from the dictation journal, not by reading the document
+    from app.utils.dictation_journal import DictationJournal
+    journal = DictationJournal()
+    journal.record("Meet Jon at noon. ", "Google Chrome")
+    journal.record("Bring the slides.", "Google Chrome")
+    if journal.undo("Google Chrome") == len("Bring the slides."):
+        print("✓ 'scratch that' removes exactly the last span")
+        passed += 1
+    else:
+        print("✗ 'scratch that' did not remove the last span")
+        failed += 1
+
+    edit = journal.replace("jon", "john", "Google Chrome")
+    if edit == (len("n at noon. "), "hn at noon. ") and journal.text() == "Meet John at noon. ":
+        print("✓ 'replace jon with john' is a minimal edit")
+        passed += 1
+    else:
+        print(f"✗ 'replace jon with john' gave {edit}, journal {journal.text()!r}")
+        failed += 1
+
     print(f"\nVoice Widget: {passed} passed, {failed} failed")
     return failed == 0
 
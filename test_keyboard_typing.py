@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Tests for typing through pynput, and pasting long dictation through the clipboard
+Run with: python -m pytest test_keyboard_typing.py
+"""
+
+import subprocess
+import sys
+sys.path.insert(0, 'src')
+
+import pytest
+from pynput.keyboard import Key
+
+from app.utils import keyboard_typing
+from app.utils.keyboard_typing import KeyboardTyper
+
+
+class FakeKeyboard:
+    """Records pynput presses and releases"""
+
+    def __init__(self):
+        self.events = []
+
+    def press(self, key):
+        self.events.append(('press', key))
+
+    def release(self, key):
+        self.events.append(('release', key))
+
+    def typed(self):
+        return ''.join(key for kind, key in self.events if kind == 'press' and isinstance(key, str))
+
+
+@pytest.fixture
+def typer(monkeypatch):
+    typer = KeyboardTyper()
+    typer.keyboard = FakeKeyboard()
+    typer.typing_delay = typer.word_delay = typer.repeat_interval = 0
+    typer.paste_restore_delay = 0
+    typer.clipboard = 'copied earlier'
+    typer.clipboard_writes = []
+    typer._clipboard_commands = (['copy'], ['paste'])
+
+    def run_clipboard(command, text=None):
+        if command == ['copy']:
+            typer.clipboard = text
+            typer.clipboard_writes.append(text)
+        return subprocess.CompletedProcess(command, 0, stdout=typer.clipboard)
+
+    monkeypatch.setattr(typer, '_run_clipboard', run_clipboard)
+    return typer
+
+
+LONG = "this sentence is long enough to be pasted rather than typed"
+
+
+def test_short_text_is_typed(typer):
+    assert typer.type_text("hi there") == 8
+    assert typer.keyboard.typed() == "hi there"
+    assert typer.clipboard_writes == []
+
+
+def test_long_text_is_pasted_and_the_clipboard_restored(typer, monkeypatch):
+    monkeypatch.setattr(keyboard_typing.platform, 'system', lambda: 'Linux')  # Ctrl+V, not Cmd+V
+    progress = []
+    assert typer.type_text(LONG, on_progress=lambda typed, total: progress.append((typed, total))) == len(LONG)
+    assert typer.keyboard.events == [('press', Key.ctrl), ('press', 'v'), ('release', 'v'), ('release', Key.ctrl)]
+    assert typer.clipboard_writes == [LONG, 'copied earlier']
+    assert progress == [(len(LONG), len(LONG))]
+
+
+def test_an_empty_clipboard_is_not_restored(typer):
+    typer.clipboard = ''
+    typer.type_text(LONG)
+    assert typer.clipboard_writes == [LONG]
+
+
+def test_without_a_clipboard_long_text_is_typed(typer):
+    typer._clipboard_commands = None
+    assert typer.type_text(LONG) == len(LONG)
+    assert typer.keyboard.typed() == LONG
+
+
+def test_failed_clipboard_write_falls_back_to_typing(typer, monkeypatch):
+    def broken(command, text=None):
+        raise subprocess.CalledProcessError(1, command)
+
+    monkeypatch.setattr(typer, '_run_clipboard', broken)
+    assert typer.type_text(LONG) == len(LONG)
+    assert typer.keyboard.typed() == LONG
+
+
+def test_cancelled_paste_sends_nothing(typer):
+    assert typer.type_text(LONG, should_stop=lambda: True) == 0
+    assert typer.keyboard.events == []
+    assert typer.clipboard == 'copied earlier'
+
+
+def test_paste_threshold_zero_always_types(typer):
+    typer.paste_threshold = 0
+    typer.type_text(LONG)
+    assert typer.clipboard_writes == []
+
+
+def test_repeated_keys_hold_modifiers_once(typer):
+    assert typer.press_repeated(Key.left, 3, Key.shift) == 3
+    assert typer.keyboard.events == [('press', Key.shift)] + [('press', Key.left), ('release', Key.left)] * 3 \
+        + [('release', Key.shift)]
+
+
+def test_repeated_keys_stop_early_and_release_modifiers(typer):
+    stop_after = iter([False, False, True])
+    assert typer.press_repeated(Key.backspace, 10, Key.ctrl, should_stop=lambda: next(stop_after)) == 2
+    assert typer.keyboard.events[-1] == ('release', Key.ctrl)
+
+
+def test_backspace_burst_can_be_cancelled(typer):
+    stop_after = iter([False] * 4 + [True])
+    assert typer.backspace(40, should_stop=lambda: next(stop_after)) == 4
+    assert typer.keyboard.events.count(('press', Key.backspace)) == 4
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for typing phrases while they are still being spoken
+Run with: python -m pytest test_live_typing.py
+"""
+
+import sys
+sys.path.insert(0, 'src')
+
+from app.utils.live_typing import LiveDictation, minimal_edit
+
+
+def test_minimal_edit_keeps_the_common_prefix():
+    assert minimal_edit("", "hello") == (0, "hello")
+    assert minimal_edit("hello", "hello world") == (0, " world")
+    assert minimal_edit("hello word", "hello world") == (1, "ld")
+    assert minimal_edit("recognize speech", "wreck a nice beach") == (16, "wreck a nice beach")
+    assert minimal_edit("same", "same") == (0, "")
+    assert minimal_edit("typed", "") == (5, "")
+
+
+def test_words_are_typed_once_hypotheses_agree():
+    live = LiveDictation(stable_hypotheses=2)
+    assert live.update("hello") is None  # Only one hypothesis so far
+    assert live.update("hello world") == (0, "hello")
+    assert live.update("hello world how") == (0, " world")
+    # A shorter agreement never takes typed text back
+    assert live.update("hello") is None
+    assert live.typed == "hello world"
+
+
+def test_revised_words_are_corrected():
+    live = LiveDictation(stable_hypotheses=2)
+    live.update("meet jon")
+    assert live.update("meet jon at") == (0, "meet jon")
+    live.update("meet john at")
+    assert live.update("meet john at noon") == (1, "hn at")
+
+
+def test_finish_fixes_the_tail_and_starts_a_new_phrase():
+    live = LiveDictation(stable_hypotheses=2)
+    live.update("the cat")
+    live.update("the cat sat")
+    assert live.finish("The cat sat.") == (7, "The cat sat.")
+    assert not live.active
+    assert live.finish("") is None
+
+
+def test_abandon_erases_the_phrase():
+    live = LiveDictation(stable_hypotheses=2)
+    live.update("scroll down")
+    live.update("scroll down")
+    assert live.active
+    assert live.abandon() == (len("scroll down"), "")
+    assert live.typed == "" and not live.active
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Tests for queuing audio to the partial recognizer's worker thread
+Run with: python -m pytest test_partial_recognizer.py
+"""
+
+import sys
+import threading
+sys.path.insert(0, 'src')
+
+import pytest
+
+from app.utils.partial_recognizer import PartialRecognizer
+
+
+class FakeModelRecognizer(PartialRecognizer):
+    """Skips Vosk: each chunk's text becomes the hypothesis"""
+
+    def __init__(self):
+        super().__init__('no-model')
+        self._model = object()
+        self.release = threading.Event()
+        self.release.set()
+        self.fed = []
+
+    def accept(self, chunk, sample_rate):
+        self.release.wait(2)
+        self.fed.append(chunk)
+        return chunk.decode()
+
+
+def test_submit_queues_and_worker_emits_hypotheses():
+    recognizer = FakeModelRecognizer()
+    hypotheses = []
+    done = threading.Event()
+    recognizer.start(lambda text: (hypotheses.append(text), text == 'hello world' and done.set()))
+    recognizer.submit(b'hello', 16000)
+    recognizer.submit(b'hello world', 16000)
+    assert done.wait(2)
+    recognizer.stop()
+    assert hypotheses == ['hello', 'hello world']
+
+
+def test_audio_queued_before_reset_is_skipped():
+    recognizer = FakeModelRecognizer()
+    recognizer.release.clear()  # Hold the worker on the first chunk
+    hypotheses = []
+    recognizer.start(hypotheses.append)
+    recognizer.submit(b'old phrase', 16000)
+    recognizer.submit(b'old phrase again', 16000)
+    recognizer.reset()
+    recognizer.release.set()
+    recognizer.stop()
+    assert hypotheses == []
+
+
+def test_full_queue_drops_instead_of_blocking():
+    recognizer = FakeModelRecognizer()
+    recognizer.release.clear()
+    recognizer.start(lambda text: None)
+    for _ in range(PartialRecognizer.MAX_PENDING + 5):
+        recognizer.submit(b'x', 16000)  # Never blocks the audio callback
+    assert recognizer.dropped >= 4
+    recognizer.release.set()
+    recognizer.stop()
+
+
+def test_submit_before_model_loads_is_ignored():
+    recognizer = PartialRecognizer('no-model')
+    recognizer.start(lambda text: None)
+    recognizer.submit(b'x', 16000)
+    assert recognizer._queue.empty()
+    recognizer.stop()
+
+
+@pytest.mark.parametrize('mode', ['command', 'dictation'])
+def test_audio_reaches_the_partial_recognizer_in_both_modes(mode):
+    pytest.importorskip('pyaudio')
+    from app.utils.voice_recognition import VoiceRecognitionManager
+    manager = VoiceRecognitionManager()
+    manager.is_listening = True
+    manager.recognition_mode = mode
+    submitted = []
+    manager.partial_recognizer = type('Partials', (), {'submit': lambda self, chunk, rate: submitted.append(chunk)})()
+    manager._level_monitoring_callback(bytes(64), 32, None, None)
+    assert submitted == [bytes(64)]
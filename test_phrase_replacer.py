@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Tests for single-pass spoken punctuation replacement
+Run with: python -m pytest test_phrase_replacer.py
+"""
+
+import sys
+sys.path.insert(0, 'src')
+
+from app.utils.phrase_replacer import PhraseReplacer
+
+
+def test_longest_phrase_wins():
+    replacer = PhraseReplacer({"dash": "-", "em dash": " — ", "dash bullet": "- "})
+    assert replacer.replace("em dash and dash bullet") == " —  and - "
+
+
+def test_spacing_and_case_in_speech_are_ignored():
+    replacer = PhraseReplacer({"question mark": "?"})
+    assert replacer.replace("ready Question   Mark") == "ready ?"
+    # Whole words only
+    assert replacer.replace("questionmarks") == "questionmarks"
+
+
+def test_table_is_copied_at_construction():
+    table = {"comma": ","}
+    replacer = PhraseReplacer(table)
+    table["semicolon"] = ";"
+    assert replacer.replace("a comma b semicolon c") == "a , b semicolon c"
+    assert PhraseReplacer({}).replace("a comma b") == "a comma b"
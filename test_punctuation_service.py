@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Tests for the punctuation service's ordered results and timeout fallback,
+with the worker process replaced by in-process queues, and for the cache of
+the int8 model (torch and transformers replaced by small fakes)
+Run with: python -m pytest test_punctuation_service.py
+"""
+
+import os
+import queue
+import sys
+import threading
+import time
+import types
+sys.path.insert(0, 'src')
+
+import pytest
+from PyQt6.QtCore import QCoreApplication, Qt
+
+from app.utils import punctuation_service
+from app.utils.punctuation_service import PunctuationService
+
+
+class FakeProcess:
+    def is_alive(self):
+        return True
+
+
+@pytest.fixture(scope='module')
+def qt_app():
+    # Results cross from the reader thread to this one through the event loop
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication(sys.argv)
+
+
+@pytest.fixture
+def service(qt_app):
+    service = PunctuationService(timeout=0.3)
+    service._process = FakeProcess()
+    service._requests = queue.Queue()
+    service._responses = queue.Queue()
+    service._ready = service._running = True
+    service.results = []
+    service.result_ready.connect(lambda text, tag: service.results.append((text, tag)),
+                                 Qt.ConnectionType.DirectConnection)
+    reader = threading.Thread(target=service._read_responses, args=(service._process, service._responses),
+                              daemon=True)
+    reader.start()
+    yield service
+    service._running = False
+    reader.join(timeout=1.0)
+
+
+def requests(service):
+    """What the worker would have been asked to punctuate: request id -> text"""
+    sent = {}
+    while not service._requests.empty():
+        request_id, text, context = service._requests.get_nowait()
+        sent[text] = request_id
+    return sent
+
+
+def wait_for(condition, timeout=2.0, deliver=True):
+    """Poll condition, running the event loop unless deliver is False"""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        if deliver:
+            QCoreApplication.processEvents()
+        time.sleep(0.01)
+    return condition()
+
+
+def settle():
+    """Give the reader a moment, then deliver whatever it queued"""
+    time.sleep(0.1)
+    QCoreApplication.processEvents()
+
+
+def test_results_are_released_in_submission_order(service):
+    service.submit("hello there", tag='first')
+    service.submit("scroll down", punctuate=False, tag='command')
+    service.submit("how are you", tag='second')
+    sent = requests(service)
+    assert sorted(sent) == ["hello there", "how are you"]  # The command never reaches the worker
+
+    # The later request finishes first; nothing may overtake the first one
+    service._responses.put(('result', sent["how are you"], "How are you?"))
+    settle()
+    assert service.results == []
+
+    service._responses.put(('result', sent["hello there"], "Hello there."))
+    assert wait_for(lambda: len(service.results) == 3)
+    assert service.results == [("Hello there.", 'first'), ("scroll down", 'command'),
+                               ("How are you?", 'second')]
+    assert not service.has_pending()
+
+
+def test_slow_request_falls_back_to_raw_text(service):
+    service.submit("stuck sentence", tag='slow')
+    service.submit("next one", punctuate=False, tag='after')
+    sent = requests(service)
+    assert wait_for(lambda: len(service.results) == 2)
+    assert service.results == [("stuck sentence", 'slow'), ("next one", 'after')]
+
+    # A result that turns up after the fallback is dropped
+    service._responses.put(('result', sent["stuck sentence"], "Stuck sentence."))
+    settle()
+    assert len(service.results) == 2
+
+
+def test_worker_error_keeps_the_raw_text(service):
+    service.submit("broken input", tag='error')
+    sent = requests(service)
+    service._responses.put(('error', sent["broken input"], "model crashed"))
+    assert wait_for(lambda: service.results == [("broken input", 'error')])
+
+
+def test_result_in_transit_still_counts_as_pending(service):
+    service.submit("first sentence", tag='first')
+    sent = requests(service)
+    service._responses.put(('result', sent["first sentence"], "First sentence."))
+    # The reader has the result, but the GUI thread hasn't delivered it yet
+    assert wait_for(lambda: service._pending[sent["first sentence"]]['result'] is not None, deliver=False)
+    assert service.has_pending()
+
+    # A pass-through submitted now may not overtake it
+    service.submit("new line", punctuate=False, tag='command')
+    assert service.results == [("First sentence.", 'first'), ("new line", 'command')]
+    assert not service.has_pending()
+    settle()
+    assert len(service.results) == 2
+
+
+def test_without_a_worker_text_passes_straight_through():
+    service = PunctuationService()
+    results = []
+    service.result_ready.connect(lambda text, tag: results.append((text, tag)),
+                                 Qt.ConnectionType.DirectConnection)
+    service.submit("no model loaded", tag=1)
+    assert results == [("no model loaded", 1)]
+
+
+@pytest.fixture
+def fake_torch(monkeypatch):
+    """torch/transformers/deepmultilingualpunctuation stand-ins that record quantizations"""
+    torch = types.ModuleType('torch')
+    torch.__version__ = '2.3.0'
+    torch.quantized = []
+    torch.set_num_threads = lambda count: None
+    torch.nn = types.SimpleNamespace(Linear=object)
+    torch.qint8 = 'qint8'
+
+    def quantize_dynamic(model, layers, dtype):
+        torch.quantized.append(model)
+        return f'int8 {model}'
+
+    def save(network, path):
+        with open(path, 'w') as f:
+            f.write(network)
+
+    def load(path, mmap, weights_only):
+        with open(path) as f:
+            network = f.read()
+        if not network.startswith('int8'):
+            raise RuntimeError('invalid load key')
+        return network
+
+    torch.quantization = types.SimpleNamespace(quantize_dynamic=quantize_dynamic)
+    torch.save, torch.load = save, load
+
+    transformers = types.ModuleType('transformers')
+    transformers.__version__ = '4.40.0'
+    transformers.revision = 'abc123'
+    transformers.AutoConfig = types.SimpleNamespace(
+        from_pretrained=lambda name: types.SimpleNamespace(_commit_hash=transformers.revision))
+    transformers.AutoTokenizer = types.SimpleNamespace(from_pretrained=lambda name: 'tokenizer')
+    transformers.pipeline = lambda task, model, tokenizer, **kwargs: (model, tokenizer)
+
+    class PunctuationModel:
+        def __init__(self):
+            self.pipe = types.SimpleNamespace(model='fp32 model', tokenizer='tokenizer')
+
+    punctuation = types.ModuleType('deepmultilingualpunctuation')
+    punctuation.PunctuationModel = PunctuationModel
+    monkeypatch.setitem(sys.modules, 'torch', torch)
+    monkeypatch.setitem(sys.modules, 'transformers', transformers)
+    monkeypatch.setitem(sys.modules, 'deepmultilingualpunctuation', punctuation)
+    return torch
+
+
+def test_quantized_model_is_cached_per_version(fake_torch, tmp_path):
+    model = punctuation_service._load_quantized_model(str(tmp_path))
+    assert model.pipe == ('int8 fp32 model', 'tokenizer')
+    punctuation_service._load_quantized_model(str(tmp_path))
+    assert len(fake_torch.quantized) == 1  # Second load came from the cache
+
+    # A torch upgrade can't unpickle the old file: quantize again and drop the stale copy
+    fake_torch.__version__ = '2.4.0'
+    punctuation_service._load_quantized_model(str(tmp_path))
+    assert len(fake_torch.quantized) == 2
+    cached, = os.listdir(tmp_path)
+    assert 'torch2.4.0' in cached and 'abc123' in cached
+
+    # So does a new model revision
+    sys.modules['transformers'].revision = 'def456'
+    punctuation_service._load_quantized_model(str(tmp_path))
+    assert len(fake_torch.quantized) == 3
+
+
+def test_unreadable_cache_is_quantized_again(fake_torch, tmp_path):
+    punctuation_service._load_quantized_model(str(tmp_path))
+    cached, = os.listdir(tmp_path)
+    with open(tmp_path / cached, 'w') as f:
+        f.write('truncated')
+
+    model = punctuation_service._load_quantized_model(str(tmp_path))
+    assert model.pipe == ('int8 fp32 model', 'tokenizer')
+    assert len(fake_torch.quantized) == 2
+    assert (tmp_path / cached).read_text() == 'int8 fp32 model'
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Tests for choosing a recognition backend per utterance
+Run with: python -m pytest test_recognition_router.py
+"""
+
+import sys
+sys.path.insert(0, 'src')
+
+import pytest
+import speech_recognition as sr
+
+from app.utils.recognition_router import BackendHealth, RecognitionRouter
+
+
+def audio(seconds, rate=16000):
+    return sr.AudioData(bytes(int(seconds * rate) * 2), rate, 2)
+
+
+@pytest.fixture
+def router(monkeypatch):
+    # Pretend every backend is installed
+    monkeypatch.setattr(RecognitionRouter, '_check_available', lambda self, name: True)
+    return RecognitionRouter(command_backend='sphinx', dictation_backend='google', max_command_seconds=2.5)
+
+
+class FakeRecognizer:
+    """Backends answer from a table; an exception instance is raised instead"""
+
+    def __init__(self, answers):
+        self.answers = answers
+        self.called = []
+
+    def __getattr__(self, method_name):
+        def recognize(audio, **kwargs):
+            self.called.append(method_name)
+            answer = self.answers[method_name]
+            if isinstance(answer, Exception):
+                raise answer
+            return answer
+        return recognize
+
+
+def test_short_commands_go_local_and_the_rest_remote(router):
+    assert router.choose_backends('command', 1.0)[0] == ['sphinx', 'google']
+    assert router.choose_backends('command', 4.0)[0] == ['google', 'sphinx']
+    assert router.choose_backends('dictation', 1.0)[0] == ['google', 'sphinx']
+
+
+def test_missing_backend_is_skipped(monkeypatch):
+    monkeypatch.setattr(RecognitionRouter, '_check_available', lambda self, name: name != 'sphinx')
+    router = RecognitionRouter(command_backend='sphinx', dictation_backend='google')
+    order, reason = router.choose_backends('command', 1.0)
+    assert order == ['google'] and "'sphinx' unavailable" in reason
+
+
+def test_failing_backend_cools_down(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr('app.utils.recognition_router.time.monotonic', lambda: clock[0])
+    health = BackendHealth('sphinx', failure_limit=2, cooldown=30.0)
+    health.record_failure()
+    assert health.is_healthy()
+    health.record_failure()
+    assert not health.is_healthy()
+    clock[0] += 31.0
+    assert health.is_healthy() and health.consecutive_failures == 0
+
+
+def test_falls_back_when_the_preferred_backend_fails(router):
+    recognizer = FakeRecognizer({'recognize_sphinx': sr.RequestError("down"),
+                                 'recognize_google': {'alternative': [{'transcript': "close tab",
+                                                                       'confidence': 0.9}]}})
+    assert router.recognize_alternatives(recognizer, audio(1.0), 'command') == [("close tab", 0.9)]
+    assert recognizer.called == ['recognize_sphinx', 'recognize_google']
+    assert router.health['sphinx'].consecutive_failures == 1
+    assert router.get_stats()['decisions'] == {'command:sphinx': 1, 'command:google': 1}
+
+
+def test_google_n_best_list_is_kept(router):
+    recognizer = FakeRecognizer({'recognize_google': {'alternative': [
+        {'transcript': "new tab", 'confidence': 0.8}, {'transcript': "new tap"}]}})
+    assert router.recognize_alternatives(recognizer, audio(3.0), 'dictation') == [
+        ("new tab", 0.8), ("new tap", None)]
+    assert router.recognize(recognizer, audio(3.0), 'dictation') == "new tab"
+
+
+def test_nothing_understood_raises_unknown_value(router):
+    recognizer = FakeRecognizer({'recognize_sphinx': sr.UnknownValueError(),
+                                 'recognize_google': []})
+    with pytest.raises(sr.UnknownValueError):
+        router.recognize_alternatives(recognizer, audio(1.0), 'command')
+    assert router.health['google'].is_healthy()
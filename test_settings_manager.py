@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Tests for settings persistence from several threads and performance profiles
+Run with: python -m pytest test_settings_manager.py
+"""
+
+import json
+import os
+import sys
+import threading
+sys.path.insert(0, 'src')
+
+from app.utils.adaptive_endpointing import AdaptiveEndpointer
+from app.utils.settings_manager import SettingsManager
+
+
+def test_concurrent_saves_leave_a_valid_file(tmp_path, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path))
+    manager = SettingsManager()
+    endpointer = AdaptiveEndpointer(manager)
+
+    def save_endpointing():
+        for _ in range(50):
+            endpointer.save()
+
+    # The recognition thread saves learned endpointing while the GUI changes settings
+    worker = threading.Thread(target=save_endpointing)
+    worker.start()
+    for index in range(50):
+        manager.update_setting('typing', 'typing_delay', index / 1000)
+    worker.join()
+
+    with open(manager.settings_file) as f:
+        saved = json.load(f)
+    assert saved['typing']['typing_delay'] == 0.049
+    assert set(AdaptiveEndpointer.MODE_TUNING) <= set(saved['endpointing'])
+    assert not os.path.exists(manager.settings_file + '.tmp')
+
+
+def test_profile_sets_every_knob_and_persists(tmp_path, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path))
+    manager = SettingsManager()
+    profile = manager.apply_profile('power_saver')
+    assert profile == SettingsManager.PERFORMANCE_PROFILES['power_saver']
+
+    reloaded = SettingsManager()
+    assert reloaded.get_setting('performance', 'profile') == 'power_saver'
+    for category, values in profile.items():
+        for key, value in values.items():
+            assert reloaded.get_setting(category, key) == value
+
+
+def test_unknown_profile_changes_nothing(tmp_path, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path))
+    manager = SettingsManager()
+    manager.apply_profile('low_latency')
+    assert manager.apply_profile('turbo') is None
+    assert SettingsManager().get_setting('performance', 'profile') == 'low_latency'
+    assert SettingsManager().get_setting('voice_recognition', 'chunk_size') == 512
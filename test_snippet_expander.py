@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Tests for text expansions applied while dictating
+Run with: python -m pytest test_snippet_expander.py
+"""
+
+import json
+import os
+import sys
+sys.path.insert(0, 'src')
+
+import pytest
+
+from app.utils.snippet_expander import AhoCorasickMatcher, SnippetExpander
+
+
+def test_matcher_finds_overlapping_phrases_in_one_pass():
+    matcher = AhoCorasickMatcher(["he", "she", "his", "hers"])
+    assert sorted(matcher.find("ushers")) == [(1, 4, 1), (2, 4, 0), (2, 6, 3)]
+    assert matcher.find("xyz") == []
+
+
+def write(path, expansions):
+    path.write_text(json.dumps({"expansions": expansions}))
+
+
+@pytest.fixture
+def expander(tmp_path):
+    path = tmp_path / 'expansions.json'
+    write(path, {
+        "pie torch": "PyTorch",
+        "acme ticket": {"text": "ACME-", "join_next": True},
+        "ai": "AI",
+        "my address": "1 Main Street",
+        "my address line": "1 Main Street, Suite 2",
+    })
+    return SnippetExpander(str(path))
+
+
+def test_phrases_expand_case_insensitively(expander):
+    assert expander.expand("Import Pie Torch now") == "Import PyTorch now"
+    assert expander.expand("") == ""
+
+
+def test_only_whole_words_expand(expander):
+    assert expander.expand("the ai said") == "the AI said"
+    assert expander.expand("said daily, wait") == "said daily, wait"
+    assert expander.expand("ai.") == "AI."
+
+
+def test_longest_phrase_wins(expander):
+    assert expander.expand("send my address line please") == "send 1 Main Street, Suite 2 please"
+    assert expander.expand("send my address please") == "send 1 Main Street please"
+
+
+def test_join_next_glues_the_following_word(expander):
+    assert expander.expand("see acme ticket 42 today") == "see ACME-42 today"
+    assert expander.expand("acme ticket") == "ACME-"
+
+
+def test_missing_file_is_created_empty(tmp_path):
+    path = tmp_path / 'sub' / 'expansions.json'
+    expander = SnippetExpander(str(path))
+    assert json.loads(path.read_text()) == {"expansions": {}}
+    assert expander.expand("pie torch") == "pie torch"
+
+
+def test_edits_are_picked_up_and_bad_files_ignored(expander, monkeypatch):
+    monkeypatch.setattr(SnippetExpander, 'RELOAD_CHECK_INTERVAL', 0.0)
+
+    def rewrite(content):
+        with open(expander.path, "w") as f:
+            f.write(content)
+        stat = os.stat(expander.path)
+        os.utime(expander.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    rewrite(json.dumps({"expansions": {"pie torch": "pytorch"}}))
+    assert expander.expand("pie torch") == "pytorch"
+    rewrite("{broken")
+    assert expander.expand("pie torch") == "pytorch"
+    # Valid JSON in the wrong shape is rejected too
+    for content in ('[]', '{"expansions": ["pie torch"]}', '{"expansions": {"pie torch": ["a"]}}'):
+        rewrite(content)
+        assert expander.expand("pie torch") == "pytorch"
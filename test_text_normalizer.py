@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Tests for writing spoken numbers as digits, and capitalizing what follows them
+Run with: python -m pytest test_text_normalizer.py
+"""
+
+import sys
+sys.path.insert(0, 'src')
+
+import pytest
+
+from app.utils.text_normalizer import TextNormalizer, parse_number
+from app.utils.voice_typing import VoiceTypingMode
+
+
+@pytest.mark.parametrize('spoken, written', [
+    ("twenty five dollars", "$25"),
+    ("fifty percent", "50%"),
+    ("march third twenty twenty four", "March 3, 2024"),
+    ("in nineteen ninety nine", "in 1999"),
+    ("the summer of nineteen sixty nine", "the summer of 1969"),
+    ("three thirty pm", "3:30 PM"),
+])
+def test_spoken_numbers_are_written(spoken, written):
+    assert TextNormalizer().normalize(spoken) == written
+
+
+@pytest.mark.parametrize('spoken, written', [
+    ("fifty fifty", "50 50"),
+    ("ten ten", "10 10"),
+    ("at eleven fifteen", "at 11 15"),
+    ("twenty twenty four", "20 24"),  # No year context
+    ("from fifty fifty", "from 50 50"),  # Not a plausible year
+])
+def test_back_to_back_numbers_are_not_joined_into_years(spoken, written):
+    assert TextNormalizer().normalize(spoken) == written
+
+
+def test_prose_leaves_ambiguous_runs_as_spoken():
+    normalizer = TextNormalizer()
+    assert normalizer.normalize("we split it fifty fifty", keep_small_numbers=True) == "we split it fifty fifty"
+    assert normalizer.normalize("one of three options", keep_small_numbers=True) == "one of three options"
+
+
+def test_parse_number_reads_only_the_number():
+    assert parse_number(["twenty", "five", "words"]) == (25, 2)
+    assert parse_number(["12", "lines"]) == (12, 1)
+    assert parse_number(["down"]) is None
+
+
+@pytest.mark.parametrize('spoken, typed', [
+    ("a hundred people", "100 people"),
+    ("one hundred percent sure", "100% sure"),
+    ("twenty five dollars later", "$25 later"),
+    ("thanks", "Thanks"),
+])
+def test_only_a_leading_word_is_capitalized(spoken, typed):
+    typing_mode = VoiceTypingMode(None)
+    assert typing_mode.format_text(spoken) == typed
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Tests for per-application typing rate calibration
+Run with: python -m pytest test_typing_rate.py
+"""
+
+import sys
+sys.path.insert(0, 'src')
+
+from app.utils.typing_rate import TypingRateProfiles
+
+CONFIGURED = (0.01, 0.02)
+
+
+def test_new_app_uses_configured_delay_until_read_back():
+    profiles = TypingRateProfiles(reader=lambda: "hello world")
+    assert profiles.delays_for("Notes", *CONFIGURED) == CONFIGURED
+    assert profiles.should_verify("Notes")
+    assert profiles.verify("Notes", "hello world") is True
+    # Verified: the calibrated (faster) delay takes over
+    delay, word_delay = profiles.delays_for("Notes", *CONFIGURED)
+    assert delay == 0.005 and word_delay == 0.01
+
+
+def test_ramp_stops_above_a_delay_that_dropped_keys():
+    profiles = TypingRateProfiles()
+    profiles.delays_for("Notes", *CONFIGURED)
+    profiles.record("Notes", True)  # 10 -> 5 ms
+    profiles.record("Notes", True)  # 5 -> 2.5 ms
+    profiles.record("Notes", False)  # Dropped keys at 2.5 ms: back to 5 ms
+    assert profiles.delays_for("Notes", *CONFIGURED)[0] == 0.005
+    for _ in range(TypingRateProfiles.PROBE_AFTER):
+        profiles.record("Notes", True)
+    # The probe (3.75 ms) stays slower than the rate that dropped keys
+    assert profiles.delays_for("Notes", *CONFIGURED)[0] == 0.00375
+
+
+def test_unreadable_app_keeps_configured_delay_and_is_probed_again(monkeypatch):
+    profiles = TypingRateProfiles(reader=lambda: None)
+    assert profiles.delays_for("Terminal", *CONFIGURED) == CONFIGURED
+    assert profiles.should_verify("Terminal")
+    assert profiles.verify("Terminal", "ls") is None
+    assert not profiles.should_verify("Terminal")
+    assert profiles.delays_for("Terminal", *CONFIGURED) == CONFIGURED
+
+    later = profiles.profiles["Terminal"]['unverifiable_since'] + TypingRateProfiles.REPROBE_AFTER + 1
+    monkeypatch.setattr('app.utils.typing_rate.time.time', lambda: later)
+    assert profiles.should_verify("Terminal")
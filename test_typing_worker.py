@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tests for the background typing queue and "stop typing"
+Run with: python -m pytest test_typing_worker.py
+"""
+
+import sys
+import threading
+import time
+sys.path.insert(0, 'src')
+
+import pytest
+from PyQt6.QtCore import Qt
+
+from app.utils.typing_worker import TypingWorker
+
+
+class FakeTyper:
+    """Types one character per step; the first job blocks until released"""
+
+    def __init__(self):
+        self.typed = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.on_backspace = None  # Called with the number sent so far
+
+    def backspace(self, count, should_stop=None):
+        for sent in range(count):
+            if should_stop and should_stop():
+                return sent
+            self.typed.append("<bs>")
+            if self.on_backspace:
+                self.on_backspace(sent + 1)
+        return count
+
+    def type_text(self, text, should_stop=None, on_progress=None):
+        count = 0
+        for char in text:
+            if should_stop and should_stop():
+                break
+            self.typed.append(char)
+            count += 1
+            if on_progress:
+                on_progress(count, len(text))
+            if count == 2:
+                self.started.set()
+                self.release.wait(2.0)
+        return count
+
+
+@pytest.fixture
+def worker():
+    typer = FakeTyper()
+    worker = TypingWorker(typer)
+    worker.events = []
+    direct = Qt.ConnectionType.DirectConnection
+    worker.job_finished.connect(lambda job, text: worker.events.append(('finished', job)), direct)
+    worker.job_cancelled.connect(lambda job, typed: worker.events.append(('cancelled', job, typed)), direct)
+    worker.job_failed.connect(lambda job, error: worker.events.append(('failed', job)), direct)
+    worker.idle.connect(lambda: worker.events.append(('idle',)), direct)
+    worker.start()
+    yield worker
+    typer.release.set()
+    worker.stop()
+
+
+def wait_until_idle(worker, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while worker.events[-1:] != [('idle',)] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return not worker.is_busy()
+
+
+def test_jobs_run_in_order(worker):
+    first = worker.submit("abc")
+    second = worker.submit("de", backspaces=1)
+    worker.typer.release.set()
+    assert wait_until_idle(worker)
+    assert ''.join(worker.typer.typed) == "abc<bs>de"
+    assert worker.events == [('finished', first), ('finished', second), ('idle',)]
+
+
+def test_cancel_stops_the_current_job_and_drops_queued_ones(worker):
+    first = worker.submit("hello")
+    second = worker.submit("world")
+    assert worker.typer.started.wait(2.0)
+
+    assert worker.cancel()
+    worker.typer.release.set()
+    assert wait_until_idle(worker)
+    assert ''.join(worker.typer.typed) == "he"
+    assert worker.events == [('cancelled', first, 2), ('cancelled', second, 0), ('idle',)]
+
+    # Work submitted after the cancel runs normally
+    worker.events.clear()
+    third = worker.submit("ok")
+    assert wait_until_idle(worker)
+    assert worker.events == [('finished', third), ('idle',)]
+
+
+def test_cancel_cuts_a_backspace_burst_short(worker):
+    worker.typer.on_backspace = lambda sent: sent == 3 and worker.cancel()
+    job = worker.submit("replacement", backspaces=40)
+    assert wait_until_idle(worker)
+    assert worker.typer.typed == ["<bs>"] * 3
+    assert worker.events == [('cancelled', job, 0), ('idle',)]
+
+
+def test_cancel_with_nothing_queued_is_a_no_op(worker):
+    assert not worker.cancel()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Tests for how the voice widget routes dictation corrections in Google Docs, and
+which utterances the intent classifier learns from
+Run with: python -m pytest test_voice_widget.py
+"""
+
+import os
+import sys
+sys.path.insert(0, 'src')
+
+import pytest
+
+APP = "Google Chrome"
+
+
+@pytest.fixture(scope='module')
+def qt_app():
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication(sys.argv)
+
+
+@pytest.fixture
+def widget(qt_app, tmp_path, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path))
+    from app.utils.settings_manager import SettingsManager
+    from app.widgets import voice_widget
+    # No global keyboard listener or window polling in tests
+    monkeypatch.setattr(voice_widget.GlobalHotkeyManager, 'start', lambda self: None)
+    monkeypatch.setattr(voice_widget.ActiveWindowDetector, 'start', lambda self: None)
+    streaming = []
+    monkeypatch.setattr(voice_widget.VoiceRecognitionManager, 'enable_streaming_partials',
+                        lambda self, enabled, model_path='model': streaming.append(enabled) or True)
+    widget = voice_widget.VoiceWidget(SettingsManager())
+    widget.streaming = streaming
+    widget.current_context = 'google_docs'
+    widget.keyboard_typer.target_app = APP
+    widget.typed = []
+    widget.dictated = []
+    widget.punctuation_requests = []
+    monkeypatch.setattr(widget.typing_worker, 'submit',
+                        lambda text, backspaces=0: widget.typed.append((backspaces, text)))
+    monkeypatch.setattr(widget, '_dictate', lambda text, alternatives, target: widget.dictated.append(text))
+    monkeypatch.setattr(widget.typing_mode.punctuation_service, 'submit',
+                        lambda text, punctuate=True, tag=None, context=None:
+                        widget.punctuation_requests.append((text, tag)))
+    widget.learned = []
+    monkeypatch.setattr(widget.intent_classifier, 'record',
+                        lambda text, is_command: widget.learned.append((text, is_command)))
+    yield widget
+    widget.typing_worker.stop()
+    widget.typing_mode.close()
+
+
+def test_replace_without_a_match_is_dictated(widget):
+    widget.journal.record("The server is up. ", APP)
+    widget.handle_text_received("Replace the old server with a new one.")
+    assert widget.typed == []
+    assert widget.dictated == ["Replace the old server with a new one."]
+
+
+def test_replace_with_a_match_edits_the_journal(widget):
+    widget.journal.record("Meet Jon at noon. ", APP)
+    widget.handle_text_received("replace jon with john")
+    assert widget.typed == [(len("n at noon. "), "hn at noon. ")]
+    assert widget.dictated == []
+
+
+def test_correction_waits_for_dictation_in_flight(widget):
+    # "Meet Jon at noon" is still being punctuated when the correction arrives
+    widget._dictations_in_flight = 1
+    widget.handle_text_received("replace jon with john")
+    assert widget.typed == []
+    (text, tag), = widget.punctuation_requests
+    assert tag[0] == 'correction'
+
+    # Results come back in order: the dictation first, then the correction
+    widget.handle_punctuated_text("Meet Jon at noon.", ('google_docs', "meet jon at noon"))
+    widget.handle_punctuated_text(text, tag)
+    assert widget.typed[-1] == (len("n at noon."), "hn at noon.")
+    assert widget._dictations_in_flight == 0
+
+
+def test_dictation_is_learned_only_once_kept(widget):
+    widget.handle_text_received("We should meet tomorrow to review the draft.")
+    assert widget.dictated and widget.learned == []  # Routing alone teaches nothing
+    widget._dictations_in_flight = 0  # The stubbed _dictate never types it
+
+    widget.journal.record("We should meet tomorrow. ", APP, source="we should meet tomorrow")
+    widget.journal.record("Bad take.", APP, source="bad take")
+    widget.handle_text_received("scratch that")
+    assert widget.learned == []
+    widget.journal.clear()
+    assert widget.learned == [("we should meet tomorrow", False)]
+
+
+def test_undone_dictation_that_is_a_command_is_learned_as_one(widget):
+    widget.command_handler.set_google_docs_active(APP)
+    widget.journal.record("Scroll down.", APP, source="scroll down")
+    widget.handle_text_received("undo that")
+    assert widget.learned == [("scroll down", True)]
+
+
+def test_commands_are_learned_only_when_they_run(widget, monkeypatch):
+    widget.current_context = 'browser'
+    widget.is_command_mode = True
+    widget.command_handler.set_browser_active(APP)
+    monkeypatch.setattr(widget.command_handler.browser_router, 'execute_command', lambda *args: None)
+    widget.handle_text_received("frobnicate the widget")
+    assert widget.learned == []
+    widget.handle_text_received("scroll down")
+    assert widget.learned == [("scroll down", True)]
+
+
+def test_intent_history_is_not_written_unless_enabled(widget):
+    assert widget.intent_classifier.history_path is None
+
+
+def test_hypotheses_narrow_suggestions_in_command_mode(widget):
+    # Interim hypotheses are on for suggestions even without live dictation
+    assert widget.streaming == [True] and not widget.live_dictation_enabled
+    widget.current_context = 'browser'
+    widget.is_command_mode = True
+    widget.command_handler.set_browser_active(APP)
+    suggestions = []
+    widget.command_handler.suggestion_updated.connect(suggestions.append)
+    widget.handle_hypothesis("close t")
+    assert suggestions and suggestions[-1][0] == "close tab"
+    assert widget.typed == []
+
+
+def test_explicit_command_mode_uses_command_recognition_in_docs(widget):
+    widget.current_context = 'google_docs'
+    widget._update_recognition_mode()
+    assert widget.voice_manager.recognition_mode == 'dictation'
+    widget.is_command_mode = True
+    widget._update_recognition_mode()
+    assert widget.voice_manager.recognition_mode == 'command'
+
+
+def test_command_alternatives_are_rescored_in_docs(widget, monkeypatch):
+    widget.command_handler.set_google_docs_active(APP)
+    ran = []
+    monkeypatch.setattr(widget.command_handler, 'process_command', lambda text: ran.append(text) or True)
+    widget.handle_alternatives_received(["make bowled", "make bold"])
+    widget.handle_text_received("make bowled")
+    assert ran == ["make bold"] and widget.dictated == []
+
+    # Plain dictation is left alone
+    widget.handle_alternatives_received(["we made it bold", "we made it bowled"])
+    widget.handle_text_received("we made it bold")
+    assert widget.dictated == ["we made it bold"]
+
+
+def test_profile_switch_applies_live_and_restarts_capture(widget, monkeypatch):
+    voice = widget.voice_manager
+    restarts = []
+    monkeypatch.setattr(type(voice), 'stop_listening',
+                        lambda self: restarts.append('stop') or setattr(self, 'is_listening', False))
+    monkeypatch.setattr(type(voice), 'start_listening',
+                        lambda self: restarts.append('start') or setattr(self, 'is_listening', True))
+    voice.is_listening = True
+
+    widget.apply_performance_profile('power_saver')
+    assert restarts == ['stop', 'start']
+    assert (voice.RATE, voice.CHUNK) == (16000, 4096)
+    assert voice.recognizer.pause_threshold == 1.0
+    assert widget.window_detector.poll_interval == 1500
+    assert (widget.keyboard_typer.typing_delay, widget.keyboard_typer.word_delay) == (0.02, 0.04)
+
+    # Switching while not listening must not open the microphone
+    restarts.clear()
+    voice.is_listening = False
+    widget.apply_performance_profile('low_latency')
+    assert restarts == []
+    assert voice.recognizer.pause_threshold == 0.5
+    assert voice.recognizer.non_speaking_duration == 0.3
+
+
+def test_docs_key_bursts_use_the_key_repeat_setting(widget, monkeypatch):
+    docs = widget.command_handler.google_docs_handler
+    assert docs.key_repeat_delay == widget.settings_manager.get_setting('typing', 'key_repeat_interval')
+
+    scripts = []
+    monkeypatch.setattr(docs, 'execute_applescript', lambda script: scripts.append(script) or (True, ''))
+    docs.press_key_code(51, 40)
+    script, = scripts  # One script launch for the whole burst
+    assert 'repeat 40 times' in script
+    assert f'delay {docs.key_repeat_delay}' in script
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Tests for batched XTest key injection against a stubbed X display
+Run with: python -m pytest test_xtest_injector.py
+"""
+
+import sys
+from types import SimpleNamespace
+sys.path.insert(0, 'src')
+
+import pytest
+
+pytest.importorskip('Xlib')
+from Xlib import X, XK
+
+from app.utils.keyboard_typing import KeyboardTyper
+from app.utils.xtest_injector import SPARE_KEYCODES, XTestInjector
+
+MIN_KEYCODE, MAX_KEYCODE = 8, 60
+# keysym -> (keycode, index in the keycode's keysym list; 1 = with Shift)
+LAYOUT = {
+    XK.string_to_keysym('a'): (38, 0),
+    XK.string_to_keysym('A'): (38, 1),
+    XK.string_to_keysym('BackSpace'): (22, 0),
+    XK.string_to_keysym('Shift_L'): (50, 0),
+    XK.string_to_keysym('Control_L'): (37, 0),
+}
+BOUND = {keycode for keycode, index in LAYOUT.values()}
+PRESS, RELEASE = X.KeyPress, X.KeyRelease
+
+
+class FakeDisplay:
+    """Records what would be sent to the X server"""
+
+    def __init__(self, name=None):
+        self.sent = []  # (event type, keycode, delay ms), 'flush' and 'sync' in order
+        self.mapping = {}  # keycode -> keysyms bound by change_keyboard_mapping
+        self.display = SimpleNamespace(info=SimpleNamespace(min_keycode=MIN_KEYCODE, max_keycode=MAX_KEYCODE))
+
+    def has_extension(self, name):
+        return name == 'XTEST'
+
+    def keysym_to_keycode(self, keysym):
+        return LAYOUT.get(keysym, (0, 0))[0]
+
+    def keysym_to_keycodes(self, keysym):
+        if keysym in LAYOUT:
+            yield LAYOUT[keysym]
+        for keycode, syms in self.mapping.items():
+            if keysym in syms:
+                yield keycode, 0
+
+    def get_keyboard_mapping(self, first, count):
+        return [(1, 1) if keycode in BOUND else (0, 0) for keycode in range(first, first + count)]
+
+    def change_keyboard_mapping(self, keycode, keysyms):
+        self.mapping[keycode] = keysyms[0]
+
+    def xtest_fake_input(self, event_type, keycode, delay=0):
+        self.sent.append((event_type, keycode, delay))
+
+    def flush(self):
+        self.sent.append('flush')
+
+    def sync(self):
+        self.sent.append('sync')
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def injector(monkeypatch):
+    monkeypatch.setattr('Xlib.display.Display', FakeDisplay)
+    return XTestInjector()
+
+
+def test_text_goes_out_in_one_flush_with_server_side_delays(injector):
+    assert injector.type_text("aA", delay=0.005) == 2
+    assert injector._display.sent == [
+        (PRESS, 38, 5), (RELEASE, 38, 0),
+        (PRESS, 50, 5), (PRESS, 38, 0), (RELEASE, 38, 0), (RELEASE, 50, 0),
+        'flush',
+    ]
+
+
+def test_missing_characters_borrow_spare_keycodes_round_robin(injector):
+    display = injector._display
+    spare = list(range(MAX_KEYCODE - SPARE_KEYCODES + 1, MAX_KEYCODE + 1))
+    assert injector._spare == spare
+
+    injector.type_text("é")
+    keysym = ord("é")
+    assert display.mapping[spare[0]] == (keysym, keysym)
+    # Queued events are synced out before the keycode is rebound
+    assert display.sent[:2] == ['sync', 'sync']
+    assert (PRESS, spare[0], 0) in display.sent
+
+    injector.type_text("ñøüß")  # Four more: the fifth character reuses the first spare keycode
+    assert display.mapping[spare[0]] == (ord("ß"), ord("ß"))
+    assert ord("é") not in injector._remapped
+
+    injector.close()
+    assert all(syms == (0, 0) for syms in display.mapping.values())
+
+
+def test_repeated_key_holds_modifiers_for_the_burst(injector):
+    assert injector.press_repeated('backspace', 3, ['ctrl'], delay=0.002) == 3
+    assert injector._display.sent == [
+        (PRESS, 37, 0),
+        (PRESS, 22, 2), (RELEASE, 22, 0),
+        (PRESS, 22, 2), (RELEASE, 22, 0),
+        (PRESS, 22, 2), (RELEASE, 22, 0),
+        (RELEASE, 37, 0),
+        'flush',
+    ]
+
+
+def test_unknown_key_sends_nothing(injector):
+    assert injector.press_repeated('no_such_key', 3) == 0
+    assert injector._display.sent == []
+
+
+def test_wait_syncs_with_the_server(injector):
+    injector.wait()
+    assert injector._display.sent == ['sync']
+
+
+def test_typer_sends_long_bursts_in_chunks_and_honours_should_stop(injector):
+    typer = KeyboardTyper()
+    typer.injector = injector
+    typer.repeat_chunk = 10
+    flushes = []
+    injector._display.flush = lambda: flushes.append(len(flushes))
+
+    assert typer.press_repeated('backspace', 25) == 25
+    assert len(flushes) == 3  # 10 + 10 + 5
+
+    flushes.clear()
+    stop_after = iter([False, False, True])
+    assert typer.press_repeated('backspace', 100, should_stop=lambda: next(stop_after)) == 20
+    assert len(flushes) == 2